@@ -0,0 +1 @@
+"""Performance benchmarks for the movie database; run with python -m benchmarks.run."""
@@ -0,0 +1,69 @@
+"""Deterministic generator of synthetic movie catalogs for the benchmarks."""
+
+import os
+import random
+from typing import Iterator
+from src.app.movie_details import MovieDetails
+from src.storage.storage_csv import write_csv_movies
+from src.storage.storage_json import write_json_movies
+
+WORDS = (
+    "Dark", "Night", "Star", "Lost", "City", "Love", "Last", "Dead", "Secret", "Return",
+    "King", "Blood", "Story", "Man", "Girl", "War", "Dream", "Ghost", "River", "Summer",
+    "Winter", "Fire", "Silent", "Golden", "Broken", "Wild", "Red", "Time", "Road", "Island",
+)
+
+
+def iter_catalog(count: int, seed: int = 42) -> Iterator[MovieDetails]:
+    """Yield a synthetic catalog; the same count and seed always give the same movies.
+
+    Titles are unique, ratings and years are spread like a real catalog's, and
+    some movies carry notes.
+
+    Args:
+        count (int): The number of movies.
+        seed (int): The seed of the random generator.
+
+    Yields:
+        MovieDetails: The movies.
+    """
+    rng = random.Random(seed)
+    for number in range(count):
+        words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3)))
+        yield MovieDetails(
+            title=f"{words} {number}",
+            year=rng.randint(1920, 2024),
+            rating=round(min(10.0, max(1.0, rng.gauss(6.5, 1.2))), 1),
+            poster=f"https://example.com/posters/{number}.jpg",
+            imdb_id=f"tt{number:08d}",
+            notes="Watch again" if rng.random() < 0.1 else "",
+        )
+
+
+def write_catalog(file_path: str, count: int, seed: int = 42) -> str:
+    """Stream a synthetic catalog to a JSON or CSV file with the storages' writers.
+
+    The movies are written one at a time, so catalogs larger than memory can be
+    generated.
+
+    Args:
+        file_path (str): The path of the .json or .csv file.
+        count (int): The number of movies.
+        seed (int): The seed of the random generator.
+
+    Raises:
+        ValueError: If the file extension is not supported.
+
+    Returns:
+        str: file_path.
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == ".json":
+        with open(file_path, "w", encoding="utf-8") as file:
+            write_json_movies(file, iter_catalog(count, seed))
+    elif ext == ".csv":
+        with open(file_path, "w", encoding="utf-8", newline="") as file:
+            write_csv_movies(file, iter_catalog(count, seed))
+    else:
+        raise ValueError(f"Unsupported file extension: {ext}")
+    return file_path
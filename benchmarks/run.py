@@ -0,0 +1,207 @@
+"""Time MovieUtils, storage load/save and website generation on synthetic catalogs.
+
+Usage:
+    python -m benchmarks.run --sizes 1000 100000 --output benchmarks/results.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json
+    python -m benchmarks.run --sizes 1000 10000 --update-baseline
+
+Results are written as JSON. With --baseline, the run exits with status 1 if a
+benchmark got slower than the baseline by more than --tolerance.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.catalog import write_catalog
+from src.app.movie_utils import MovieUtils
+from src.storage.storage_csv import CsvStorage
+from src.storage.storage_json import JsonStorage
+from src.storage.website import WebsiteGenerator
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_FILE = os.path.join(
+    os.path.dirname(BENCHMARKS_DIR), "templates", "movies_template.html"
+)
+BASELINE_PATH = os.path.join(BENCHMARKS_DIR, "baseline.json")
+STORAGES = {"json": JsonStorage, "csv": CsvStorage}
+# Differences below this many seconds are timer noise, not regressions.
+NOISE_FLOOR = 0.005
+
+
+def best_of(function: Callable[[], object], repeat: int) -> float:
+    """Return the fastest of `repeat` timed calls, in seconds.
+
+    Args:
+        function (Callable[[], object]): The code to time.
+        repeat (int): The number of calls.
+
+    Returns:
+        float: The fastest wall time.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def bench_catalog(directory: str, size: int, repeat: int) -> Dict[str, float]:
+    """Run all benchmarks on one catalog size.
+
+    Args:
+        directory (str): A scratch directory.
+        size (int): The number of movies.
+        repeat (int): The number of runs each benchmark takes the best of.
+
+    Returns:
+        Dict[str, float]: Seconds per benchmark name.
+    """
+    results = {}
+    storage = None
+    for name, storage_class in STORAGES.items():
+        path = write_catalog(os.path.join(directory, f"movies_{size}.{name}"), size)
+        results[f"{name}.load"] = best_of(
+            lambda storage_class=storage_class, path=path: storage_class(path), repeat
+        )
+        storage = storage_class(path)
+        results[f"{name}.save"] = best_of(storage.save_movies, repeat)
+
+    movies = storage.load_movies_file()
+    results["utils.build_indexes"] = best_of(lambda: MovieUtils(movies), repeat)
+    utils = MovieUtils(movies)
+    calls = {
+        "filter_movies_by_rating_and_year": lambda: utils.filter_movies_by_rating_and_year(
+            7.5, 1990, 2000
+        ),
+        "random_movie": utils.random_movie,
+        "random_movies": lambda: utils.random_movies(10, min_rating=7.0, year_range=(1990, None)),
+        "search_movie": lambda: utils.search_movie("night"),
+        "sort_by_rating": utils.sort_by_rating,
+        "sort_by_year": utils.sort_by_year,
+        "calculate_average_rating": utils.calculate_average_rating,
+        "find_best_movies": utils.find_best_movies,
+        "find_worst_movies": utils.find_worst_movies,
+        "get_movies_statistics": utils.get_movies_statistics,
+    }
+    for name, call in calls.items():
+        results[f"utils.{name}"] = best_of(call, repeat)
+
+    site = os.path.join(directory, "site")
+    os.makedirs(site, exist_ok=True)
+    shutil.copy(TEMPLATE_FILE, site)
+
+    def generate_cold() -> None:
+        for file_name in os.listdir(site):
+            if file_name.endswith(".digest"):
+                os.remove(os.path.join(site, file_name))
+        WebsiteGenerator(site).generate(movies.values())
+
+    results["website.generate"] = best_of(generate_cold, repeat)
+    generator = WebsiteGenerator(site)
+    generator.generate(movies.values())
+    results["website.generate_unchanged"] = best_of(
+        lambda: generator.generate(movies.values()), repeat
+    )
+    return results
+
+
+def run(sizes: List[int], repeat: int) -> Dict[str, object]:
+    """Run the benchmarks for every catalog size.
+
+    Args:
+        sizes (List[int]): The catalog sizes.
+        repeat (int): The number of runs each benchmark takes the best of.
+
+    Returns:
+        Dict[str, object]: The machine-readable results.
+    """
+    results: Dict[str, float] = {}
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            for name, seconds in bench_catalog(directory, size, repeat).items():
+                results[f"{name}[{size}]"] = seconds
+                print(f"{name}[{size}]: {seconds * 1000:.2f} ms", flush=True)
+    return {
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "sizes": sizes,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(
+    results: Dict[str, float], baseline: Dict[str, float], tolerance: float
+) -> List[str]:
+    """Return the benchmarks that got slower than the baseline.
+
+    Benchmarks missing from either side are ignored.
+
+    Args:
+        results (Dict[str, float]): Seconds per benchmark of this run.
+        baseline (Dict[str, float]): Seconds per benchmark of the baseline.
+        tolerance (float): The allowed relative slowdown, e.g. 0.25 for 25%.
+
+    Returns:
+        List[str]: A description of every regression.
+    """
+    regressions = []
+    for name, seconds in sorted(results.items()):
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if seconds > expected * (1 + tolerance) and seconds - expected > NOISE_FLOOR:
+            regressions.append(
+                f"{name}: {seconds * 1000:.2f} ms vs {expected * 1000:.2f} ms baseline"
+            )
+    return regressions
+
+
+def main() -> None:
+    """Parse the command line and run the benchmarks."""
+    parser = argparse.ArgumentParser(description="Movie database benchmarks")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 10000],
+        help="catalog sizes, from 1000 up to 10000000 movies",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--output", default=os.path.join(BENCHMARKS_DIR, "results.json")
+    )
+    parser.add_argument("--baseline", help="fail if slower than this results file")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument(
+        "--update-baseline", action="store_true",
+        help=f"store the results as the new baseline ({BASELINE_PATH})",
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    report = run(args.sizes, args.repeat)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=4)
+    if args.update_baseline:
+        shutil.copy(args.output, BASELINE_PATH)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(report["results"], baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions.")
+
+
+if __name__ == "__main__":
+    main()
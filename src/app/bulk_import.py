@@ -0,0 +1,149 @@
+"""Module for importing many movies at once from a file of titles or IMDb IDs."""
+
+import csv
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+import requests
+from src.app.movie_details import MovieDetails
+from src.config import BULK_IMPORT_WORKERS, BULK_IMPORT_RATE, BULK_IMPORT_RETRIES
+from src.storage.i_storage import IStorage
+
+logger = logging.getLogger(__name__)
+
+
+def read_titles(file_path: str) -> List[str]:
+    """Read the titles or IMDb IDs to import from a text or CSV file.
+
+    Text files contain one title per line; empty lines and lines starting with
+    "#" are ignored. CSV files use the "ImdbID" or "Title" column if there is a
+    header with one of them, and the first column otherwise.
+
+    Args:
+        file_path (str): The path of the file.
+
+    Returns:
+        List[str]: The titles or IMDb IDs, in file order.
+    """
+    with open(file_path, "r", encoding="utf-8", newline="") as file:
+        if not file_path.lower().endswith(".csv"):
+            return [
+                line.strip()
+                for line in file
+                if line.strip() and not line.lstrip().startswith("#")
+            ]
+        rows = list(csv.reader(file))
+    if not rows:
+        return []
+    column = 0
+    for name in ("ImdbID", "Title"):
+        if name in rows[0]:
+            column = rows[0].index(name)
+            rows = rows[1:]
+            break
+    return [row[column].strip() for row in rows if len(row) > column and row[column].strip()]
+
+
+class RateLimiter:
+    """Thread-safe limiter spacing calls evenly to at most `rate` per second."""
+
+    def __init__(self, rate: float) -> None:
+        """Initialize the limiter.
+
+        Args:
+            rate (float): The maximum number of calls per second; 0 disables the limit.
+        """
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_call = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until the next call is allowed."""
+        with self._lock:
+            now = time.monotonic()
+            call_at = max(now, self._next_call)
+            self._next_call = call_at + self._interval
+        if call_at > now:
+            time.sleep(call_at - now)
+
+
+class BulkImporter:
+    """Resolve many titles through the OMDb API concurrently and store them at once."""
+
+    def __init__(
+        self,
+        storage: IStorage,
+        workers: int = BULK_IMPORT_WORKERS,
+        rate: float = BULK_IMPORT_RATE,
+        retries: int = BULK_IMPORT_RETRIES,
+        backoff: float = 0.5,
+    ) -> None:
+        """Initialize the importer.
+
+        Args:
+            storage (IStorage): The storage to look movies up with and add them to.
+            workers (int): The number of concurrent OMDb requests.
+            rate (float): The maximum number of OMDb requests per second.
+            retries (int): How often a failed request is retried.
+            backoff (float): The delay before the first retry, doubled on each retry.
+        """
+        self._storage = storage
+        self._workers = workers
+        self._rate_limiter = RateLimiter(rate)
+        self._retries = retries
+        self._backoff = backoff
+
+    def _resolve(self, title: str) -> Optional[MovieDetails]:
+        """Look up one title, retrying with exponential backoff on request errors.
+
+        Args:
+            title (str): The title or IMDb ID to look up.
+
+        Raises:
+            requests.RequestException: If the last retry failed as well.
+
+        Returns:
+            Optional[MovieDetails]: The movie, or None if it was not found.
+        """
+        for attempt in range(self._retries + 1):
+            self._rate_limiter.wait()
+            try:
+                movie_data = self._storage.load_movies_api(title)
+                return MovieDetails.from_dict(movie_data) if movie_data else None
+            except requests.RequestException as e:
+                if attempt == self._retries:
+                    raise
+                delay = self._backoff * 2**attempt
+                logger.warning("Lookup of '%s' failed (%s), retrying in %.1fs.", title, e, delay)
+                time.sleep(delay)
+        return None
+
+    def _resolve_safely(self, title: str) -> Tuple[str, Optional[MovieDetails]]:
+        """Look up one title, logging instead of raising on failure."""
+        try:
+            return title, self._resolve(title)
+        except (requests.RequestException, KeyError, ValueError) as e:
+            logger.error("Could not import '%s': %s", title, e)
+            return title, None
+
+    def run(self, titles: List[str]) -> Tuple[List[MovieDetails], List[str]]:
+        """Resolve all titles and add the movies found with a single save.
+
+        Args:
+            titles (List[str]): The titles or IMDb IDs to import.
+
+        Returns:
+            Tuple[List[MovieDetails], List[str]]: The movies added and the titles
+                that could not be resolved.
+        """
+        found, failed = [], []
+        with ThreadPoolExecutor(max_workers=self._workers) as executor:
+            for title, movie in executor.map(self._resolve_safely, titles):
+                if movie is None:
+                    failed.append(title)
+                else:
+                    found.append(movie)
+        added = self._storage.add_movies(found) if found else []
+        return added, failed
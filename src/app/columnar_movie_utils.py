@@ -0,0 +1,420 @@
+"""Module containing a NumPy-backed columnar variant of MovieUtils for bulk analytics.
+
+NumPy is an optional dependency; it is only needed when this backend is used.
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+import random
+from src.app.movie_details import MovieDetails
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+
+class ColumnarMovieUtils:
+    """MovieUtils with the same API, evaluated as vectorized operations over columns.
+
+    Titles, years and ratings are kept in parallel NumPy arrays with spare
+    capacity. A storage change appends, patches or swap-removes a single row,
+    so the columns are only built from the movies at startup and on reload.
+    """
+
+    def __init__(
+        self, movies: Dict[str, MovieDetails], title_index_path: Optional[str] = None
+    ):
+        """Initialize the utility class with a list of movies.
+
+        Plain dictionaries in movies are converted to MovieDetails in place.
+
+        Args:
+            movies (Dict[str, MovieDetails]): The movies keyed by title.
+            title_index_path (Optional[str]): Unused; accepted for API compatibility
+                with MovieUtils.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        if np is None:
+            raise ImportError("The columnar backend requires NumPy: pip install numpy")
+        for title, movie in movies.items():
+            if not isinstance(movie, MovieDetails):
+                movies[title] = MovieDetails.from_dict(movie)
+        self.movies = movies
+        self._title_index_path = title_index_path
+        # The columns have spare capacity; only the first _size rows are movies.
+        self._size = 0
+        self._positions: Dict[str, int] = {}
+        self._title_column = np.empty(0, dtype=object)
+        self._year_column = np.empty(0, dtype=np.int32)
+        self._rating_column = np.empty(0, dtype=np.float64)
+        # Lower-cased titles for search, built on the first search.
+        self._lower_column = None
+        # Rows sorted by (value, title) per sort key, with their values, built on
+        # the first sorted page and dropped when a row moves or its value changes.
+        self._sorted_rows: Dict[str, Tuple["np.ndarray", "np.ndarray"]] = {}
+        self._build_columns()
+
+    @property
+    def _titles(self):
+        """The title column."""
+        return self._title_column[: self._size]
+
+    @property
+    def _years(self):
+        """The year column."""
+        return self._year_column[: self._size]
+
+    @property
+    def _ratings(self):
+        """The rating column."""
+        return self._rating_column[: self._size]
+
+    def _build_columns(self) -> None:
+        """Build the columns from all movies."""
+        count = len(self.movies)
+        self._size = count
+        self._positions = {title: row for row, title in enumerate(self.movies)}
+        self._title_column = np.fromiter(self.movies.keys(), dtype=object, count=count)
+        self._year_column = np.fromiter(
+            (movie.year for movie in self.movies.values()), dtype=np.int32, count=count
+        )
+        self._rating_column = np.fromiter(
+            (movie.rating for movie in self.movies.values()),
+            dtype=np.float64,
+            count=count,
+        )
+        self._lower_column = None
+        self._sorted_rows = {}
+
+    def _reserve(self, size: int) -> None:
+        """Grow the columns, doubling their capacity, to hold at least size rows."""
+        capacity = len(self._title_column)
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity, 16)
+        for name in ("_title_column", "_year_column", "_rating_column", "_lower_column"):
+            column = getattr(self, name)
+            if column is not None:
+                grown = np.empty(capacity, dtype=column.dtype)
+                grown[: self._size] = column[: self._size]
+                setattr(self, name, grown)
+
+    def _set_row(self, row: int, movie: MovieDetails) -> None:
+        """Write a movie into one row of the columns."""
+        self._title_column[row] = movie.title
+        self._year_column[row] = movie.year
+        self._rating_column[row] = movie.rating
+        if self._lower_column is not None:
+            lower = movie.title.lower()
+            # Widen the fixed-width string column when a longer title comes in.
+            if len(lower) > self._lower_column.dtype.itemsize // 4:
+                self._lower_column = self._lower_column.astype(f"<U{2 * len(lower)}")
+            self._lower_column[row] = lower
+
+    def _records(self, positions) -> List[MovieDetails]:
+        """Return the movies at the given column positions."""
+        return [self.movies[title] for title in self._titles[positions]]
+
+    def movie_added(self, movie: MovieDetails) -> None:
+        """Storage listener: append the row of an added movie, or patch it if present."""
+        self.movies[movie.title] = movie
+        row = self._positions.get(movie.title)
+        if row is None:
+            row = self._size
+            self._reserve(row + 1)
+            self._positions[movie.title] = row
+            self._size += 1
+            self._sorted_rows = {}
+        elif (
+            self._year_column[row] != movie.year
+            or self._rating_column[row] != movie.rating
+        ):
+            self._sorted_rows = {}
+        self._set_row(row, movie)
+
+    def movie_deleted(self, movie: MovieDetails) -> None:
+        """Storage listener: swap the last row into the row of a deleted movie."""
+        self.movies.pop(movie.title, None)
+        row = self._positions.pop(movie.title, None)
+        if row is None:
+            return
+        last = self._size - 1
+        if row != last:
+            for column in (
+                self._title_column, self._year_column, self._rating_column, self._lower_column
+            ):
+                if column is not None:
+                    column[row] = column[last]
+            self._positions[self._title_column[row]] = row
+        # Drop the reference to the title held by the spare row.
+        self._title_column[last] = None
+        self._size = last
+        self._sorted_rows = {}
+
+    def movie_updated(self, movie: MovieDetails) -> None:
+        """Storage listener: patch the row of an updated movie."""
+        self.movie_added(movie)
+
+    def movies_reloaded(self, movies: Dict[str, MovieDetails]) -> None:
+        """Storage listener: rebuild the columns after the file changed on disk."""
+        self.movies = movies
+        self._build_columns()
+
+    def count_movies(self) -> int:
+        """Return the number of movies.
+
+        Returns:
+            int: The number of movies.
+        """
+        return self._size
+
+    def iter_movies(self) -> Iterator[MovieDetails]:
+        """Stream the movies held in memory, in storage order.
+
+        Returns:
+            Iterator[MovieDetails]: The movies.
+        """
+        return iter(self.movies.values())
+
+    def save_title_index(self) -> None:
+        """No-op; the columnar backend searches the title column directly."""
+
+    def filter_movies_by_rating_and_year(
+        self, min_rating=0.0, start_year=None, end_year=None
+    ) -> List[MovieDetails]:
+        """Filter movies by rating and optionally by year.
+
+        Args:
+            min_rating (float): The minimum rating to filter by.
+            start_year (int): The start year to filter by.
+            end_year (int): The end year to filter by.
+
+        Returns:
+            List[MovieDetails]: A list of filtered movies.
+        """
+        return self._records(
+            np.flatnonzero(self._filter_mask(min_rating, start_year, end_year))
+        )
+
+    def _filter_mask(self, min_rating, start_year, end_year):
+        """Return the boolean mask of the movies matching a rating and year filter."""
+        mask = self._ratings >= min_rating
+        if start_year is not None:
+            mask &= self._years >= start_year
+        if end_year is not None:
+            mask &= self._years <= end_year
+        return mask
+
+    def random_movie(self) -> MovieDetails:
+        """Return a random movie from the list.
+
+        Returns:
+            MovieDetails: The randomly chosen movie.
+        """
+        if not self._size:
+            return None
+        return self.movies[self._title_column[random.randrange(self._size)]]
+
+    def random_movies(
+        self,
+        k: int,
+        min_rating: float = 0.0,
+        year_range: Optional[Tuple[Optional[int], Optional[int]]] = None,
+    ) -> List[MovieDetails]:
+        """Return up to k distinct random movies matching a rating and year filter.
+
+        Args:
+            k (int): The number of movies to return.
+            min_rating (float): The minimum rating.
+            year_range (Optional[Tuple[Optional[int], Optional[int]]]): The first
+                and last year (inclusive), either of which may be None.
+
+        Returns:
+            List[MovieDetails]: The movies, fewer than k if fewer match.
+        """
+        start_year, end_year = year_range or (None, None)
+        positions = np.flatnonzero(
+            self._filter_mask(min_rating, start_year, end_year)
+        )
+        if k <= 0 or not positions.size:
+            return []
+        chosen = np.random.default_rng(random.getrandbits(64)).choice(
+            positions, size=min(k, len(positions)), replace=False
+        )
+        return self._records(chosen)
+
+    def search_movie(self, title: str) -> List[MovieDetails]:
+        """Search for a movie by title.
+
+        Args:
+            title (str): The title of the movie to search for.
+
+        Returns:
+            List[MovieDetails]: A list of movies matching the search title.
+        """
+        if self._lower_column is None:
+            lower = np.char.lower(self._titles.astype(str))
+            self._lower_column = np.empty(len(self._title_column), dtype=lower.dtype)
+            self._lower_column[: self._size] = lower
+        matches = np.char.find(self._lower_column[: self._size], title.lower()) >= 0
+        return self._records(np.flatnonzero(matches))
+
+    def sort_by_rating(self) -> List[MovieDetails]:
+        """Sort movies by their rating in descending order.
+
+        Returns:
+            List[MovieDetails]: A list of movies sorted by rating.
+        """
+        return self._records(np.argsort(-self._ratings, kind="stable"))
+
+    def sort_by_year(self) -> List[MovieDetails]:
+        """Sort movies by their release year in descending order.
+
+        Returns:
+            List[MovieDetails]: A list of movies sorted by release year.
+        """
+        return self._records(np.argsort(-self._years, kind="stable"))
+
+    def iter_sorted(
+        self,
+        key: str = "rating",
+        order: str = "desc",
+        page_size: int = 20,
+        after: Optional[Tuple[float, str]] = None,
+    ) -> Iterator[List[MovieDetails]]:
+        """Page through the movies sorted by rating or year.
+
+        The rows are sorted by (value, title) once, with np.lexsort, and the
+        order is kept until a movie is added, deleted or re-rated; each page is
+        then a binary search for the cursor and a slice of that order.
+
+        Args:
+            key (str): "rating" or "year".
+            order (str): "desc" (as sort_by_rating/sort_by_year) or "asc".
+            page_size (int): The number of movies per page.
+            after (Optional[Tuple[float, str]]): Resume after this cursor.
+
+        Raises:
+            ValueError: If key or order is not supported.
+
+        Yields:
+            List[MovieDetails]: The pages, each holding up to page_size movies.
+        """
+        if key not in ("rating", "year"):
+            raise ValueError(f"Unsupported sort key: {key}")
+        if order not in ("asc", "desc"):
+            raise ValueError(f"Unsupported sort order: {order}")
+        while True:
+            entries = self._page(key, page_size, after, descending=order == "desc")
+            if not entries:
+                return
+            after = entries[-1]
+            yield [self.movies[title] for _, title in entries]
+
+    def _sorted(self, key: str):
+        """Return the rows sorted by (value, title) ascending and their values."""
+        order = self._sorted_rows.get(key)
+        if order is None:
+            values = self._ratings if key == "rating" else self._years
+            # Sorting the titles as a fixed-width string array runs in C, unlike
+            # comparing the Python strings of the object column.
+            title_rank = np.empty(self._size, dtype=np.intp)
+            title_rank[np.argsort(self._titles.astype(str), kind="stable")] = np.arange(
+                self._size
+            )
+            rows = np.lexsort((title_rank, values))
+            order = self._sorted_rows[key] = (rows, values[rows])
+        return order
+
+    def _page(
+        self, key: str, size: int, after: Optional[Tuple[float, str]], descending: bool
+    ) -> List[Tuple[float, str]]:
+        """Return the (value, title) entries of the page following a cursor.
+
+        Args:
+            key (str): "rating" or "year".
+            size (int): The maximum number of entries.
+            after (Optional[Tuple[float, str]]): The entry the previous page ended with.
+            descending (bool): Order from the highest value down.
+
+        Returns:
+            List[Tuple[float, str]]: The entries of the page, in order.
+        """
+        if size <= 0:
+            return []
+        rows, sorted_values = self._sorted(key)
+        if after is None:
+            position = rows.size if descending else 0
+        else:
+            value, title = after
+            low = int(np.searchsorted(sorted_values, value, side="left"))
+            high = int(np.searchsorted(sorted_values, value, side="right"))
+            # Movies tied on the value are in title order, so the cursor's title
+            # is found with a second binary search among them.
+            tie_titles = self._titles[rows[low:high]]
+            side = "left" if descending else "right"
+            position = low + int(np.searchsorted(tie_titles, title, side=side))
+        if descending:
+            page = rows[max(0, position - size) : position][::-1]
+        else:
+            page = rows[position : position + size]
+        values = self._ratings if key == "rating" else self._years
+        return list(zip(values[page].tolist(), self._titles[page].tolist()))
+
+    def calculate_average_rating(self) -> float:
+        """Calculate the average rating of the movies.
+
+        Returns:
+            float: The average rating of the movies.
+        """
+        return float(self._ratings.mean()) if self._ratings.size else 0.0
+
+    def _top(self, keys, top_n: int):
+        """Return the positions of the top_n smallest keys, in ascending order."""
+        if top_n <= 0 or not keys.size:
+            return np.empty(0, dtype=np.intp)
+        if top_n < len(keys):
+            candidates = np.argpartition(keys, top_n - 1)[:top_n]
+        else:
+            candidates = np.arange(len(keys))
+        return candidates[np.argsort(keys[candidates], kind="stable")]
+
+    def find_best_movies(self, top_n=10) -> List[MovieDetails]:
+        """Find the top N best-rated movies.
+
+        Args:
+            top_n (int): The number of top movies to find.
+
+        Returns:
+            List[MovieDetails]: A list of the top N best-rated movies.
+        """
+        return self._records(self._top(-self._ratings, top_n))
+
+    def find_worst_movies(self, top_n=10) -> List[MovieDetails]:
+        """Find the top N worst-rated movies.
+
+        Args:
+            top_n (int): The number of worst movies to find.
+
+        Returns:
+            List[MovieDetails]: A list of the top N worst-rated movies.
+        """
+        return self._records(self._top(self._ratings, top_n))
+
+    def get_movies_statistics(self) -> Dict[str, object]:
+        """Compute and return statistics about the movies.
+
+        Returns:
+            Dict[str, object]: A dictionary containing statistics about the movies.
+        """
+        has_movies = len(self._ratings) > 0
+        return {
+            "total_movies": len(self._ratings),
+            "average_rating": self.calculate_average_rating(),
+            "max_rating": float(self._ratings.max()) if has_movies else None,
+            "min_rating": float(self._ratings.min()) if has_movies else None,
+            "best_movies": self.find_best_movies(top_n=5),
+            "worst_movies": self.find_worst_movies(top_n=5),
+        }
@@ -0,0 +1,342 @@
+"""Module containing a combined MovieUtils view over several movie storages."""
+
+import heapq
+import random
+from itertools import chain, islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from src.app.columnar_movie_utils import ColumnarMovieUtils
+from src.app.movie_details import MovieDetails
+from src.app.movie_utils import MovieUtils, SortCursor, sort_cursor
+from src.storage.i_storage import IStorage
+from src.storage.storage_sqlite import SqliteMovieUtils, SqliteStorage
+
+# The number of movies each storage hands to a full merge at a time.
+MERGE_PAGE_SIZE = 1000
+
+
+class _ImdbIds:
+    """Storage listener keeping the set of IMDb IDs a storage holds."""
+
+    def __init__(self, movies: Iterable[MovieDetails]) -> None:
+        """Collect the IMDb IDs of the movies a storage holds initially."""
+        self.ids = {movie.imdb_id for movie in movies if movie.imdb_id}
+
+    def movie_added(self, movie: MovieDetails) -> None:
+        """Storage listener: remember the IMDb ID of an added movie."""
+        if movie.imdb_id:
+            self.ids.add(movie.imdb_id)
+
+    def movie_deleted(self, movie: MovieDetails) -> None:
+        """Storage listener: forget the IMDb ID of a deleted movie."""
+        self.ids.discard(movie.imdb_id)
+
+    def movie_updated(self, movie: MovieDetails) -> None:
+        """Storage listener: only notes change, so the IMDb ID stays the same."""
+
+    def movies_reloaded(self, movies: Dict[str, MovieDetails]) -> None:
+        """Storage listener: collect the IMDb IDs again after the file changed on disk."""
+        self.ids = {movie.imdb_id for movie in movies.values() if movie.imdb_id}
+
+
+class FederatedMovieUtils:
+    """MovieUtils over several storages, e.g. per-user catalogs, without combining them.
+
+    Every storage keeps its own MovieUtils (or SqliteMovieUtils) and indexes.
+    Sorted listings, top-N and statistics stream a k-way heap merge of the
+    per-storage sorted pages; searches and filters run on each storage in
+    turn. A movie whose IMDb ID is also stored in an earlier storage is
+    left out, so the first storage wins; the IMDb IDs of every storage are
+    kept in memory to check this without querying the storages.
+    """
+
+    def __init__(
+        self,
+        storages: List[IStorage],
+        title_index_paths: Optional[List[Optional[str]]] = None,
+        columnar: bool = False,
+    ) -> None:
+        """Initialize the view and subscribe a utility object to each storage.
+
+        Args:
+            storages (List[IStorage]): The storages, in order of precedence.
+            title_index_paths (Optional[List[Optional[str]]]): Where to persist
+                the title search index of each storage.
+            columnar (bool): Use the NumPy columnar backend for file storages.
+        """
+        self._storages = storages
+        self._utils: List[Any] = []
+        self._imdb_ids: List[_ImdbIds] = []
+        for storage, title_index_path in zip(
+            storages, title_index_paths or [None] * len(storages)
+        ):
+            if isinstance(storage, SqliteStorage):
+                utils = SqliteMovieUtils(storage)
+            else:
+                utils_class = ColumnarMovieUtils if columnar else MovieUtils
+                utils = utils_class(storage.load_movies_file(), title_index_path)
+            storage.subscribe(utils)
+            self._utils.append(utils)
+            # File storages are read from the movies the utilities already hold.
+            imdb_ids = _ImdbIds(utils.iter_movies())
+            storage.subscribe(imdb_ids)
+            self._imdb_ids.append(imdb_ids)
+
+    def _is_duplicate(self, number: int, movie: MovieDetails) -> bool:
+        """Return whether a movie of the number-th storage is also in an earlier storage."""
+        return bool(movie.imdb_id) and any(
+            movie.imdb_id in imdb_ids.ids for imdb_ids in self._imdb_ids[:number]
+        )
+
+    def _deduplicated(self, number: int, movies: Iterable[MovieDetails]) -> Iterator[MovieDetails]:
+        """Yield the movies of the number-th storage that no earlier storage holds."""
+        for movie in movies:
+            if not self._is_duplicate(number, movie):
+                yield movie
+
+    def _fan_out(self, call: Callable[[Any], List[MovieDetails]]) -> List[MovieDetails]:
+        """Run a query on every storage and combine the results in storage order.
+
+        The queries run one after the other: they are in-memory Python or
+        SQLite calls bound by the GIL, so a thread pool would only add overhead.
+
+        Args:
+            call (Callable[[Any], List[MovieDetails]]): Runs the query on one
+                utility object.
+
+        Returns:
+            List[MovieDetails]: The results without duplicates.
+        """
+        return [
+            movie
+            for number, utils in enumerate(self._utils)
+            for movie in self._deduplicated(number, call(utils))
+        ]
+
+    def _merged(
+        self,
+        key: str,
+        order: str,
+        page_size: int = MERGE_PAGE_SIZE,
+        after: Optional[SortCursor] = None,
+    ) -> Iterator[MovieDetails]:
+        """Stream the movies of all storages sorted by rating or year.
+
+        Each storage is read page by page, so taking the first n movies reads
+        at most about n movies from every storage.
+
+        Args:
+            key (str): "rating" or "year".
+            order (str): "desc" or "asc".
+            page_size (int): The number of movies read from a storage at a time.
+            after (Optional[SortCursor]): Start after this cursor.
+
+        Returns:
+            Iterator[MovieDetails]: The movies ordered by (value, title).
+        """
+        streams = [
+            self._deduplicated(
+                number, chain.from_iterable(utils.iter_sorted(key, order, page_size, after))
+            )
+            for number, utils in enumerate(self._utils)
+        ]
+        return heapq.merge(
+            *streams, key=lambda movie: sort_cursor(movie, key), reverse=order == "desc"
+        )
+
+    def count_movies(self) -> int:
+        """Return the number of movies of all storages, counting duplicates once.
+
+        Returns:
+            int: The number of movies.
+        """
+        count = 0
+        seen: set = set()
+        for utils, imdb_ids in zip(self._utils, self._imdb_ids):
+            count += utils.count_movies() - len(imdb_ids.ids & seen)
+            seen |= imdb_ids.ids
+        return count
+
+    def iter_movies(self) -> Iterator[MovieDetails]:
+        """Stream the movies of all storages, in storage order and without duplicates.
+
+        Yields:
+            MovieDetails: The movies.
+        """
+        for number, utils in enumerate(self._utils):
+            yield from self._deduplicated(number, utils.iter_movies())
+
+    def save_title_index(self) -> None:
+        """Persist the title index of every storage that has changed."""
+        for utils in self._utils:
+            utils.save_title_index()
+
+    def filter_movies_by_rating_and_year(
+        self, min_rating=0.0, start_year=None, end_year=None
+    ) -> List[MovieDetails]:
+        """Filter the movies of all storages by rating and optionally by year.
+
+        Args:
+            min_rating (float): The minimum rating to filter by.
+            start_year (int): The start year to filter by.
+            end_year (int): The end year to filter by.
+
+        Returns:
+            List[MovieDetails]: A list of filtered movies.
+        """
+        return self._fan_out(
+            lambda utils: utils.filter_movies_by_rating_and_year(min_rating, start_year, end_year)
+        )
+
+    def search_movie(self, title: str) -> List[MovieDetails]:
+        """Search the movies of all storages by title.
+
+        Args:
+            title (str): The title of the movie to search for.
+
+        Returns:
+            List[MovieDetails]: A list of movies matching the search title.
+        """
+        return self._fan_out(lambda utils: utils.search_movie(title))
+
+    def random_movie(self) -> Optional[MovieDetails]:
+        """Return a random movie of a random storage.
+
+        Returns:
+            Optional[MovieDetails]: The randomly chosen movie, or None if all
+                storages are empty.
+        """
+        return next(iter(self.random_movies(1)), None)
+
+    def random_movies(
+        self,
+        k: int,
+        min_rating: float = 0.0,
+        year_range: Optional[Tuple[Optional[int], Optional[int]]] = None,
+    ) -> List[MovieDetails]:
+        """Return up to k distinct random movies matching a rating and year filter.
+
+        Every storage draws up to k candidates and k of them are picked, so
+        a movie of a small storage is more likely to be drawn than one of a
+        large storage.
+
+        Args:
+            k (int): The number of movies to return.
+            min_rating (float): The minimum rating.
+            year_range (Optional[Tuple[Optional[int], Optional[int]]]): The first
+                and last year (inclusive), either of which may be None.
+
+        Returns:
+            List[MovieDetails]: The movies, fewer than k if fewer match.
+        """
+        if k <= 0:
+            return []
+        candidates = self._fan_out(lambda utils: utils.random_movies(k, min_rating, year_range))
+        return random.sample(candidates, min(k, len(candidates)))
+
+    def iter_sorted(
+        self,
+        key: str = "rating",
+        order: str = "desc",
+        page_size: int = 20,
+        after: Optional[SortCursor] = None,
+    ) -> Iterator[List[MovieDetails]]:
+        """Page through the movies of all storages sorted by rating or year.
+
+        Args:
+            key (str): "rating" or "year".
+            order (str): "desc" (as sort_by_rating/sort_by_year) or "asc".
+            page_size (int): The number of movies per page.
+            after (Optional[SortCursor]): Resume after this cursor, as returned
+                by sort_cursor for the last movie of a page.
+
+        Raises:
+            ValueError: If key or order is not supported.
+
+        Yields:
+            List[MovieDetails]: The pages, each holding up to page_size movies.
+        """
+        movies = self._merged(key, order, page_size, after)
+        while True:
+            page = list(islice(movies, page_size))
+            if not page:
+                return
+            yield page
+
+    def sort_by_rating(self) -> List[MovieDetails]:
+        """Sort the movies of all storages by their rating in descending order.
+
+        Returns:
+            List[MovieDetails]: A list of movies sorted by rating.
+        """
+        return list(self._merged("rating", "desc"))
+
+    def sort_by_year(self) -> List[MovieDetails]:
+        """Sort the movies of all storages by their release year in descending order.
+
+        Returns:
+            List[MovieDetails]: A list of movies sorted by release year.
+        """
+        return list(self._merged("year", "desc"))
+
+    def calculate_average_rating(self) -> float:
+        """Calculate the average rating of the movies of all storages.
+
+        Returns:
+            float: The average rating of the movies.
+        """
+        return self.get_movies_statistics()["average_rating"]
+
+    def find_best_movies(self, top_n=10) -> List[MovieDetails]:
+        """Find the top N best-rated movies of all storages.
+
+        Args:
+            top_n (int): The number of top movies to find.
+
+        Returns:
+            List[MovieDetails]: A list of the top N best-rated movies.
+        """
+        return list(islice(self._merged("rating", "desc", max(1, top_n)), top_n))
+
+    def find_worst_movies(self, top_n=10) -> List[MovieDetails]:
+        """Find the top N worst-rated movies of all storages.
+
+        Args:
+            top_n (int): The number of worst movies to find.
+
+        Returns:
+            List[MovieDetails]: A list of the top N worst-rated movies.
+        """
+        return list(islice(self._merged("rating", "asc", max(1, top_n)), top_n))
+
+    def get_movies_statistics(self) -> Dict[str, Any]:
+        """Combine the statistics of all storages, leaving out duplicate movies.
+
+        The count and rating total of every storage are combined, and the
+        movies a later storage shares with an earlier one are subtracted, so
+        no storage is read in full.
+
+        Returns:
+            Dict[str, Any]: A dictionary containing statistics about the movies.
+        """
+        count, total = 0, 0.0
+        seen: set = set()
+        for storage, utils, imdb_ids in zip(self._storages, self._utils, self._imdb_ids):
+            statistics = utils.get_movies_statistics()
+            count += statistics["total_movies"]
+            total += statistics["average_rating"] * statistics["total_movies"]
+            for imdb_id in imdb_ids.ids & seen:
+                movie = storage.find_by_imdb_id(imdb_id)
+                if movie is not None:
+                    count -= 1
+                    total -= movie.rating
+            seen |= imdb_ids.ids
+        best = self.find_best_movies(top_n=5)
+        worst = self.find_worst_movies(top_n=5)
+        return {
+            "total_movies": count,
+            "average_rating": total / count if count else 0.0,
+            "max_rating": best[0].rating if best else None,
+            "min_rating": worst[0].rating if worst else None,
+            "best_movies": best,
+            "worst_movies": worst,
+        }
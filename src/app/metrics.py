@@ -0,0 +1,210 @@
+"""Module containing the in-process metrics registry and the timing hooks feeding it.
+
+Hooks are applied with the timed decorator when a module is imported. With
+metrics disabled (the default) the decorator returns the function itself, so
+the hooks cost nothing at runtime.
+"""
+
+import functools
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from src.config import METRICS_ENABLED
+
+# A metric name and its sorted (label, value) pairs.
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict[str, Any]) -> MetricKey:
+    return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for label, value in labels:
+        value = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{label}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class MetricsRegistry:
+    """Thread-safe store of counters, gauges and timing summaries."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._lock = threading.Lock()
+        self._counters: Dict[MetricKey, float] = {}
+        self._gauges: Dict[MetricKey, float] = {}
+        # count, sum and max of the observed values.
+        self._summaries: Dict[MetricKey, list] = {}
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Add to a counter.
+
+        Args:
+            name (str): The metric name, e.g. "storage_bytes_read_total".
+            value (float): The amount to add.
+            **labels (Any): The labels of the series.
+        """
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """Set a gauge to its current value.
+
+        Args:
+            name (str): The metric name.
+            value (float): The value.
+            **labels (Any): The labels of the series.
+        """
+        with self._lock:
+            self._gauges[_key(name, labels)] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Record a value, e.g. a duration in seconds, in a summary.
+
+        Args:
+            name (str): The metric name, e.g. "movie_app_command_seconds".
+            value (float): The observed value.
+            **labels (Any): The labels of the series.
+        """
+        key = _key(name, labels)
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is None:
+                self._summaries[key] = [1, value, value]
+            else:
+                summary[0] += 1
+                summary[1] += value
+                summary[2] = max(summary[2], value)
+
+    def reset(self) -> None:
+        """Remove all metrics."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._summaries.clear()
+
+    def to_json(self) -> Dict[str, list]:
+        """Return all metrics as JSON-serializable data.
+
+        Returns:
+            Dict[str, list]: The counters, gauges and summaries, each a list of
+                series with their name, labels and values.
+        """
+        with self._lock:
+            return {
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self._counters.items())
+                ],
+                "gauges": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self._gauges.items())
+                ],
+                "summaries": [
+                    {
+                        "name": name,
+                        "labels": dict(labels),
+                        "count": count,
+                        "sum": total,
+                        "max": maximum,
+                    }
+                    for (name, labels), (count, total, maximum) in sorted(
+                        self._summaries.items()
+                    )
+                ],
+            }
+
+    def to_prometheus(self) -> str:
+        """Return all metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics, one series per line.
+        """
+        lines = []
+        declared = set()
+
+        def declare(name: str, kind: str) -> None:
+            if name not in declared:
+                declared.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            for (name, labels), value in sorted(self._counters.items()):
+                declare(name, "counter")
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+            for (name, labels), value in sorted(self._gauges.items()):
+                declare(name, "gauge")
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+            for (name, labels), (count, total, _) in sorted(self._summaries.items()):
+                declare(name, "summary")
+                lines.append(f"{name}_count{_format_labels(labels)} {count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+            for (name, labels), (_, _, maximum) in sorted(self._summaries.items()):
+                declare(f"{name}_max", "gauge")
+                lines.append(f"{name}_max{_format_labels(labels)} {maximum}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, file_path: str) -> None:
+        """Write the metrics to a file, as JSON for .json files and Prometheus text otherwise.
+
+        Args:
+            file_path (str): The path of the file.
+        """
+        with open(file_path, "w", encoding="utf-8") as file:
+            if file_path.lower().endswith(".json"):
+                json.dump(self.to_json(), file, indent=4)
+            else:
+                file.write(self.to_prometheus())
+
+
+REGISTRY = MetricsRegistry()
+
+
+def timed(
+    name: str,
+    record: Optional[Callable[[MetricsRegistry, tuple, Any], None]] = None,
+    enabled: bool = METRICS_ENABLED,
+    **labels: Any,
+) -> Callable[[Callable], Callable]:
+    """Decorator recording the wall time of each call in the "<name>_seconds" summary.
+
+    Args:
+        name (str): The metric name prefix, e.g. "storage_save".
+        record (Optional[Callable]): Called with the registry, the call's
+            arguments and its result after each call, to record further
+            metrics such as bytes or record counts.
+        enabled (bool): Whether to instrument at all; if False the function
+            is returned unchanged.
+        **labels (Any): The labels of the series.
+
+    Returns:
+        Callable[[Callable], Callable]: The decorator.
+    """
+
+    def decorator(function: Callable) -> Callable:
+        if not enabled:
+            return function
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            except BaseException:
+                REGISTRY.inc(f"{name}_errors_total", **labels)
+                raise
+            finally:
+                REGISTRY.observe(f"{name}_seconds", time.perf_counter() - start, **labels)
+            if record is not None:
+                record(REGISTRY, args, result)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -6,37 +6,111 @@ Returns:
 """
 
 import logging
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+import requests
+from src.app.bulk_import import BulkImporter, read_titles
+from src.app.metrics import REGISTRY, timed
 from src.app.movie_details import MovieDetails
 from src.storage.i_storage import IStorage
+from src.storage.omdb import OmdbClient
+from src.storage.storage_sqlite import SqliteMovieUtils, SqliteStorage
 from src.app.movie_utils import MovieUtils
+from src.app.columnar_movie_utils import ColumnarMovieUtils
+from src.app.federated_movie_utils import FederatedMovieUtils
+from src.config import LIST_PAGE_SIZE, METRICS_ENABLED, METRICS_PATH
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def paginate(items: Iterable, page_size: int) -> Iterator[List]:
+    """
+    Split an iterable into pages without materializing it.
+
+    Args:
+        items (Iterable): The items.
+        page_size (int): The number of items per page.
+
+    Yields:
+        List: The pages.
+    """
+    iterator = iter(items)
+    while page := list(islice(iterator, page_size)):
+        yield page
+
+
 class MovieApp:
     """
     MovieApp class to manage the movie database application.
     """
 
-    def __init__(self, storage: IStorage) -> None:
+    def __init__(
+        self,
+        storage: IStorage,
+        title_index_path: Optional[str] = None,
+        columnar: bool = False,
+        catalogs: Optional[List[IStorage]] = None,
+        omdb_client: Optional[OmdbClient] = None,
+    ) -> None:
         """
         Initialize the MovieApp with a storage object.
 
         Args:
             storage (IStorage): The storage object to use for the movie database.
+            title_index_path (Optional[str]): Where to persist the title search index.
+            columnar (bool): Use the NumPy columnar backend for MovieUtils.
+            catalogs (Optional[List[IStorage]]): Further storages to list and
+                query together with storage, e.g. other users' catalogs. Movies
+                are only added to, deleted from and updated in storage.
+            omdb_client (Optional[OmdbClient]): The client the storage looks
+                movies up with; its cache is flushed after imports and on exit.
         """
         self._storage = storage
-        self.utils = MovieUtils(self._storage.load_movies_file())
+        self._omdb_client = omdb_client
+        self._storages = [storage, *(catalogs or [])]
+        if catalogs:
+            # Subscribes a utility object to every storage itself.
+            self.utils = FederatedMovieUtils(
+                self._storages,
+                [title_index_path] + [None] * len(catalogs),
+                columnar=columnar,
+            )
+            return
+        if isinstance(storage, SqliteStorage):
+            self.utils = SqliteMovieUtils(storage)
+        else:
+            # load_movies_file returns the storage's live dictionary, so the
+            # utilities and the storage share a single copy of the movies.
+            utils_class = ColumnarMovieUtils if columnar else MovieUtils
+            self.utils = utils_class(self._storage.load_movies_file(), title_index_path)
+        self._storage.subscribe(self.utils)
 
     def _command_list_movies(self) -> None:
         """
         List all movies in the database.
+
+        The movies are shown page by page from the movies already in memory,
+        or streamed from the database, so the catalog is never re-read just to
+        be listed.
+        """
+        logger.info("\n%d movies in total\n", self.utils.count_movies())
+        self._show_pages(paginate(self.utils.iter_movies(), LIST_PAGE_SIZE))
+
+    def _show_pages(self, pages: Iterator[List[MovieDetails]]) -> None:
+        """
+        Log movies one page at a time, asking before each further page.
+
+        Args:
+            pages (Iterator[List[MovieDetails]]): The pages, computed on demand.
         """
-        movies = self._storage.load_movies_file()
-        logger.info("\n%d movies in total\n", len(movies))
-        for movie, details in movies.items():
-            logger.info("%s (%d): %f", movie, details["Year"], details["Rating"])
+        page = next(pages, None)
+        while page:
+            for movie in page:
+                logger.info("%s (%d): %f", movie.title, movie.year, movie.rating)
+            page = next(pages, None)
+            if page and input("\nPress Enter for more, or q to stop: ").strip().lower() == "q":
+                break
 
     def _command_add_movie(self) -> None:
         """
@@ -47,18 +121,13 @@ class MovieApp:
             movie_data = self._storage.load_movies_api(title)
             logger.debug(f"Received movie data from API: {movie_data}")
             if movie_data:
-                movie = MovieDetails(
-                    title=movie_data["Title"],
-                    year=int(movie_data["Year"]),
-                    rating=float(movie_data["Rating"]),
-                    poster=movie_data["Poster"],
-                    imdb_id=movie_data["ImdbID"],
-                )
+                # from_dict also reads series' year ranges such as "2010–2013".
+                movie = MovieDetails.from_dict(movie_data)
                 logger.debug(f"Created MovieDetails object: {movie}")
                 self._storage.add_movie(movie)
             else:
                 logger.info("Movie '%s' not found.", title)
-        except KeyError as e:
+        except (KeyError, ValueError) as e:
             logger.error("Error adding movie: %s", e)
 
     def _command_delete_movie(self) -> None:
@@ -92,10 +161,10 @@ class MovieApp:
         logger.info("Average rating: %.2f", statistics["average_rating"])
         logger.info("\nBest movie(s) by rating:")
         for movie in statistics["best_movies"]:
-            logger.info("%s (%d): %f", movie["Title"], movie["Year"], movie["Rating"])
+            logger.info("%s (%d): %f", movie.title, movie.year, movie.rating)
         logger.info("\nWorst movie(s) by rating:")
         for movie in statistics["worst_movies"]:
-            logger.info("%s (%d): %f", movie["Title"], movie["Year"], movie["Rating"])
+            logger.info("%s (%d): %f", movie.title, movie.year, movie.rating)
 
         logger.info("\n")
 
@@ -107,9 +176,9 @@ class MovieApp:
         if random_movie:
             logger.info(
                 "\nRandom movie: %s (%d): %f",
-                random_movie["Title"],
-                random_movie["Year"],
-                random_movie["Rating"],
+                random_movie.title,
+                random_movie.year,
+                random_movie.rating,
             )
 
     def _command_search(self) -> None:
@@ -125,9 +194,9 @@ class MovieApp:
             for movie in movies:
                 logger.info(
                     "Title: %s, Year: %d, Rating: %f",
-                    movie["Title"],
-                    movie["Year"],
-                    movie["Rating"],
+                    movie.title,
+                    movie.year,
+                    movie.rating,
                 )
             logger.info("\n")
 
@@ -135,20 +204,16 @@ class MovieApp:
         """
         Sort movies by their rating in descending order and print the sorted list.
         """
-        sorted_movies = self.utils.sort_by_rating()
         logger.info("\nMovies sorted by rating:")
-        for movie in sorted_movies:
-            logger.info("%s (%d): %f", movie["Title"], movie["Year"], movie["Rating"])
+        self._show_pages(self.utils.iter_sorted("rating", "desc", LIST_PAGE_SIZE))
         logger.info("\n")
 
     def _command_sort_by_year(self) -> None:
         """
         Sort movies by their release year in descending order and print the sorted list.
         """
-        sorted_movies = self.utils.sort_by_year()
         logger.info("\nMovies sorted by year:")
-        for movie in sorted_movies:
-            logger.info("%s (%d): %f", movie["Title"], movie["Year"], movie["Rating"])
+        self._show_pages(self.utils.iter_sorted("year", "desc", LIST_PAGE_SIZE))
         logger.info("\n")
 
     def _command_filter_movie(self) -> None:
@@ -179,7 +244,7 @@ class MovieApp:
             )
             for movie in filtered_movies:
                 logger.info(
-                    "%s (%d): %f", movie["Title"], movie["Year"], movie["Rating"]
+                    "%s (%d): %f", movie.title, movie.year, movie.rating
                 )
             logger.info("\n")
         except ValueError:
@@ -193,6 +258,34 @@ class MovieApp:
         """
         self._storage.generate_website()
 
+    def _command_import_movies(self) -> None:
+        """
+        Import the titles or IMDb IDs listed in a text or CSV file.
+        """
+        file_path = input("Enter the path of the file to import: ").strip()
+        try:
+            titles = read_titles(file_path)
+        except OSError as e:
+            logger.error("Error reading '%s': %s", file_path, e)
+            return
+        try:
+            added, failed = BulkImporter(self._storage).run(titles)
+        except (OSError, requests.RequestException, ValueError) as e:
+            logger.error("Error importing movies: %s", e)
+            return
+        finally:
+            self._flush_lookups()
+        logger.info("\nImported %d of %d movies.", len(added), len(titles))
+        if failed:
+            logger.info("Not found or failed: %s", ", ".join(failed))
+
+    def _flush_lookups(self) -> None:
+        """
+        Write the OMDb cache's pending access times, if there is a client.
+        """
+        if self._omdb_client is not None:
+            self._omdb_client.flush()
+
     def display_menu(self) -> None:
         """Display the application menu."""
         logger.info("\n******* My Movies Database *******")
@@ -213,6 +306,12 @@ class MovieApp:
         "9": ("Movies sorted by year", _command_sort_by_year),
         "10": ("Filter movies", _command_filter_movie),
         "11": ("Generate website", _command_generate_website),
+        "12": ("Import movies from file", _command_import_movies),
+    }
+    # Time every command; a no-op unless METRICS_ENABLED is set.
+    menu_options = {
+        key: (descr, function and timed("movie_app_command", command=descr)(function))
+        for key, (descr, function) in menu_options.items()
     }
 
     def run(self) -> None:
@@ -225,9 +324,15 @@ class MovieApp:
             if choice in self.menu_options:
                 descr, function = self.menu_options[choice]
                 if choice == "0":
+                    self.utils.save_title_index()
+                    self._flush_lookups()
+                    if METRICS_ENABLED:
+                        REGISTRY.dump(METRICS_PATH)
                     logger.info("\nExiting the application. Goodbye!")
                     break
                 logger.info("\nExecuting: %s", descr)
+                for storage in self._storages:
+                    storage.refresh()
                 function(self)
             else:
                 logger.warning(
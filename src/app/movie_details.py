@@ -1,11 +1,65 @@
 """ This module contains the MovieDetails class. """
 
+import re
+import unicodedata
 from dataclasses import dataclass
+from typing import Any, Dict, Mapping
 
+# Maps the keys used by the JSON/CSV files to the MovieDetails attributes.
+FIELD_KEYS = {
+    "Title": "title",
+    "Year": "year",
+    "Rating": "rating",
+    "Poster": "poster",
+    "Notes": "notes",
+    "ImdbID": "imdb_id",
+}
 
-@dataclass
+# OMDb gives series a range such as "2010–2012" or "2010–"; its first year is used.
+YEAR_PATTERN = re.compile(r"\d{4}")
+
+
+def parse_year(value: Any) -> int:
+    """Return the (first) year of a year value, or 0 if it has none.
+
+    Args:
+        value (Any): E.g. 1999, "1999" or "2010–2012".
+
+    Returns:
+        int: The year.
+    """
+    match = YEAR_PATTERN.match(str(value or "").strip())
+    return int(match.group()) if match else 0
+
+
+def normalize_title(title: str) -> str:
+    """Return the form of a title used to detect duplicates.
+
+    Titles are case-folded, stripped of accents and have their whitespace
+    collapsed, so "Amélie", "amelie" and " AMELIE " are the same movie.
+
+    Args:
+        title (str): The title.
+
+    Returns:
+        str: The normalized title.
+    """
+    if title.isascii():
+        # Nothing to decompose, and lower() is casefold() for ASCII.
+        return " ".join(title.lower().split())
+    decomposed = unicodedata.normalize("NFKD", title.casefold())
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.split())
+
+
+@dataclass(slots=True)
 class MovieDetails:
-    """A class to represent movie details."""
+    """A class to represent movie details.
+
+    This is also the in-memory record type of the storages: values are parsed
+    once when a file is loaded, and the file keys ("Title", "Rating", ...) can
+    still be used to read fields, e.g. movie["Rating"].
+    """
 
     title: str
     year: int
@@ -13,3 +67,42 @@ class MovieDetails:
     poster: str
     imdb_id: str = ""
     notes: str = ""
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, FIELD_KEYS[key])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value of a file key, or default if the key is unknown."""
+        attribute = FIELD_KEYS.get(key)
+        return default if attribute is None else getattr(self, attribute)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "MovieDetails":
+        """Create a record from a dictionary using the file keys.
+
+        Args:
+            data (Mapping[str, Any]): The movie data, with string or numeric values.
+
+        Returns:
+            MovieDetails: The parsed movie record.
+        """
+        rating = data.get("Rating") or 0
+        return cls(
+            title=data["Title"],
+            year=parse_year(data.get("Year")),
+            rating=0.0 if rating == "N/A" else float(rating),
+            poster=data.get("Poster") or "",
+            imdb_id=data.get("ImdbID") or "",
+            notes=data.get("Notes") or "",
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the movie as a dictionary using the file keys.
+
+        Returns:
+            Dict[str, Any]: The movie data.
+        """
+        return {key: getattr(self, attribute) for key, attribute in FIELD_KEYS.items()}
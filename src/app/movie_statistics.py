@@ -0,0 +1,119 @@
+"""Module containing an incrementally maintained statistics engine for movie ratings."""
+
+import heapq
+from typing import Callable, Iterable, List, Optional, Tuple
+
+
+class MovieStatistics:
+    """Running rating totals plus bounded heaps of the best and worst rated movies.
+
+    The heaps hold at most `capacity` (rating, title) entries each. When a movie
+    held by a heap is removed, that heap is rebuilt lazily from `source` on the
+    next query, which costs O(N log k) instead of a full sort.
+    """
+
+    def __init__(
+        self, source: Callable[[], Iterable[Tuple[float, str]]], capacity: int = 10
+    ) -> None:
+        """Initialize the statistics from all (rating, title) pairs of the source.
+
+        Args:
+            source (Callable[[], Iterable[Tuple[float, str]]]): Returns every
+                (rating, title) pair of the catalog; used to (re)build the heaps.
+            capacity (int): The number of best and worst movies to keep.
+        """
+        self._source = source
+        self._capacity = capacity
+        self.count = 0
+        self.total_rating = 0.0
+        for rating, _ in source():
+            self.count += 1
+            self.total_rating += rating
+        self._best: Optional[List[Tuple[float, str]]] = None
+        self._worst: Optional[List[Tuple[float, str]]] = None
+
+    @property
+    def average_rating(self) -> float:
+        """The average rating, or 0.0 if there are no movies."""
+        return self.total_rating / self.count if self.count else 0.0
+
+    @property
+    def max_rating(self) -> Optional[float]:
+        """The highest rating, or None if there are no movies."""
+        best = self.best(1)
+        return best[0][0] if best else None
+
+    @property
+    def min_rating(self) -> Optional[float]:
+        """The lowest rating, or None if there are no movies."""
+        worst = self.worst(1)
+        return worst[0][0] if worst else None
+
+    def add(self, rating: float, title: str) -> None:
+        """Account for a movie added to the catalog.
+
+        Args:
+            rating (float): The rating of the movie.
+            title (str): The title of the movie.
+        """
+        self.count += 1
+        self.total_rating += rating
+        if self._best is not None:
+            self._push(self._best, (rating, title))
+        if self._worst is not None:
+            self._push(self._worst, (-rating, title))
+
+    def remove(self, rating: float, title: str) -> None:
+        """Account for a movie removed from the catalog.
+
+        Args:
+            rating (float): The rating of the movie.
+            title (str): The title of the movie.
+        """
+        self.count -= 1
+        self.total_rating -= rating
+        if not self.count:
+            self.total_rating = 0.0
+        if self._best is not None and (rating, title) in self._best:
+            self._best = None
+        if self._worst is not None and (-rating, title) in self._worst:
+            self._worst = None
+
+    def best(self, top_n: int) -> List[Tuple[float, str]]:
+        """Return the top N (rating, title) pairs, best first.
+
+        Args:
+            top_n (int): The number of movies to return.
+
+        Returns:
+            List[Tuple[float, str]]: The best rated movies.
+        """
+        if top_n > self._capacity:
+            return heapq.nlargest(top_n, self._source())
+        if self._best is None:
+            self._best = heapq.nlargest(self._capacity, self._source())[::-1]
+        return heapq.nlargest(top_n, self._best)
+
+    def worst(self, top_n: int) -> List[Tuple[float, str]]:
+        """Return the bottom N (rating, title) pairs, worst first.
+
+        Args:
+            top_n (int): The number of movies to return.
+
+        Returns:
+            List[Tuple[float, str]]: The worst rated movies.
+        """
+        if top_n > self._capacity:
+            return heapq.nsmallest(top_n, self._source())
+        if self._worst is None:
+            worst = heapq.nsmallest(self._capacity, self._source())
+            self._worst = [(-rating, title) for rating, title in worst]
+            heapq.heapify(self._worst)
+        return [(-rating, title) for rating, title in heapq.nlargest(top_n, self._worst)]
+
+    def _push(self, heap: List[Tuple[float, str]], entry: Tuple[float, str]) -> None:
+        """Push an entry into a bounded min-heap, evicting the smallest if full."""
+        if len(heap) < self._capacity:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
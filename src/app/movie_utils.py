@@ -4,12 +4,20 @@ Returns:
     _type_:  A class that contains utility functions for movie-related functionalities.
 """
 
-from typing import Dict, List, TypedDict
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, TypedDict
+import logging
+import os
 import random
+from src.app.movie_details import MovieDetails
+from src.app.movie_statistics import MovieStatistics
+from src.app.sorted_index import SortedIndex
+from src.app.trigram_index import TrigramIndex
+
+logger = logging.getLogger(__name__)
 
 
 class MovieData(TypedDict):
-    """A type definition for the movie data dictionary."""
+    """A type definition for the movie data dictionary as stored in the files."""
 
     Title: str
     Year: int
@@ -19,16 +27,219 @@ class MovieData(TypedDict):
     ImdbId: str
 
 
+# The (sort value, title) of the last movie of a page.
+SortCursor = Tuple[float, str]
+
+
+def sort_cursor(movie: MovieDetails, key: str) -> SortCursor:
+    """Return the cursor to resume iter_sorted after a movie.
+
+    Args:
+        movie (MovieDetails): The last movie shown.
+        key (str): The sort key, "rating" or "year".
+
+    Returns:
+        SortCursor: The cursor.
+    """
+    return getattr(movie, key), movie.title
+
+
+def lazy_shuffle(start: int, end: int) -> Iterator[int]:
+    """Yield the positions start..end-1 in random order, without materializing them.
+
+    A Fisher-Yates shuffle that only remembers the positions it swapped, so
+    drawing k positions takes O(k) time and memory however large the range is.
+
+    Args:
+        start (int): The first position.
+        end (int): The position after the last one.
+
+    Yields:
+        int: Every position in the range exactly once.
+    """
+    swapped: Dict[int, int] = {}
+    for position in range(start, end):
+        other = random.randrange(position, end)
+        yield swapped.get(other, other)
+        swapped[other] = swapped.pop(position, position)
+
+
 class MovieUtils:
     """Utility class for movie-related functionalities like filtering, searching, and statistics."""
 
-    def __init__(self, movies: Dict[str, Dict[str, MovieData]]):
-        """Initialize the utility class with a list of movies."""
+    def __init__(
+        self,
+        movies: Dict[str, MovieDetails],
+        title_index_path: Optional[str] = None,
+    ):
+        """Initialize the utility class with a list of movies.
+
+        Plain dictionaries in movies are converted to MovieDetails in place.
+
+        Args:
+            movies (Dict[str, MovieDetails]): The movies keyed by title.
+            title_index_path (Optional[str]): Where to persist the trigram title
+                index. If None, the index is only kept in memory.
+        """
+        self.movies = movies
+        self._title_index_path = title_index_path
+        self._title_index: Optional[TrigramIndex] = None
+        self._title_index_dirty = False
+        self._build_indexes()
+
+    def _build_indexes(self) -> None:
+        """Build the rating, year and statistics indexes from the movies."""
+        movies = self.movies
+        for title, movie in movies.items():
+            if not isinstance(movie, MovieDetails):
+                movies[title] = MovieDetails.from_dict(movie)
+        # The records as they were indexed, so they can be unindexed after the
+        # storage has already replaced or removed them.
+        self._indexed: Dict[str, MovieDetails] = dict(movies)
+        # The titles in an indexable array, for O(1) random picks. Deletes swap
+        # the last title into the gap.
+        self._keys: List[str] = list(movies)
+        self._key_positions: Dict[str, int] = {
+            title: position for position, title in enumerate(self._keys)
+        }
+        self._rating_index = SortedIndex(
+            (movie.rating, title) for title, movie in movies.items()
+        )
+        self._year_index = SortedIndex(
+            (movie.year, title) for title, movie in movies.items()
+        )
+        self.statistics = MovieStatistics(
+            lambda: ((movie.rating, title) for title, movie in self._indexed.items())
+        )
+
+    def _index_movie(self, title: str, movie: MovieDetails) -> None:
+        """Add a movie to the rating and year indexes."""
+        self._indexed[title] = movie
+        self._key_positions[title] = len(self._keys)
+        self._keys.append(title)
+        self._rating_index.add(movie.rating, title)
+        self._year_index.add(movie.year, title)
+        self.statistics.add(movie.rating, title)
+        if self._title_index is not None:
+            self._title_index.add(title)
+            self._title_index_dirty = True
+
+    def _unindex_movie(self, title: str) -> None:
+        """Remove a movie from the rating and year indexes, if present."""
+        if title not in self._indexed:
+            return
+        movie = self._indexed.pop(title)
+        position = self._key_positions.pop(title)
+        last = self._keys.pop()
+        if last != title:
+            self._keys[position] = last
+            self._key_positions[last] = position
+        self._rating_index.remove(movie.rating, title)
+        self._year_index.remove(movie.year, title)
+        self.statistics.remove(movie.rating, title)
+        if self._title_index is not None:
+            self._title_index.remove(title)
+            self._title_index_dirty = True
+
+    @property
+    def title_index(self) -> TrigramIndex:
+        """The trigram title index, loaded from disk or built on first use."""
+        if self._title_index is None:
+            self._title_index = self._load_title_index()
+        return self._title_index
+
+    def _load_title_index(self) -> TrigramIndex:
+        """Load the persisted title index, rebuilding it if missing or stale.
+
+        Returns:
+            TrigramIndex: A title index matching the current movies.
+        """
+        path = self._title_index_path
+        if path and os.path.exists(path):
+            try:
+                index = TrigramIndex.load(path)
+                if index.titles == self.movies.keys():
+                    return index
+                logger.debug("Trigram index '%s' is stale, rebuilding.", path)
+            except (OSError, ValueError) as e:
+                logger.warning("Could not load trigram index '%s': %s", path, e)
+        self._title_index_dirty = path is not None
+        return TrigramIndex(self.movies)
+
+    def count_movies(self) -> int:
+        """Return the number of movies.
+
+        Returns:
+            int: The number of movies.
+        """
+        return len(self.movies)
+
+    def iter_movies(self) -> Iterator[MovieDetails]:
+        """Stream the movies held in memory, in storage order.
+
+        Returns:
+            Iterator[MovieDetails]: The movies.
+        """
+        return iter(self.movies.values())
+
+    def save_title_index(self) -> None:
+        """Persist the title index next to the storage file if it has changed."""
+        if self._title_index_path and self._title_index_dirty:
+            self._title_index.save(self._title_index_path)
+            self._title_index_dirty = False
+
+    def movie_added(self, movie: MovieDetails) -> None:
+        """Storage listener: keep the indexes in sync with an added movie.
+
+        Args:
+            movie (MovieDetails): The movie that was added.
+        """
+        title = movie.title
+        self._unindex_movie(title)
+        self.movies[title] = movie
+        self._index_movie(title, movie)
+
+    def movie_deleted(self, movie: MovieDetails) -> None:
+        """Storage listener: keep the indexes in sync with a deleted movie.
+
+        Args:
+            movie (MovieDetails): The movie that was deleted.
+        """
+        title = movie.title
+        self._unindex_movie(title)
+        self.movies.pop(title, None)
+
+    def movie_updated(self, movie: MovieDetails) -> None:
+        """Storage listener: keep the indexes in sync with an updated movie.
+
+        Args:
+            movie (MovieDetails): The movie that was updated.
+        """
+        title = movie.title
+        indexed = self._indexed.get(title)
+        if indexed is not None and (indexed.rating, indexed.year) == (
+            movie.rating,
+            movie.year,
+        ):
+            self._indexed[title] = self.movies[title] = movie
+        else:
+            self.movie_added(movie)
+
+    def movies_reloaded(self, movies: Dict[str, MovieDetails]) -> None:
+        """Storage listener: rebuild all indexes after the file changed on disk.
+
+        Args:
+            movies (Dict[str, MovieDetails]): All movies after the reload.
+        """
         self.movies = movies
+        self._build_indexes()
+        if self._title_index is not None:
+            self._title_index = TrigramIndex(movies)
+            self._title_index_dirty = True
 
     def filter_movies_by_rating_and_year(
         self, min_rating=0.0, start_year=None, end_year=None
-    ) -> List[Dict[str, MovieData]]:
+    ) -> List[MovieDetails]:
         """Filter movies by rating and optionally by year.
 
         Args:
@@ -37,63 +248,162 @@ class MovieUtils:
             end_year (int): The end year to filter by.
 
         Returns:
-            List[Dict[str, MovieData]]: A list of filtered movies.
-        """
-        filtered_movies = [
-            movie
-            for movie in self.movies.values()
-            if float(movie.get("Rating", 0)) >= min_rating
-            and (start_year is None or int(movie.get("Year")) >= start_year)
-            and (end_year is None or int(movie.get("Year")) <= end_year)
-        ]
+            List[MovieDetails]: A list of filtered movies.
+        """
+        rating_bounds = self._rating_index.bounds(min_rating)
+        year_bounds = self._year_index.bounds(start_year, end_year)
+        if rating_bounds[1] - rating_bounds[0] <= year_bounds[1] - year_bounds[0]:
+            titles = self._rating_index.titles(*rating_bounds)
+        else:
+            titles = self._year_index.titles(*year_bounds)
+        filtered_movies = []
+        for title in titles:
+            movie = self._indexed[title]
+            if (
+                movie.rating >= min_rating
+                and (start_year is None or movie.year >= start_year)
+                and (end_year is None or movie.year <= end_year)
+            ):
+                filtered_movies.append(movie)
         return filtered_movies
 
-    def random_movie(self) -> Dict[str, MovieData]:
+    def random_movie(self) -> MovieDetails:
         """Return a random movie from the list.
 
         Returns:
-            Dict[str, MovieData]: A dictionary containing movie information.
+            MovieDetails: The randomly chosen movie.
         """
-        if not self.movies:
+        if not self._keys:
             return None
-        random_movie = random.choice(list(self.movies.values()))
-        return random_movie
+        return self._indexed[self._keys[random.randrange(len(self._keys))]]
+
+    def random_movies(
+        self,
+        k: int,
+        min_rating: float = 0.0,
+        year_range: Optional[Tuple[Optional[int], Optional[int]]] = None,
+    ) -> List[MovieDetails]:
+        """Return up to k distinct random movies matching a rating and year filter.
 
-    def search_movie(self, title: str) -> List[Dict[str, MovieData]]:
+        The matches are not collected first: positions are drawn lazily from
+        the smaller of the rating and year index ranges, and candidates outside
+        the other bound are skipped.
+
+        Args:
+            k (int): The number of movies to return.
+            min_rating (float): The minimum rating.
+            year_range (Optional[Tuple[Optional[int], Optional[int]]]): The first
+                and last year (inclusive), either of which may be None.
+
+        Returns:
+            List[MovieDetails]: The movies, fewer than k if fewer match.
+        """
+        start_year, end_year = year_range or (None, None)
+        title_at: Callable[[int], str]
+        if not min_rating and start_year is None and end_year is None:
+            title_at, bounds = self._keys.__getitem__, (0, len(self._keys))
+        else:
+            rating_bounds = self._rating_index.bounds(min_rating)
+            year_bounds = self._year_index.bounds(start_year, end_year)
+            if rating_bounds[1] - rating_bounds[0] <= year_bounds[1] - year_bounds[0]:
+                title_at, bounds = self._rating_index.title_at, rating_bounds
+            else:
+                title_at, bounds = self._year_index.title_at, year_bounds
+        sample: List[MovieDetails] = []
+        if k <= 0:
+            return sample
+        for position in lazy_shuffle(*bounds):
+            movie = self._indexed[title_at(position)]
+            if (
+                movie.rating >= min_rating
+                and (start_year is None or movie.year >= start_year)
+                and (end_year is None or movie.year <= end_year)
+            ):
+                sample.append(movie)
+                if len(sample) == k:
+                    break
+        return sample
+
+    def iter_sorted(
+        self,
+        key: str = "rating",
+        order: str = "desc",
+        page_size: int = 20,
+        after: Optional[SortCursor] = None,
+    ) -> Iterator[List[MovieDetails]]:
+        """Page through the movies sorted by rating or year.
+
+        Each page is cut from the sorted index in O(log n + page_size), so the
+        first page takes the same time whatever the size of the catalog. Pages
+        are located by cursor rather than by offset, so movies added or deleted
+        between two pages do not shift the listing.
+
+        Args:
+            key (str): "rating" or "year".
+            order (str): "desc" (as sort_by_rating/sort_by_year) or "asc".
+            page_size (int): The number of movies per page.
+            after (Optional[SortCursor]): Resume after this cursor, as returned
+                by sort_cursor for the last movie of a page.
+
+        Raises:
+            ValueError: If key or order is not supported.
+
+        Yields:
+            List[MovieDetails]: The pages, each holding up to page_size movies.
+        """
+        index = self._sorted_index(key)
+        if order not in ("asc", "desc"):
+            raise ValueError(f"Unsupported sort order: {order}")
+        while True:
+            entries = index.page(page_size, after, descending=order == "desc")
+            if not entries:
+                return
+            after = entries[-1]
+            yield [self._indexed[title] for _, title in entries]
+
+    def _sorted_index(self, key: str) -> SortedIndex:
+        """Return the sorted index of a sort key."""
+        if key == "rating":
+            return self._rating_index
+        if key == "year":
+            return self._year_index
+        raise ValueError(f"Unsupported sort key: {key}")
+
+    def search_movie(self, title: str) -> List[MovieDetails]:
         """Search for a movie by title.
 
         Args:
             title (str): The title of the movie to search for.
 
         Returns:
-            List[Dict[str, MovieData]]: A list of movies matching the search title.
+            List[MovieDetails]: A list of movies matching the search title.
         """
+        candidates = self.title_index.candidates(title)
+        candidates = self.movies.keys() if candidates is None else sorted(candidates)
         title = title.lower()
         return [
-            movie
-            for movie in self.movies.values()
-            if title in movie.get("Title", "").lower()
+            self.movies[candidate]
+            for candidate in candidates
+            if title in self.movies[candidate].title.lower()
         ]
 
-    def sort_by_rating(self) -> List[Dict[str, MovieData]]:
+    def sort_by_rating(self) -> List[MovieDetails]:
         """Sort movies by their rating in descending order.
 
         Returns:
-            List[Dict[str, MovieData]]: A list of movies sorted by rating.
+            List[MovieDetails]: A list of movies sorted by rating.
         """
-        return sorted(
-            self.movies.values(), key=lambda x: float(x.get("Rating", 0)), reverse=True
-        )
+        titles = self._rating_index.titles(0, len(self._rating_index))
+        return [self._indexed[title] for title in reversed(titles)]
 
-    def sort_by_year(self) -> List[Dict[str, MovieData]]:
+    def sort_by_year(self) -> List[MovieDetails]:
         """Sort movies by their release year in descending order.
 
         Returns:
-            List[Dict[str, MovieData]]: A list of movies sorted by release year.
+            List[MovieDetails]: A list of movies sorted by release year.
         """
-        return sorted(
-            self.movies.values(), key=lambda x: int(x.get("Year", 0)), reverse=True
-        )
+        titles = self._year_index.titles(0, len(self._year_index))
+        return [self._indexed[title] for title in reversed(titles)]
 
     def calculate_average_rating(self) -> float:
         """Calculate the average rating of the movies.
@@ -101,40 +411,29 @@ class MovieUtils:
         Returns:
             float: The average rating of the movies.
         """
-        if not self.movies:
-            return 0.0
-        total_rating = sum(
-            float(movie.get("Rating", 0)) for movie in self.movies.values()
-        )
-        return total_rating / len(self.movies)
+        return self.statistics.average_rating
 
-    def find_best_movies(self, top_n=10) -> List[Dict[str, MovieData]]:
+    def find_best_movies(self, top_n=10) -> List[MovieDetails]:
         """Find the top N best-rated movies.
 
         Args:
             top_n (int): The number of top movies to find.
 
         Returns:
-            List[Dict[str, MovieData]]: A list of the top N best-rated movies.
+            List[MovieDetails]: A list of the top N best-rated movies.
         """
-        sorted_movies = sorted(
-            self.movies.values(), key=lambda x: float(x.get("Rating", 0)), reverse=True
-        )
-        return sorted_movies[:top_n]
+        return [self.movies[title] for _, title in self.statistics.best(top_n)]
 
-    def find_worst_movies(self, top_n=10) -> List[Dict[str, MovieData]]:
+    def find_worst_movies(self, top_n=10) -> List[MovieDetails]:
         """Find the top N worst-rated movies.
 
         Args:
             top_n (int): The number of worst movies to find.
 
         Returns:
-            List[Dict[str, MovieData]]: A list of the top N worst-rated movies.
+            List[MovieDetails]: A list of the top N worst-rated movies.
         """
-        sorted_movies = sorted(
-            self.movies.values(), key=lambda x: float(x.get("Rating", 0))
-        )
-        return sorted_movies[:top_n]
+        return [self.movies[title] for _, title in self.statistics.worst(top_n)]
 
     def get_movies_statistics(self) -> Dict[str, MovieData]:
         """Compute and return statistics about the movies.
@@ -142,14 +441,16 @@ class MovieUtils:
         Returns:
             Dict[str, MovieData]: A dictionary containing statistics about the movies.
         """
-        num_movies = len(self.movies)
-        average_rating = self.calculate_average_rating()
+        num_movies = self.statistics.count
+        average_rating = self.statistics.average_rating
         best_movies = self.find_best_movies(top_n=5)
         worst_movies = self.find_worst_movies(top_n=5)
 
         return {
             "total_movies": num_movies,
             "average_rating": average_rating,
+            "max_rating": self.statistics.max_rating,
+            "min_rating": self.statistics.min_rating,
             "best_movies": best_movies,
             "worst_movies": worst_movies,
         }
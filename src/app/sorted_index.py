@@ -0,0 +1,110 @@
+"""Module containing a sorted secondary index used for range queries on movies."""
+
+from bisect import bisect_left, bisect_right, insort
+from operator import itemgetter
+from typing import Iterable, List, Optional, Tuple
+
+
+class SortedIndex:
+    """A sorted list of (value, title) pairs supporting bisect-based range lookups."""
+
+    def __init__(self, entries: Iterable[Tuple[float, str]] = ()) -> None:
+        """Initialize the index from an iterable of (value, title) pairs.
+
+        Args:
+            entries (Iterable[Tuple[float, str]]): The initial index entries.
+        """
+        self._entries: List[Tuple[float, str]] = list(entries)
+        # Two stable sorts on single keys give the (value, title) order several
+        # times faster than comparing the tuples.
+        self._entries.sort(key=itemgetter(1))
+        self._entries.sort(key=itemgetter(0))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, value: float, title: str) -> None:
+        """Insert a movie into the index.
+
+        Args:
+            value (float): The indexed value of the movie.
+            title (str): The title of the movie.
+        """
+        insort(self._entries, (value, title))
+
+    def remove(self, value: float, title: str) -> None:
+        """Remove a movie from the index.
+
+        Args:
+            value (float): The indexed value of the movie.
+            title (str): The title of the movie.
+
+        Raises:
+            KeyError: If the movie is not in the index.
+        """
+        position = bisect_left(self._entries, (value, title))
+        if position == len(self._entries) or self._entries[position] != (value, title):
+            raise KeyError(title)
+        del self._entries[position]
+
+    def bounds(self, low: Optional[float] = None, high: Optional[float] = None) -> Tuple[int, int]:
+        """Return the slice of the index holding values between low and high (inclusive).
+
+        Args:
+            low (Optional[float]): The lower bound, or None for no lower bound.
+            high (Optional[float]): The upper bound, or None for no upper bound.
+
+        Returns:
+            Tuple[int, int]: The start and end positions of the matching entries.
+        """
+        value = itemgetter(0)
+        start = 0 if low is None else bisect_left(self._entries, low, key=value)
+        end = (
+            len(self._entries)
+            if high is None
+            else bisect_right(self._entries, high, key=value)
+        )
+        return start, max(start, end)
+
+    def title_at(self, position: int) -> str:
+        """Return the title stored at a position of the index.
+
+        Args:
+            position (int): The position.
+
+        Returns:
+            str: The title.
+        """
+        return self._entries[position][1]
+
+    def page(
+        self, size: int, after: Optional[Tuple[float, str]] = None, descending: bool = False
+    ) -> List[Tuple[float, str]]:
+        """Return the entries following a cursor, in ascending or descending order.
+
+        Args:
+            size (int): The maximum number of entries.
+            after (Optional[Tuple[float, str]]): The (value, title) entry the
+                previous page ended with, or None to start at the beginning.
+            descending (bool): Walk the index from the highest value down.
+
+        Returns:
+            List[Tuple[float, str]]: The entries of the page.
+        """
+        if descending:
+            end = len(self._entries) if after is None else bisect_left(self._entries, after)
+            return self._entries[max(0, end - size) : end][::-1]
+        start = 0 if after is None else bisect_right(self._entries, after)
+        return self._entries[start : start + size]
+
+    def titles(self, start: int, end: int) -> List[str]:
+        """Return the titles stored between two positions of the index.
+
+        Args:
+            start (int): The start position.
+            end (int): The end position (exclusive).
+
+        Returns:
+            List[str]: The titles in index order.
+        """
+        return [title for _, title in self._entries[start:end]]
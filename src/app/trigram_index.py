@@ -0,0 +1,138 @@
+"""Module containing a trigram inverted index used to speed up title searches."""
+
+import json
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class TrigramIndex:
+    """An inverted index mapping lowercase title trigrams to the titles containing them."""
+
+    def __init__(self, titles: Iterable[str] = ()) -> None:
+        """Initialize the index with a collection of titles.
+
+        Args:
+            titles (Iterable[str]): The titles to index.
+        """
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._titles: Set[str] = set()
+        for title in titles:
+            self.add(title)
+
+    @staticmethod
+    def trigrams(text: str) -> Set[str]:
+        """Return the set of trigrams of a lowercased text.
+
+        Args:
+            text (str): The text to split into trigrams.
+
+        Returns:
+            Set[str]: The trigrams of the text.
+        """
+        text = text.lower()
+        return {text[i : i + 3] for i in range(len(text) - 2)}
+
+    @property
+    def titles(self) -> Set[str]:
+        """The set of indexed titles."""
+        return self._titles
+
+    def add(self, title: str) -> None:
+        """Add a title to the index.
+
+        Args:
+            title (str): The title to add.
+        """
+        self._titles.add(title)
+        for gram in self.trigrams(title):
+            self._postings[gram].add(title)
+
+    def remove(self, title: str) -> None:
+        """Remove a title from the index, if present.
+
+        Args:
+            title (str): The title to remove.
+        """
+        if title not in self._titles:
+            return
+        self._titles.discard(title)
+        for gram in self.trigrams(title):
+            postings = self._postings.get(gram)
+            if postings is not None:
+                postings.discard(title)
+                if not postings:
+                    del self._postings[gram]
+
+    def candidates(self, query: str) -> Optional[Set[str]]:
+        """Return the titles that contain every trigram of the query.
+
+        The result is a superset of the titles containing the query, so callers
+        still have to check each candidate.
+
+        Args:
+            query (str): The search query.
+
+        Returns:
+            Optional[Set[str]]: The candidate titles, or None if the query is too
+                short to be narrowed down by trigrams.
+        """
+        grams = self.trigrams(query)
+        if not grams:
+            return None
+        postings: List[Set[str]] = sorted(
+            (self._postings.get(gram, set()) for gram in grams), key=len
+        )
+        result = set(postings[0])
+        for other in postings[1:]:
+            if not result:
+                break
+            result &= other
+        return result
+
+    def save(self, path: str) -> None:
+        """Save the index to a JSON file.
+
+        Args:
+            path (str): The path of the index file.
+        """
+        titles = sorted(self._titles)
+        ids = {title: number for number, title in enumerate(titles)}
+        data = {
+            "titles": titles,
+            "postings": {
+                gram: sorted(ids[title] for title in postings)
+                for gram, postings in self._postings.items()
+            },
+        }
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(data, file, separators=(",", ":"))
+        logger.debug("Trigram index saved to '%s'.", path)
+
+    @classmethod
+    def load(cls, path: str) -> "TrigramIndex":
+        """Load an index previously written with save.
+
+        Args:
+            path (str): The path of the index file.
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If the file is not a valid index.
+
+        Returns:
+            TrigramIndex: The loaded index.
+        """
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        try:
+            titles = data["titles"]
+            index = cls()
+            index._titles = set(titles)
+            for gram, ids in data["postings"].items():
+                index._postings[gram] = {titles[number] for number in ids}
+        except (KeyError, IndexError, TypeError) as e:
+            raise ValueError(f"Invalid trigram index file '{path}': {e}") from e
+        return index
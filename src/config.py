@@ -9,3 +9,29 @@ DATABASE_URL = os.getenv("DATABASE_URL", "data/movies.json")
 SECRET_KEY = os.getenv("SECRET_KEY")
 DEBUG = os.getenv("DEBUG", "False").lower() in ('true', '1', 't')
 TEMPLATE_PATH = os.getenv("TEMPLATE_PATH", "templates")
+PERSIST_TITLE_INDEX = os.getenv("PERSIST_TITLE_INDEX", "False").lower() in ('true', '1', 't')
+COLUMNAR_UTILS = os.getenv("COLUMNAR_UTILS", "False").lower() in ('true', '1', 't')
+STORAGE_JOURNAL = os.getenv("STORAGE_JOURNAL", "False").lower() in ('true', '1', 't')
+JOURNAL_COMPACT_EVERY = int(os.getenv("JOURNAL_COMPACT_EVERY", "100"))
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", "6"))
+STORAGE_SNAPSHOT = os.getenv("STORAGE_SNAPSHOT", "False").lower() in ('true', '1', 't')
+OMDB_API_URL = os.getenv("OMDB_API_URL", "https://www.omdbapi.com/")
+OMDB_CACHE_PATH = os.getenv(
+    "OMDB_CACHE_PATH",
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "omdb_cache.sqlite"
+    ),
+)
+OMDB_CACHE_TTL = float(os.getenv("OMDB_CACHE_TTL", str(7 * 24 * 3600)))
+OMDB_CACHE_SIZE = int(os.getenv("OMDB_CACHE_SIZE", "10000"))
+BULK_IMPORT_WORKERS = int(os.getenv("BULK_IMPORT_WORKERS", "8"))
+BULK_IMPORT_RATE = float(os.getenv("BULK_IMPORT_RATE", "10"))
+BULK_IMPORT_RETRIES = int(os.getenv("BULK_IMPORT_RETRIES", "3"))
+WEBSITE_PAGE_SIZE = int(os.getenv("WEBSITE_PAGE_SIZE", "0"))
+WEBSITE_RENDER_WORKERS = int(os.getenv("WEBSITE_RENDER_WORKERS", "0"))
+WEBSITE_SHARD_SIZE = int(os.getenv("WEBSITE_SHARD_SIZE", "2000"))
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "False").lower() in ('true', '1', 't')
+METRICS_PATH = os.getenv("METRICS_PATH", "data/metrics.prom")
+LIST_PAGE_SIZE = int(os.getenv("LIST_PAGE_SIZE", "20"))
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "16"))
+SHARD_FORMAT = os.getenv("SHARD_FORMAT", "json")
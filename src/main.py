@@ -13,12 +13,23 @@ import csv
 import sys
 import os
 import argparse
+from typing import Optional
 
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from app.movie_app import MovieApp
+from src.config import (
+    COLUMNAR_UTILS,
+    PERSIST_TITLE_INDEX,
+    STORAGE_JOURNAL,
+    STORAGE_SNAPSHOT,
+)
 from src.storage.storage_json import JsonStorage
 from src.storage.storage_csv import CsvStorage
+from src.storage.storage_sharded import ShardedStorage
+from src.storage.storage_sqlite import SqliteStorage
+from src.storage.file_utils import atomic_write, split_compression
+from src.storage.omdb import OmdbClient, create_client
 
 
 def create_empty_file(file_path: str):
@@ -28,22 +39,34 @@ def create_empty_file(file_path: str):
     Args:
         file_path (str):  The path to the file to create.
     """
-    _, ext = os.path.splitext(file_path)
+    _, ext = os.path.splitext(split_compression(file_path)[0])
     if ext.lower() == ".json":
-        with open(file_path, "w", encoding="utf-8") as f:
+        with atomic_write(file_path) as f:
             f.write("{}")  # Write an empty JSON object
     elif ext.lower() == ".csv":
-        with open(file_path, "w", newline="", encoding="utf-8") as f:
+        with atomic_write(file_path, newline="") as f:
             writer = csv.writer(f)
             writer.writerow(["Title", "Year", "Rating", "Poster", "Notes", "ImdbID"])
 
 
-def get_storage(file_path: str):
+def get_storage(
+    file_path: str,
+    journal: bool = False,
+    snapshot: bool = False,
+    omdb_client: Optional[OmdbClient] = None,
+):
     """
     Get the storage object based on the file extension.
 
+    JSON and CSV files may be compressed with gzip (.json.gz, .csv.gz) or
+    lzma (.json.xz, .csv.xz). A directory, or a path ending with a path
+    separator, selects sharded storage.
+
     Args:
         file_path (str): The path to the storage file.
+        journal (bool): Journal mutations instead of rewriting the file on each change.
+        snapshot (bool): Keep a binary snapshot of JSON/CSV files to load instead of parsing them.
+        omdb_client (Optional[OmdbClient]): The client movies are looked up with.
 
     Raises:
         ValueError: If the file extension is not supported.
@@ -51,11 +74,24 @@ def get_storage(file_path: str):
     Returns:
         _type_:  The storage object.
     """
-    _, ext = os.path.splitext(file_path)
+    if file_path.endswith(os.sep) or os.path.isdir(file_path):
+        return ShardedStorage(
+            file_path, journal=journal, snapshot=snapshot, omdb_client=omdb_client
+        )
+    uncompressed, compression = split_compression(file_path)
+    _, ext = os.path.splitext(uncompressed)
+    if compression and ext.lower() not in (".json", ".csv"):
+        raise ValueError(f"Unsupported file extension: {ext}{compression}")
     if ext.lower() == ".json":
-        return JsonStorage(file_path)
+        return JsonStorage(
+            file_path, journal=journal, snapshot=snapshot, omdb_client=omdb_client
+        )
     if ext.lower() == ".csv":
-        return CsvStorage(file_path)
+        return CsvStorage(
+            file_path, journal=journal, snapshot=snapshot, omdb_client=omdb_client
+        )
+    if ext.lower() in (".db", ".sqlite"):
+        return SqliteStorage(file_path, omdb_client=omdb_client)
     raise ValueError(f"Unsupported file extension: {ext}")
 
 
@@ -64,21 +100,57 @@ def main() -> None:
     Main function to run the movie database application.
     """
     parser = argparse.ArgumentParser(description="Movie Database Application")
-    parser.add_argument("storage_file", type=str, help="The storage file (json or csv)")
+    parser.add_argument(
+        "storage_file",
+        type=str,
+        help=(
+            "The storage file (json, csv, optionally .gz or .xz compressed, db or "
+            "sqlite), or a directory for sharded storage"
+        ),
+    )
+    parser.add_argument(
+        "catalogs",
+        type=str,
+        nargs="*",
+        help=(
+            "Further storage files to list and query together with storage_file; "
+            "movies are only added to, deleted from and updated in storage_file"
+        ),
+    )
 
     args = parser.parse_args()
     storage_file = args.storage_file
 
     data_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
     storage_file_path = os.path.join(data_dir, storage_file)
+    catalog_paths = [os.path.join(data_dir, catalog) for catalog in args.catalogs]
 
-    if not os.path.exists(storage_file_path):
+    sharded = storage_file_path.endswith(os.sep) or os.path.isdir(storage_file_path)
+    if not sharded and not os.path.exists(storage_file_path):
         print(f"File '{storage_file_path}' does not exist. Creating a new one...")
         create_empty_file(storage_file_path)
 
     try:
-        storage = get_storage(storage_file_path)
-        app = MovieApp(storage)
+        omdb_client = create_client()
+        storage, *catalogs = [
+            get_storage(
+                path,
+                journal=STORAGE_JOURNAL,
+                snapshot=STORAGE_SNAPSHOT,
+                omdb_client=omdb_client,
+            )
+            for path in [storage_file_path, *catalog_paths]
+        ]
+        title_index_path = (
+            f"{storage_file_path}.trigrams.json" if PERSIST_TITLE_INDEX else None
+        )
+        app = MovieApp(
+            storage,
+            title_index_path,
+            columnar=COLUMNAR_UTILS,
+            catalogs=catalogs,
+            omdb_client=omdb_client,
+        )
         app.run()
     except (ValueError, OSError) as e:
         print(f"Failed to start the application: {e}")
@@ -4,46 +4,383 @@ Module for handling base storage functionality for movie data.
 
 import os
 import logging
-from typing import Dict
-import requests
-from src.storage.i_storage import IStorage
+from contextlib import closing, contextmanager
+from typing import IO, Any, Dict, Iterator, List, Optional, Set, Tuple
+from src.storage.i_storage import IStorage, duplicate_message
+from src.storage.file_utils import atomic_write, file_lock
+from src.storage.journal import Journal, apply_operation
+from src.storage.snapshot import open_snapshot, write_snapshot
+from src.storage.omdb import OmdbClient
+from src.storage.website import WebsiteGenerator
+from src.app.metrics import REGISTRY, MetricsRegistry, timed
 from src.app.movie_utils import MovieData
-from src.config import SECRET_KEY, DEBUG, TEMPLATE_PATH
-from src.app.movie_details import MovieDetails
+from src.config import DEBUG, JOURNAL_COMPACT_EVERY, METRICS_ENABLED
+from src.app.movie_details import MovieDetails, normalize_title
 
 
 logging.basicConfig(level=logging.DEBUG if DEBUG else logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _discard_title(index: Dict[str, Set[str]], key: str, title: str) -> None:
+    """
+    Remove a title from a lookup index, dropping the key once no title is left.
+    """
+    titles = index.get(key)
+    if titles is not None:
+        titles.discard(title)
+        if not titles:
+            del index[key]
+
+
+def _record_load(registry: MetricsRegistry, args: tuple, movies: Dict[str, MovieDetails]) -> None:
+    """Record the bytes and records read by a load from disk."""
+    signature = args[1]
+    registry.inc("storage_bytes_read_total", sum(entry[1] for entry in signature if entry))
+    registry.inc("storage_records_read_total", len(movies))
+
+
+def _record_save(registry: MetricsRegistry, args: tuple, _: None) -> None:
+    """Record the bytes and records written by a save."""
+    storage = args[0]
+    registry.inc("storage_bytes_written_total", os.path.getsize(storage.file_path))
+    registry.inc("storage_records_written_total", len(storage.movies))
+
+
 class BaseStorage(IStorage):
     """
     Base class for handling storage of movie data.
+
+    Subclasses implement _iter_movies_file and _write_movies for their file format.
+    In journaled mode every mutation is appended to a journal next to the file
+    instead of rewriting it, and the journal is folded back into the file
+    (compacted) every `compact_every` mutations.
+    With snapshots enabled, a binary copy of the file is kept next to it and
+    read instead of the file for as long as the file is unchanged.
+
+    Several processes can share the file: reads hold a shared lock and writes
+    an exclusive one, and a mutation persisted after another process changed
+    the file is merged into the newer version instead of overwriting it.
     """
 
-    def __init__(self, file_path: str) -> None:
+    # The newline argument used when opening the file for writing.
+    newline: Optional[str] = None
+
+    def __init__(
+        self,
+        file_path: str,
+        journal: bool = False,
+        compact_every: int = JOURNAL_COMPACT_EVERY,
+        snapshot: bool = False,
+        omdb_client: Optional[OmdbClient] = None,
+    ) -> None:
         """
         Initialize the storage object with a file path.
 
         Args:
             file_path (str): The path to the file to load movies from.
+            journal (bool): Append mutations to a journal instead of rewriting the file.
+            compact_every (int): The number of journal entries after which the
+                journal is folded back into the file.
+            snapshot (bool): Keep a binary snapshot of the file to load instead of parsing it.
+            omdb_client (Optional[OmdbClient]): The client movies are looked up
+                with; by default an uncached one.
         """
         self.file_path = file_path
-        self.movies = self.load_movies_file()
+        self._listeners: List[Any] = []
+        self._omdb = omdb_client or OmdbClient()
+        self._website = WebsiteGenerator()
+        self._journal = Journal(f"{file_path}.journal") if journal else None
+        self._compact_every = compact_every
+        self._snapshot_path = f"{file_path}.snapshot" if snapshot else None
+        self._snapshot_used = False
+        self.movies: Dict[str, MovieDetails] = {}
+        # Secondary hash indexes: IMDb ID and normalized title -> stored titles.
+        # A key can have several titles, e.g. "The Matrix" and "the matrix"
+        # saved before duplicates were detected.
+        # Both are built on first use, as indexing (and above all normalizing)
+        # every title is a large part of the load time.
+        self._by_imdb_id: Optional[Dict[str, Set[str]]] = None
+        self._by_normalized_title: Optional[Dict[str, Set[str]]] = None
+        self._signature: Optional[tuple] = None
+        # Operations and undo entries collected inside a batch() block.
+        self._pending: Optional[List[Dict[str, Any]]] = None
+        self._undo_log: List[tuple] = []
+        self._lock_held = False
+        self.load_movies_file()
+
+    def subscribe(self, listener: Any) -> None:
+        """
+        Register a listener to be notified about changes to the movies.
+
+        Args:
+            listener (Any): An object implementing movie_added, movie_deleted
+                and movie_updated, each taking the affected movie, and
+                movies_reloaded, taking all movies after an external change.
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, event: str, movie: Any) -> None:
+        """
+        Notify all listeners about a change to the movies.
+
+        Args:
+            event (str): The name of the listener method to call.
+            movie (Any): The affected movie, or all movies for movies_reloaded.
+        """
+        for listener in self._listeners:
+            getattr(listener, event)(movie)
+
+    def file_signature(self) -> tuple:
+        """
+        Return a value that changes whenever the stored movies change on disk.
+
+        Returns:
+            tuple: The (mtime, size, inode) of the file and of the journal, if any.
+        """
+        return self._file_signature()
+
+    def _file_signature(self) -> tuple:
+        """
+        Return the (mtime, size, inode) of the file and of the journal, if any.
+
+        Returns:
+            tuple: A value that changes whenever the files are modified or replaced.
+        """
+        paths = [self.file_path]
+        if self._journal is not None:
+            paths.append(self._journal.file_path)
+        signature = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size, stat.st_ino))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def load_movies_file(self) -> Dict[str, MovieDetails]:
+        """
+        Return the movies, reading the file only if it changed since the last load.
+
+        The same dictionary (self.movies) is returned every time and updated in
+        place on reload, so callers can share it as a live view. Listeners are
+        notified through movies_reloaded when the file was modified externally.
+
+        Returns:
+            Dict[str, MovieDetails]: The movies keyed by title.
+        """
+        signature = self._file_signature()
+        if signature == self._signature:
+            if METRICS_ENABLED:
+                REGISTRY.inc("storage_load_cache_hits_total")
+            return self.movies
+        return self._load(signature)
+
+    @timed("storage_load", record=_record_load)
+    def _load(self, signature: tuple) -> Dict[str, MovieDetails]:
+        """
+        Read the movies from disk into self.movies.
+
+        Args:
+            signature (tuple): The file signature the movies are read at.
 
-    def load_movies_file(self) -> Dict[str, Dict[str, MovieData]]:
+        Returns:
+            Dict[str, MovieDetails]: The movies keyed by title.
+        """
+        reloaded = self._signature is not None
+        with self._locked(shared=True):
+            if reloaded and self._journal is not None:
+                # Another process may have appended to or compacted the journal.
+                self._journal = Journal(self._journal.file_path)
+            movies = {movie.title: movie for movie in self.iter_movies()}
+        self.movies.clear()
+        self.movies.update(movies)
+        self._reset_lookup_indexes()
+        self._signature = signature
+        if (
+            self._snapshot_path is not None
+            and not self._snapshot_used
+            and not self._journal
+        ):
+            self._write_snapshot()
+        if reloaded:
+            logger.info("'%s' changed on disk, movies reloaded.", self.file_path)
+            self._notify("movies_reloaded", self.movies)
+        return self.movies
+
+    @contextmanager
+    def _locked(self, shared: bool = False) -> Iterator[None]:
         """
-        Load movies from a file and return them as a dictionary.
+        Hold the cross-process lock of the file; re-entering while it is held is a no-op.
+
+        Args:
+            shared (bool): Take a shared (read) lock instead of an exclusive one.
+
+        Yields:
+            None
+        """
+        if self._lock_held:
+            yield
+            return
+        with file_lock(self.file_path, shared=shared):
+            self._lock_held = True
+            try:
+                yield
+            finally:
+                self._lock_held = False
+
+    def _merge(self, operations: List[Dict[str, Any]]) -> None:
+        """
+        Re-read the file changed by another process and re-apply our mutations on top.
+
+        Mutations of the other process are kept; where both touched the same
+        movie, ours win. Must be called with the exclusive lock held.
+
+        Args:
+            operations (List[Dict[str, Any]]): The mutations not persisted yet.
+        """
+        if self._journal is not None:
+            self._journal = Journal(self._journal.file_path)
+        movies = {movie.title: movie for movie in self.iter_movies()}
+        for operation in operations:
+            apply_operation(movies, operation)
+        self.movies.clear()
+        self.movies.update(movies)
+        self._reset_lookup_indexes()
+        logger.warning("'%s' was changed by another process, changes merged.", self.file_path)
+        self._notify("movies_reloaded", self.movies)
+
+    def _reset_lookup_indexes(self) -> None:
+        """
+        Drop the IMDb ID and normalized title indexes after the movies were
+        replaced; they are rebuilt when next needed.
+        """
+        self._by_imdb_id = None
+        self._by_normalized_title = None
+
+    def _lookup_indexes(self) -> Tuple[Dict[str, Set[str]], Dict[str, Set[str]]]:
+        """
+        Return the IMDb ID and normalized title indexes, building them if needed.
+        """
+        if self._by_imdb_id is None or self._by_normalized_title is None:
+            self._by_imdb_id, self._by_normalized_title = {}, {}
+            for movie in self.movies.values():
+                self._index_lookup(movie)
+        return self._by_imdb_id, self._by_normalized_title
+
+    def _index_lookup(self, movie: MovieDetails) -> None:
+        """
+        Add a movie to the IMDb ID and normalized title indexes.
+        """
+        if self._by_imdb_id is None or self._by_normalized_title is None:
+            return
+        if movie.imdb_id:
+            self._by_imdb_id.setdefault(movie.imdb_id, set()).add(movie.title)
+        key = normalize_title(movie.title)
+        self._by_normalized_title.setdefault(key, set()).add(movie.title)
+
+    def _unindex_lookup(self, movie: MovieDetails) -> None:
+        """
+        Remove a movie from the IMDb ID and normalized title indexes.
+        """
+        if self._by_imdb_id is None or self._by_normalized_title is None:
+            return
+        _discard_title(self._by_imdb_id, movie.imdb_id, movie.title)
+        _discard_title(self._by_normalized_title, normalize_title(movie.title), movie.title)
+
+    def _find_duplicate(self, movie: MovieDetails) -> Optional[str]:
+        """
+        Return the stored title a movie duplicates, if any.
+
+        Args:
+            movie (MovieDetails): The movie about to be added.
+
+        Returns:
+            Optional[str]: The title of the stored movie with the same title,
+                normalized title or IMDb ID, or None.
+        """
+        if movie.title in self.movies:
+            return movie.title
+        by_imdb_id, by_normalized_title = self._lookup_indexes()
+        titles = by_imdb_id.get(movie.imdb_id) if movie.imdb_id else None
+        if not titles:
+            titles = by_normalized_title.get(normalize_title(movie.title))
+        return min(titles) if titles else None
+
+    def find_by_imdb_id(self, imdb_id: str) -> Optional[MovieDetails]:
+        """
+        Look up a movie by its IMDb ID.
+
+        Args:
+            imdb_id (str): The IMDb ID, e.g. "tt0133093".
+
+        Returns:
+            Optional[MovieDetails]: The movie, or None if it is not stored.
+        """
+        titles = self._lookup_indexes()[0].get(imdb_id)
+        return self.movies.get(min(titles)) if titles else None
+
+    def refresh(self) -> None:
+        """
+        Reload the movies if the file was modified by another process.
+        """
+        self.load_movies_file()
+
+    def iter_movies(self) -> Iterator[MovieDetails]:
+        """
+        Stream the movies from the file one at a time, with the journal applied.
+
+        Returns:
+            Iterator[MovieDetails]: The movies in file order.
+        """
+        movies = self._iter_stored_movies()
+        if self._journal is not None:
+            movies = self._journal.apply(movies)
+        return movies
+
+    def _iter_stored_movies(self) -> Iterator[MovieDetails]:
+        """
+        Read the movies from the snapshot if it is current, and from the file otherwise.
+
+        Yields:
+            MovieDetails: The movies in file order.
+        """
+        snapshot = (
+            open_snapshot(self._snapshot_path, self.file_path)
+            if self._snapshot_path is not None
+            else None
+        )
+        self._snapshot_used = snapshot is not None
+        if snapshot is None:
+            yield from self._iter_movies_file()
+            return
+        with closing(snapshot):
+            yield from snapshot
+
+    def _write_snapshot(self) -> None:
+        """
+        Write the binary snapshot of the file; failures only cost startup time.
+        """
+        try:
+            write_snapshot(self._snapshot_path, self.movies.values(), self.file_path)
+            self._snapshot_used = True
+        except (OSError, ValueError) as e:
+            logger.warning("Could not write snapshot '%s': %s", self._snapshot_path, e)
+
+    def _iter_movies_file(self) -> Iterator[MovieDetails]:
+        """
+        Read the movies stored in the file one at a time.
 
         Raises:
             NotImplementedError: Subclasses should implement this method.
 
         Returns:
-            Dict[str, Dict[str, MovieData]]: A dictionary containing movie information.
+            Iterator[MovieDetails]: The movies in file order.
         """
         raise NotImplementedError("Subclasses should implement this method")
 
-    def load_movies_api(self, user_search: str) -> Dict[str, MovieData]:
+    def load_movies_api(self, user_search: str) -> Optional[Dict[str, MovieData]]:
         """
         Load movie data from an API using the user's search query.
 
@@ -54,45 +391,198 @@ class BaseStorage(IStorage):
             requests.RequestException: If there is an error with the request.
 
         Returns:
-            Dict[str, MovieData]: A dictionary containing movie information.
-        """
-        api_url = f"https://www.omdbapi.com/?apikey={SECRET_KEY}&t={user_search}"
-        response = requests.get(api_url, timeout=10)
-        if response.status_code == 200:
-            movie_data = response.json()
-            rating = movie_data["imdbRating"]
-            rating = 0.0 if rating == "N/A" else float(rating)
-            movie_dict = {
-                "Title": movie_data["Title"],
-                "Year": movie_data["Year"],
-                "Rating": rating,
-                "Poster": movie_data["Poster"],
-                "Notes": "",
-                "ImdbID": movie_data["imdbID"],
-            }
-            logger.debug(f"load_movies_api returning: {movie_dict}")
-            return movie_dict
-
-        else:
-            logger.error("Error: %d %s", response.status_code, response.text)
-            raise requests.RequestException(
-                f"Error: {response.status_code} {response.text}"
-            )
+            Optional[Dict[str, MovieData]]: A dictionary containing movie
+                information, or None if the movie was not found.
+        """
+        return self._omdb.fetch_movie(user_search)
 
     def add_movie(self, movie: MovieDetails) -> None:
         """
-        Module for handling base storage functionality for movie data."""
-        raise NotImplementedError("Subclasses should implement this method")
+        Add a new movie to the storage.
 
+        Args:
+            movie (MovieDetails): The movie details to add.
+
+        Raises:
+            ValueError: If the movie already exists.
+            KeyError: If there is an error adding the movie.
+        """
+        duplicate = self._find_duplicate(movie)
+        if duplicate is not None:
+            raise ValueError(duplicate_message(movie, duplicate))
+        self.movies[movie.title] = movie
+        self._index_lookup(movie)
+        self._remember(("add", movie.title))
+        self._notify("movie_added", movie)
+        try:
+            self._persist([{"op": "add", "movie": movie.to_dict()}])
+            logger.info("Movie '%s' successfully added.", movie.title)
+        except Exception as e:
+            logger.error("Error adding the movie '%s': %s", movie.title, e)
+            raise KeyError(f"Error adding the movie '{movie.title}': {e}") from e
+
+    def add_movies(self, movies: List[MovieDetails]) -> List[MovieDetails]:
+        """
+        Add several movies and save the storage once.
+
+        Movies that are already stored (see add_movie), or that occur twice in
+        movies, are skipped.
+
+        Args:
+            movies (List[MovieDetails]): The movies to add.
+
+        Returns:
+            List[MovieDetails]: The movies that were added.
+        """
+        added = []
+        for movie in movies:
+            duplicate = self._find_duplicate(movie)
+            if duplicate is not None:
+                logger.warning("%s Skipped.", duplicate_message(movie, duplicate))
+                continue
+            self.movies[movie.title] = movie
+            self._index_lookup(movie)
+            self._remember(("add", movie.title))
+            self._notify("movie_added", movie)
+            added.append(movie)
+        if added:
+            self._persist([{"op": "add", "movie": movie.to_dict()} for movie in added])
+            logger.info("%d movies successfully added.", len(added))
+        return added
+
+    @timed("storage_save", record=_record_save)
     def save_movies(self) -> None:
         """
-        Save movies to a file.
+        Atomically rewrite the file with all movies and clear the journal.
+
+        This overwrites changes other processes made since the last load; the
+        mutating methods merge those first.
+        """
+        try:
+            with self._locked():
+                with atomic_write(self.file_path, newline=self.newline) as file:
+                    self._write_movies(file)
+                if self._journal is not None:
+                    self._journal.clear()
+                if self._snapshot_path is not None:
+                    self._write_snapshot()
+                self._signature = self._file_signature()
+            logger.info("Movies successfully saved to '%s'.", self.file_path)
+        except Exception as e:
+            logger.error("Error saving movies: %s", e)
+            raise
+
+    def _write_movies(self, file: IO[str]) -> None:
+        """
+        Write all movies to an open file.
+
+        Args:
+            file (IO[str]): The file to write to.
 
         Raises:
             NotImplementedError: Subclasses should implement this method.
         """
         raise NotImplementedError("Subclasses should implement this method")
 
+    def _persist(self, operations: List[Dict[str, Any]]) -> None:
+        """
+        Persist mutations, or hold them back until the end of the current batch.
+
+        Args:
+            operations (List[Dict[str, Any]]): The journal operations describing
+                the mutations.
+        """
+        if self._pending is not None:
+            self._pending.extend(operations)
+            return
+        self.persist_operations(operations)
+
+    def persist_operations(self, operations: List[Dict[str, Any]]) -> bool:
+        """
+        Persist mutations already applied to self.movies, by journaling them or rewriting the file.
+
+        If the file changed since it was loaded, it is re-read and the
+        mutations are merged into it first, under the exclusive lock.
+
+        Args:
+            operations (List[Dict[str, Any]]): The journal operations describing
+                the mutations.
+
+        Returns:
+            bool: Whether the movies were merged with changes of another process.
+        """
+        with self._locked():
+            merged = self._file_signature() != self._signature
+            if merged:
+                self._merge(operations)
+            if self._journal is None:
+                self.save_movies()
+            else:
+                self._journal.append(operations)
+                self._signature = self._file_signature()
+                if len(self._journal) >= self._compact_every:
+                    self.save_movies()
+        return merged
+
+    def invalidate(self) -> None:
+        """
+        Forget that the movies match the file, so that the next load re-reads it.
+        """
+        self._signature = None
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Group mutations so that they are persisted with a single save on exit.
+
+        Each mutation is still checked immediately (e.g. KeyError for an unknown
+        title). If the block raises, or the final save fails, all in-memory
+        changes made inside the block are rolled back. Nested batches join the
+        outermost one.
+
+        Yields:
+            None
+        """
+        if self._pending is not None:
+            yield
+            return
+        self._pending, self._undo_log = [], []
+        try:
+            yield
+            operations, self._pending = self._pending, None
+            if operations:
+                self._persist(operations)
+        except BaseException:
+            self._rollback()
+            raise
+        finally:
+            self._pending, self._undo_log = None, []
+
+    def _remember(self, undo: tuple) -> None:
+        """
+        Record how to undo a mutation if it happens inside a batch.
+
+        Args:
+            undo (tuple): ("add", title), ("delete", movie) or ("update", title, notes).
+        """
+        if self._pending is not None:
+            self._undo_log.append(undo)
+
+    def _rollback(self) -> None:
+        """
+        Undo the in-memory mutations of the current batch, newest first.
+        """
+        for undo in reversed(self._undo_log):
+            if undo[0] == "add":
+                self.movies.pop(undo[1], None)
+            elif undo[0] == "delete":
+                self.movies[undo[1].title] = undo[1]
+            else:
+                self.movies[undo[1]].notes = undo[2]
+        self._reset_lookup_indexes()
+        logger.warning("Batch failed, %d changes rolled back.", len(self._undo_log))
+        self._notify("movies_reloaded", self.movies)
+
     def delete_movie(self, title: str) -> None:
         """
         Delete a movie from the storage.
@@ -104,8 +594,11 @@ class BaseStorage(IStorage):
             KeyError: If the movie doesn't exist.
         """
         if title in self.movies:
-            del self.movies[title]
-            self.save_movies()
+            movie = self.movies.pop(title)
+            self._unindex_lookup(movie)
+            self._remember(("delete", movie))
+            self._notify("movie_deleted", movie)
+            self._persist([{"op": "delete", "title": title}])
             logger.info("Movie '%s' successfully deleted.", title)
         else:
             logger.error("Movie '%s' doesn't exist.", title)
@@ -123,8 +616,10 @@ class BaseStorage(IStorage):
             KeyError: If the movie doesn't exist.
         """
         if title in self.movies:
-            self.movies[title]["Notes"] = notes
-            self.save_movies()
+            self._remember(("update", title, self.movies[title].notes))
+            self.movies[title].notes = notes
+            self._notify("movie_updated", self.movies[title])
+            self._persist([{"op": "update", "title": title, "notes": notes}])
             logger.info("Movie '%s' successfully updated.", title)
         else:
             logger.error("Movie '%s' doesn't exist.", title)
@@ -134,33 +629,4 @@ class BaseStorage(IStorage):
         """
         Generate a static HTML website to display the movies.
         """
-        movies_html = ""
-        for movie in self.movies.values():
-            movies_html += (
-                f'<li class="movie">'
-                f'<a href="https://www.imdb.com/title/{movie["ImdbID"]}" target="_blank">'
-                f'<img src="{movie["Poster"]}" class="movie-poster" alt="{movie["Title"]} Poster"/>'
-                f"</a>"
-                f'<div class="movie-title">{movie["Title"]}</div>'
-                f'<p class="movie-year">{movie["Year"]}</p>'
-                f'<p class="movie-rating">Rating: {movie["Rating"]}</p>'
-                f'<p class="movie-notes">{movie["Notes"]}</p>'
-                f"</li>"
-            )
-        try:
-            template_path = os.path.join(TEMPLATE_PATH, "movies_template.html")
-            with open(template_path, "r", encoding="utf-8") as file:
-                html_content = file.read()
-
-            updated_html_content = html_content.replace(
-                "__TEMPLATE_TITLE__", "My Movie App"
-            ).replace("__TEMPLATE_MOVIE_GRID__", movies_html)
-
-            output_path = os.path.join(TEMPLATE_PATH, "movie_app.html")
-            with open(output_path, "w", encoding="utf-8") as file:
-                file.write(updated_html_content)
-
-            logger.info("Website successfully generated.")
-        except Exception as e:
-            logger.error("Error generating website: %s", e)
-            raise
+        self._website.generate(self.movies.values())
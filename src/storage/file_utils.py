@@ -0,0 +1,259 @@
+"""
+Module with file helpers shared by the storage classes.
+"""
+
+import gzip
+import io
+import json
+import lzma
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Any, Iterator, Optional, Tuple
+from src.config import COMPRESSION_LEVEL
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are still atomic, just not serialized.
+    fcntl = None
+
+# File name suffixes of the compression formats the storages read and write.
+COMPRESSED_SUFFIXES = (".gz", ".xz")
+
+# Read once: os.umask can only be read by setting it, which races with other threads.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def split_compression(file_path: str) -> Tuple[str, Optional[str]]:
+    """
+    Split the compression suffix off a file name.
+
+    Args:
+        file_path (str): E.g. "movies.json.gz".
+
+    Returns:
+        Tuple[str, Optional[str]]: The uncompressed name ("movies.json") and
+            the compression suffix (".gz"), or None if uncompressed.
+    """
+    root, ext = os.path.splitext(file_path)
+    if ext.lower() in COMPRESSED_SUFFIXES:
+        return root, ext.lower()
+    return file_path, None
+
+
+def open_text(
+    file_path: str, newline: Optional[str] = None, encoding: str = "utf-8"
+) -> IO[str]:
+    """
+    Open a text file for reading, decompressing .gz and .xz files on the fly.
+
+    Args:
+        file_path (str): The file to read.
+        newline (Optional[str]): Passed to open(), e.g. "" for CSV files.
+        encoding (str): The text encoding of the file.
+
+    Returns:
+        IO[str]: The file, streaming its decompressed content.
+    """
+    compression = split_compression(file_path)[1]
+    if compression == ".gz":
+        return gzip.open(file_path, "rt", encoding=encoding, newline=newline)
+    if compression == ".xz":
+        return lzma.open(file_path, "rt", encoding=encoding, newline=newline)
+    return open(file_path, "r", encoding=encoding, newline=newline)
+
+
+@contextmanager
+def atomic_write(
+    file_path: str,
+    newline: Optional[str] = None,
+    encoding: str = "utf-8",
+    binary: bool = False,
+    compresslevel: int = COMPRESSION_LEVEL,
+) -> Iterator[IO]:
+    """
+    Open a temporary file next to file_path and move it over file_path on success.
+
+    The target file is either left untouched or fully replaced, so a crash in
+    the middle of a save cannot truncate it. Text written to a .gz or .xz file
+    is compressed while it is written.
+
+    Args:
+        file_path (str): The file to replace.
+        newline (Optional[str]): Passed to open(), e.g. "" for CSV files.
+        encoding (str): The text encoding of the file.
+        binary (bool): Open the file in binary mode; newline, encoding and
+            compression are ignored.
+        compresslevel (int): The gzip level or lzma preset (0-9) of compressed files.
+
+    Yields:
+        IO: The temporary file to write to.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(file_path)}.", suffix=".tmp", dir=directory
+    )
+    compression = None if binary else split_compression(file_path)[1]
+    try:
+        if binary or compression:
+            file = open(fd, "wb")
+        else:
+            file = open(fd, "w", encoding=encoding, newline=newline)
+        with file:
+            if compression is None:
+                yield file
+            else:
+                if compression == ".gz":
+                    # mtime=0 keeps the output identical for identical movies.
+                    compressed = gzip.GzipFile(
+                        fileobj=file, mode="wb", compresslevel=compresslevel, mtime=0
+                    )
+                else:
+                    compressed = lzma.LZMAFile(file, "wb", preset=compresslevel)
+                with io.TextIOWrapper(compressed, encoding=encoding, newline=newline) as text:
+                    yield text
+            file.flush()
+            os.fsync(file.fileno())
+        # mkstemp creates the file as 0600; keep the mode of the file it replaces.
+        os.chmod(temp_path, _file_mode(file_path))
+        os.replace(temp_path, file_path)
+        _fsync_directory(directory)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _file_mode(file_path: str) -> int:
+    """
+    Return the permission bits of file_path, or those open() gives a new file.
+    """
+    try:
+        return stat.S_IMODE(os.stat(file_path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def _fsync_directory(directory: str) -> None:
+    """
+    Flush a directory entry change (a rename) to disk; not supported on Windows.
+    """
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def lock_path(file_path: str) -> str:
+    """
+    Return the path of the lock file guarding file_path: a hidden "<name>.lock" next to it.
+    """
+    directory, name = os.path.split(file_path)
+    return os.path.join(directory, f".{name}.lock")
+
+
+@contextmanager
+def file_lock(file_path: str, shared: bool = False) -> Iterator[None]:
+    """
+    Hold an advisory lock on file_path across processes.
+
+    The lock is taken on a separate lock file, because atomic_write replaces
+    file_path (and its inode) on every save. Shared locks never block each
+    other; an exclusive lock waits until no other process holds any lock.
+    Without fcntl (Windows) no lock is taken.
+
+    Args:
+        file_path (str): The file to lock.
+        shared (bool): Take a shared (read) lock instead of an exclusive (write) lock.
+
+    Yields:
+        None
+    """
+    if fcntl is None:
+        yield
+        return
+    fd = os.open(lock_path(file_path), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        yield
+    finally:
+        # Closing the descriptor releases the lock.
+        os.close(fd)
+
+
+def iter_json_object(file: IO[str], chunk_size: int = 1 << 16) -> Iterator[Tuple[str, Any]]:
+    """
+    Incrementally parse a top-level JSON object and yield its items.
+
+    Only one chunk plus the item being decoded is held in memory, so large
+    files can be read in bounded memory.
+
+    Args:
+        file (IO[str]): The file to read, positioned at the start of the object.
+        chunk_size (int): The number of characters to read at a time.
+
+    Raises:
+        json.JSONDecodeError: If the file is not a JSON object.
+
+    Yields:
+        Tuple[str, Any]: The key and decoded value of each item.
+    """
+    decoder = json.JSONDecoder()
+    buffer, position, eof = "", 0, False
+
+    def fill() -> bool:
+        nonlocal buffer, position, eof
+        chunk = file.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+        return not eof
+
+    def skip_whitespace() -> None:
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position < len(buffer) or not fill():
+                return
+
+    def expect(characters: str) -> str:
+        skip_whitespace()
+        if position >= len(buffer) or buffer[position] not in characters:
+            raise json.JSONDecodeError(f"Expected one of {characters!r}", buffer, position)
+        return buffer[position]
+
+    def decode() -> Any:
+        nonlocal position
+        skip_whitespace()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+                if end < len(buffer) or eof:
+                    position = end
+                    return value
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            fill()
+
+    expect("{")
+    position += 1
+    if expect('}"') == "}":
+        return
+    while True:
+        key = decode()
+        expect(":")
+        position += 1
+        yield key, decode()
+        if expect(",}") == "}":
+            return
+        position += 1
@@ -3,9 +3,24 @@ Interface for storage classes handling movie data.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import ContextManager, Dict, Iterator, List, Optional
 from src.app.movie_details import MovieDetails
-from src.app.movie_utils import MovieData
+
+
+def duplicate_message(movie: MovieDetails, duplicate: str) -> str:
+    """
+    Describe why a movie is rejected as a duplicate of a stored one.
+
+    Args:
+        movie (MovieDetails): The movie being added.
+        duplicate (str): The title of the stored movie it duplicates.
+
+    Returns:
+        str: The message.
+    """
+    if duplicate == movie.title:
+        return f"Movie '{movie.title}' already exists."
+    return f"Movie '{movie.title}' already exists as '{duplicate}'."
 
 
 class IStorage(ABC):
@@ -14,12 +29,12 @@ class IStorage(ABC):
     """
 
     @abstractmethod
-    def load_movies_file(self) -> Dict[str, Dict[str, MovieData]]:
+    def load_movies_file(self) -> Dict[str, MovieDetails]:
         """
         Load movies from the storage.
 
         Returns:
-            Dict[str, Dict[str, MovieData]]: A dictionary of movies.
+            Dict[str, MovieDetails]: A dictionary of movies.
 
         Raises:
             IOError: If there was an error loading the movies from the storage.
@@ -27,6 +42,36 @@ class IStorage(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def refresh(self) -> None:
+        """
+        Pick up changes made to the storage by other processes.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_movies(self) -> Iterator[MovieDetails]:
+        """
+        Stream the movies from the storage one at a time, in bounded memory.
+
+        Returns:
+            Iterator[MovieDetails]: The stored movies.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def find_by_imdb_id(self, imdb_id: str) -> Optional[MovieDetails]:
+        """
+        Look up a movie by its IMDb ID.
+
+        Args:
+            imdb_id (str): The IMDb ID, e.g. "tt0133093".
+
+        Returns:
+            Optional[MovieDetails]: The movie, or None if it is not stored.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def add_movie(self, movie: MovieDetails) -> None:
         """
@@ -36,11 +81,25 @@ class IStorage(ABC):
             movie (MovieDetails): The movie details to add.
 
         Raises:
-            ValueError: If the movie already exists in the storage.
+            ValueError: If the movie already exists in the storage, under the
+                same title, the same normalized title or the same IMDb ID.
             KeyError: If there was an error adding the movie to the storage.
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def add_movies(self, movies: List[MovieDetails]) -> List[MovieDetails]:
+        """
+        Add several movies at once, skipping titles that are already stored.
+
+        Args:
+            movies (List[MovieDetails]): The movies to add.
+
+        Returns:
+            List[MovieDetails]: The movies that were added.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def delete_movie(self, title: str) -> None:
         """
@@ -68,6 +127,29 @@ class IStorage(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def subscribe(self, listener) -> None:
+        """
+        Register a listener to be notified when movies are added, deleted or updated.
+
+        Args:
+            listener: An object implementing movie_added, movie_deleted and movie_updated.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def batch(self) -> ContextManager[None]:
+        """
+        Group mutations into one transaction that is saved once on exit.
+
+        Usage: with storage.batch(): ...
+
+        Returns:
+            ContextManager[None]: A context manager that commits on success and
+                rolls the changes back if the block raises.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def generate_website(self) -> None:
         """
@@ -0,0 +1,139 @@
+"""
+Module for the append-only mutation journal used by journaled storages.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from src.app.movie_details import MovieDetails
+
+logger = logging.getLogger(__name__)
+
+
+def apply_operation(movies: Dict[str, MovieDetails], operation: Dict[str, Any]) -> None:
+    """
+    Apply one journal operation to movies keyed by title, in place.
+
+    Deleting or updating a movie that is not there is a no-op, so operations
+    can be re-applied on top of a newer version of the file.
+
+    Args:
+        movies (Dict[str, MovieDetails]): The movies to change.
+        operation (Dict[str, Any]): The operation.
+    """
+    if operation["op"] == "add":
+        movie = MovieDetails.from_dict(operation["movie"])
+        movies[movie.title] = movie
+    elif operation["op"] == "delete":
+        movies.pop(operation["title"], None)
+    elif operation["title"] in movies:
+        movies[operation["title"]].notes = operation["notes"]
+
+
+class Journal:
+    """
+    Append-only log of movie mutations stored next to the storage file.
+
+    Each line is one JSON operation: {"op": "add", "movie": {...}},
+    {"op": "delete", "title": ...} or {"op": "update", "title": ..., "notes": ...}.
+    Applying the journal is idempotent, so a crash between compaction and
+    truncating the journal is harmless.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        """
+        Initialize the journal.
+
+        Args:
+            file_path (str): The path of the journal file.
+        """
+        self.file_path = file_path
+        self._entries = sum(1 for _ in self._read())
+
+    def __len__(self) -> int:
+        return self._entries
+
+    def append(self, operations: List[Dict[str, Any]]) -> None:
+        """
+        Durably append operations to the journal.
+
+        Args:
+            operations (List[Dict[str, Any]]): The operations to append.
+        """
+        if not operations:
+            return
+        lines = "".join(
+            json.dumps(operation, separators=(",", ":")) + "\n" for operation in operations
+        )
+        with open(self.file_path, "ab+") as file:
+            # A crash may have left a torn last line; start a new line so the
+            # operations are not joined onto it and skipped with it.
+            if file.seek(0, os.SEEK_END):
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b"\n":
+                    lines = "\n" + lines
+            file.write(lines.encode("utf-8"))
+            file.flush()
+            os.fsync(file.fileno())
+        self._entries += len(operations)
+
+    def apply(self, movies: Iterable[MovieDetails]) -> Iterator[MovieDetails]:
+        """
+        Stream the movies of the base file with the journaled operations applied.
+
+        Only the journal, which compaction keeps small, is held in memory.
+
+        Args:
+            movies (Iterable[MovieDetails]): The movies read from the base file.
+
+        Yields:
+            MovieDetails: The current movies.
+        """
+        replaced: Dict[str, Optional[MovieDetails]] = {}
+        notes: Dict[str, str] = {}
+        for operation in self._read():
+            title = operation.get("title") or operation["movie"]["Title"]
+            if operation["op"] == "add":
+                replaced[title] = MovieDetails.from_dict(operation["movie"])
+                notes.pop(title, None)
+            elif operation["op"] == "delete":
+                replaced[title] = None
+                notes.pop(title, None)
+            elif replaced.get(title) is not None:
+                replaced[title].notes = operation["notes"]
+            elif title not in replaced:
+                notes[title] = operation["notes"]
+        for movie in movies:
+            if movie.title in replaced:
+                continue
+            if movie.title in notes:
+                movie.notes = notes[movie.title]
+            yield movie
+        for movie in replaced.values():
+            if movie is not None:
+                yield movie
+
+    def clear(self) -> None:
+        """
+        Remove all entries, after they have been folded into the base file.
+        """
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+        self._entries = 0
+
+    def _read(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the operations stored in the journal, skipping a torn last line.
+        """
+        if not os.path.exists(self.file_path):
+            return
+        with open(self.file_path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(
+                        "Ignoring incomplete entry in journal '%s'.", self.file_path
+                    )
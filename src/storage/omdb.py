@@ -0,0 +1,175 @@
+"""
+Module for fetching movie data from the OMDb API.
+"""
+
+import logging
+import re
+import threading
+from typing import Any, Dict, Optional
+import requests
+from src.app.metrics import MetricsRegistry, timed
+from src.app.movie_utils import MovieData
+from src.config import (
+    SECRET_KEY,
+    OMDB_API_URL,
+    OMDB_CACHE_PATH,
+    OMDB_CACHE_TTL,
+    OMDB_CACHE_SIZE,
+)
+from src.storage.omdb_cache import OmdbCache
+
+logger = logging.getLogger(__name__)
+
+IMDB_ID_PATTERN = re.compile(r"^tt\d+$", re.IGNORECASE)
+
+
+def cache_key(user_search: str) -> str:
+    """
+    Return the cache key for a title or IMDb ID.
+
+    Titles are case-folded and their whitespace collapsed, so "the  Matrix"
+    and "The Matrix" share an entry.
+
+    Args:
+        user_search (str): The title or IMDb ID searched for.
+
+    Returns:
+        str: The cache key.
+    """
+    user_search = " ".join(user_search.split())
+    if IMDB_ID_PATTERN.match(user_search):
+        return f"id:{user_search.lower()}"
+    return f"title:{user_search.casefold()}"
+
+
+def _record_lookup(
+    registry: MetricsRegistry, args: tuple, movie_dict: Optional[Dict[str, Any]]
+) -> None:
+    """Record the outcome of a lookup and the state of the response cache."""
+    registry.inc("omdb_lookups_total", found=movie_dict is not None)
+    cache = args[0].cache
+    if cache is not None:
+        registry.set_gauge("omdb_cache_hits", cache.hits)
+        registry.set_gauge("omdb_cache_misses", cache.misses)
+
+
+class OmdbClient:
+    """
+    OMDb client reusing pooled HTTP connections and caching responses on disk.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = SECRET_KEY,
+        api_url: str = OMDB_API_URL,
+        cache: Optional[OmdbCache] = None,
+    ) -> None:
+        """
+        Initialize the client.
+
+        Args:
+            api_key (Optional[str]): The OMDb API key.
+            api_url (str): The OMDb endpoint, e.g. a local stub server in tests.
+            cache (Optional[OmdbCache]): The response cache, or None to disable caching.
+        """
+        self.api_key = api_key
+        self.api_url = api_url
+        self.cache = cache
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        Return the HTTP session of the calling thread, creating it on first use.
+        """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def flush(self) -> None:
+        """
+        Write the cache's pending access times, which drive its LRU eviction.
+        """
+        if self.cache is not None:
+            self.cache.flush()
+
+    @timed("omdb_lookup", record=_record_lookup)
+    def fetch_movie(self, user_search: str) -> Optional[Dict[str, MovieData]]:
+        """
+        Load movie data for a title or IMDb ID, from the cache if possible.
+
+        Args:
+            user_search (str): The title or IMDb ID to look up.
+
+        Raises:
+            requests.RequestException: If there is an error with the request.
+
+        Returns:
+            Optional[Dict[str, MovieData]]: The movie information, or None if
+                OMDb doesn't know the movie.
+        """
+        key = cache_key(user_search)
+        if self.cache is not None:
+            found, movie_dict = self.cache.get(key)
+            if found:
+                logger.debug("OMDb cache hit for '%s'.", user_search)
+                return movie_dict
+
+        movie_dict = self._request(user_search.strip(), key.startswith("id:"))
+        if self.cache is not None:
+            self.cache.put(key, movie_dict)
+            if movie_dict is not None:
+                self.cache.put(cache_key(movie_dict["ImdbID"]), movie_dict)
+        return movie_dict
+
+    def _request(self, user_search: str, by_id: bool) -> Optional[Dict[str, Any]]:
+        """
+        Query the OMDb API.
+
+        Args:
+            user_search (str): The title or IMDb ID to look up.
+            by_id (bool): Whether user_search is an IMDb ID.
+
+        Raises:
+            requests.RequestException: If there is an error with the request.
+
+        Returns:
+            Optional[Dict[str, Any]]: The movie information, or None if not found.
+        """
+        params = {"apikey": self.api_key, "i" if by_id else "t": user_search}
+        response = self.session.get(self.api_url, params=params, timeout=10)
+        if response.status_code != 200:
+            logger.error("Error: %d %s", response.status_code, response.text)
+            raise requests.RequestException(
+                f"Error: {response.status_code} {response.text}"
+            )
+        movie_data = response.json()
+        if movie_data.get("Response") == "False":
+            logger.debug("OMDb has no movie for '%s': %s", user_search, movie_data)
+            return None
+        rating = movie_data["imdbRating"]
+        rating = 0.0 if rating == "N/A" else float(rating)
+        movie_dict = {
+            "Title": movie_data["Title"],
+            "Year": movie_data["Year"],
+            "Rating": rating,
+            "Poster": movie_data["Poster"],
+            "Notes": "",
+            "ImdbID": movie_data["imdbID"],
+        }
+        logger.debug("load_movies_api returning: %s", movie_dict)
+        return movie_dict
+
+
+def create_client() -> OmdbClient:
+    """
+    Create an OMDb client configured from the environment, with the disk cache if enabled.
+
+    Returns:
+        OmdbClient: The client to pass to the storages.
+    """
+    cache = (
+        OmdbCache(OMDB_CACHE_PATH, OMDB_CACHE_TTL, OMDB_CACHE_SIZE) if OMDB_CACHE_PATH else None
+    )
+    return OmdbClient(cache=cache)
@@ -0,0 +1,131 @@
+"""
+Module for the persistent OMDb response cache.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value TEXT,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed_at ON responses (accessed_at);
+CREATE INDEX IF NOT EXISTS idx_responses_stored_at ON responses (stored_at);
+"""
+
+# The number of cache hits whose access time is kept in memory before it is written.
+TOUCH_BATCH = 64
+
+
+class OmdbCache:
+    """
+    SQLite-backed cache of OMDb lookups with a TTL and LRU eviction.
+
+    A value of None is cached as well, so titles OMDb doesn't know are not
+    requested again until their entry expires (negative caching).
+
+    Cache hits only read: their access times are collected in memory and
+    written in one transaction with the next put, or every TOUCH_BATCH hits.
+    Expired entries are deleted whenever an entry is stored.
+    """
+
+    def __init__(self, file_path: str, ttl: float, max_entries: int) -> None:
+        """
+        Open (and if needed create) the cache file.
+
+        Args:
+            file_path (str): The path of the SQLite cache file, or ":memory:".
+            ttl (float): The number of seconds an entry stays valid.
+            max_entries (int): The number of entries kept before the least
+                recently used ones are evicted.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # Access times of cache hits not written yet, by key.
+        self._touched: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(file_path, check_same_thread=False)
+        self._connection.executescript(SCHEMA)
+
+    def get(self, key: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        Look up a key.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Tuple[bool, Optional[Dict[str, Any]]]: Whether the key was found and
+                not expired, and the cached value (None for a negative entry).
+        """
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM responses WHERE key = ? AND stored_at > ?",
+                (key, now - self.ttl),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            self._touched[key] = now
+            if len(self._touched) >= TOUCH_BATCH:
+                with self._connection:
+                    self._write_touches()
+        return True, None if row[0] is None else json.loads(row[0])
+
+    def flush(self) -> None:
+        """
+        Write the access times of recent cache hits.
+        """
+        with self._lock, self._connection:
+            self._write_touches()
+
+    def _write_touches(self) -> None:
+        """
+        Write the collected access times; the caller holds the lock and a transaction.
+        """
+        if self._touched:
+            self._connection.executemany(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def put(self, key: str, value: Optional[Dict[str, Any]]) -> None:
+        """
+        Store a value, dropping expired entries and evicting the least recently
+        used ones if the cache is full.
+
+        Args:
+            key (str): The cache key.
+            value (Optional[Dict[str, Any]]): The value, or None for "not found".
+        """
+        now = time.time()
+        data = None if value is None else json.dumps(value)
+        with self._lock, self._connection:
+            self._write_touches()
+            self._connection.execute(
+                "DELETE FROM responses WHERE stored_at <= ?", (now - self.ttl,)
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, data, now, now),
+            )
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM responses"
+            ).fetchone()
+            if count > self.max_entries:
+                self._connection.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                    (count - self.max_entries,),
+                )
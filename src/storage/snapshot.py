@@ -0,0 +1,262 @@
+"""
+Module for the binary snapshot of a movie file, read with a memory map at startup.
+
+Layout (little endian):
+
+    header   magic, record count, size and mtime of the source file, total
+             size of the snapshot and CRC-32 of everything after the header
+    years    int32[count], zero padded to a multiple of 8 bytes
+    ratings  float64[count]
+    offsets  uint64[4 * count + 1], byte offsets into the string table
+    strings  UTF-8 titles, then posters, IMDb IDs and notes, NUL separated
+
+The fixed-width columns and the string table are decoded in bulk, so loading
+does not parse text or convert types row by row. The offset index gives
+random access to a single record. A snapshot whose size or checksum does not
+match its header, e.g. one cut short by a crash, is rejected.
+"""
+
+import logging
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from typing import Iterable, Iterator, List, Optional, Tuple
+from src.app.movie_details import MovieDetails
+from src.storage.file_utils import atomic_write
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"MOVSNAP2"
+HEADER = struct.Struct("<8sQQQQI4x")
+# Every column starts on an 8-byte boundary.
+YEARS_PADDING = 8
+STRING_FIELDS = ("title", "poster", "imdb_id", "notes")
+
+
+def source_signature(source_path: str) -> Tuple[int, int]:
+    """
+    Return the (size, mtime) a snapshot of source_path must have been made from.
+
+    Args:
+        source_path (str): The path of the JSON or CSV file.
+
+    Returns:
+        Tuple[int, int]: The size and modification time (ns) of the file.
+    """
+    stat = os.stat(source_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _years_size(count: int) -> int:
+    """
+    Return the size of the padded year column.
+    """
+    return -(-4 * count // YEARS_PADDING) * YEARS_PADDING
+
+
+def write_snapshot(file_path: str, movies: Iterable[MovieDetails], source_path: str) -> None:
+    """
+    Atomically write a snapshot of the movies.
+
+    Args:
+        file_path (str): The path of the snapshot.
+        movies (Iterable[MovieDetails]): The movies, in file order.
+        source_path (str): The text file the movies were saved to; the snapshot
+            is only used while that file is unchanged.
+
+    Raises:
+        ValueError: If a string contains a NUL character.
+    """
+    movies = list(movies)
+    strings = [getattr(movie, field) for field in STRING_FIELDS for movie in movies]
+    if any("\0" in string for string in strings):
+        raise ValueError("Movie data containing NUL characters cannot be snapshotted.")
+    encoded = [string.encode("utf-8") for string in strings]
+    offsets = array("Q", [0])
+    position = 0
+    for string in encoded:
+        position += len(string) + 1
+        offsets.append(position)
+    years = array("i", (movie.year for movie in movies))
+    ratings = array("d", (movie.rating for movie in movies))
+    body = [
+        years.tobytes(),
+        b"\0" * (_years_size(len(movies)) - 4 * len(movies)),
+        ratings.tobytes(),
+        offsets.tobytes(),
+        b"\0".join(encoded),
+        b"\0" if encoded else b"",
+    ]
+    checksum = 0
+    for part in body:
+        checksum = zlib.crc32(part, checksum)
+    total_size = HEADER.size + sum(len(part) for part in body)
+    size, mtime = source_signature(source_path)
+    with atomic_write(file_path, binary=True) as file:
+        file.write(HEADER.pack(MAGIC, len(movies), size, mtime, total_size, checksum))
+        for part in body:
+            file.write(part)
+
+
+class Snapshot:
+    """
+    A memory-mapped snapshot.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        """
+        Map a snapshot file.
+
+        Args:
+            file_path (str): The path of the snapshot.
+
+        Raises:
+            ValueError: If the file is not a snapshot, or is truncated or corrupt.
+        """
+        with open(file_path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._years: Optional[memoryview] = None
+        self._ratings: Optional[memoryview] = None
+        self._offsets: Optional[memoryview] = None
+        try:
+            self._check(file_path)
+            start = HEADER.size
+            self._years = memoryview(self._map)[start : start + 4 * self.count].cast("i")
+            start += _years_size(self.count)
+            self._ratings = memoryview(self._map)[start : start + 8 * self.count].cast("d")
+            start += 8 * self.count
+            self._offsets = memoryview(self._map)[start : self._strings_start].cast("Q")
+        except (struct.error, ValueError, TypeError):
+            self.close()
+            raise
+
+    def _check(self, file_path: str) -> None:
+        """
+        Read the header and verify the size and checksum of the snapshot against it.
+
+        Raises:
+            ValueError: If the snapshot does not match its header.
+        """
+        if len(self._map) < HEADER.size:
+            raise ValueError(f"'{file_path}' is too short to be a movie snapshot.")
+        magic, self.count, self.source_size, self.source_mtime, size, checksum = (
+            HEADER.unpack_from(self._map)
+        )
+        if magic != MAGIC:
+            raise ValueError(f"'{file_path}' is not a movie snapshot.")
+        self._strings_start = (
+            HEADER.size + _years_size(self.count) + 8 * self.count + 8 * (4 * self.count + 1)
+        )
+        if size != len(self._map) or size < self._strings_start:
+            raise ValueError(
+                f"Snapshot '{file_path}' has {len(self._map)} bytes, its header says {size}."
+            )
+        last_offset = struct.unpack_from("<Q", self._map, self._strings_start - 8)[0]
+        if self._strings_start + last_offset != size:
+            raise ValueError(f"The string table of snapshot '{file_path}' is truncated.")
+        with memoryview(self._map) as view:
+            if zlib.crc32(view[HEADER.size :]) != checksum:
+                raise ValueError(f"Snapshot '{file_path}' is corrupt: checksum mismatch.")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> MovieDetails:
+        """
+        Decode one record through the offset index.
+
+        Args:
+            index (int): The position of the movie.
+
+        Returns:
+            MovieDetails: The movie.
+        """
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return MovieDetails(
+            self._string(0, index),
+            self._years[index],
+            self._ratings[index],
+            *(self._string(field, index) for field in range(1, len(STRING_FIELDS))),
+        )
+
+    def _string(self, field: int, index: int) -> str:
+        """
+        Decode one string of a record, e.g. field 0 (the title) of the index-th movie.
+        """
+        slot = field * self.count + index
+        start = self._strings_start + self._offsets[slot]
+        end = self._strings_start + self._offsets[slot + 1] - 1
+        return self._map[start:end].decode("utf-8")
+
+    def __iter__(self) -> Iterator[MovieDetails]:
+        """
+        Decode all records in bulk.
+
+        Yields:
+            MovieDetails: The movies in file order.
+        """
+        count = self.count
+        if not count:
+            return
+        strings: List[str] = (
+            self._map[self._strings_start : len(self._map) - 1].decode("utf-8").split("\0")
+        )
+        if len(strings) != len(STRING_FIELDS) * count:
+            raise ValueError(f"Snapshot has {len(strings)} strings for {count} movies.")
+        yield from map(
+            MovieDetails,
+            strings[:count],
+            self._years.tolist(),
+            self._ratings.tolist(),
+            strings[count : 2 * count],
+            strings[2 * count : 3 * count],
+            strings[3 * count :],
+        )
+
+    def is_current(self, source_path: str) -> bool:
+        """
+        Return whether the snapshot was made from the current version of source_path.
+        """
+        try:
+            return source_signature(source_path) == (self.source_size, self.source_mtime)
+        except FileNotFoundError:
+            return False
+
+    def close(self) -> None:
+        """
+        Release the memory map.
+        """
+        for view in (self._years, self._ratings, self._offsets):
+            if view is not None:
+                view.release()
+        self._years = self._ratings = self._offsets = None
+        self._map.close()
+
+
+def open_snapshot(file_path: str, source_path: str) -> Optional[Snapshot]:
+    """
+    Open the snapshot if it exists and matches the source file.
+
+    Args:
+        file_path (str): The path of the snapshot.
+        source_path (str): The JSON or CSV file the snapshot was made from.
+
+    Returns:
+        Optional[Snapshot]: The snapshot, or None if it is missing, invalid or
+            older than the source file.
+    """
+    try:
+        snapshot = Snapshot(file_path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, struct.error, BufferError) as e:
+        logger.warning("Ignoring unreadable snapshot '%s': %s", file_path, e)
+        return None
+    if not snapshot.is_current(source_path):
+        logger.info("Snapshot '%s' is out of date, reading '%s'.", file_path, source_path)
+        snapshot.close()
+        return None
+    return snapshot
@@ -8,13 +8,29 @@ Returns:
 import csv
 import logging
 
-from typing import Dict
-from src.app.movie_details import MovieDetails
+from typing import IO, Iterable, Iterator
 from src.storage.base_storage import BaseStorage
-from src.app.movie_utils import MovieData
+from src.storage.file_utils import open_text
+from src.app.movie_details import MovieDetails
 
 logger = logging.getLogger(__name__)
 
+FIELDNAMES = ["Title", "Year", "Rating", "Poster", "Notes", "ImdbID"]
+
+
+def write_csv_movies(file: IO[str], movies: Iterable[MovieDetails]) -> None:
+    """
+    Write movies as CSV rows under a header, one movie at a time.
+
+    Args:
+        file (IO[str]): The file to write to, opened with newline="".
+        movies (Iterable[MovieDetails]): The movies, e.g. streamed from a generator.
+    """
+    writer = csv.DictWriter(file, fieldnames=FIELDNAMES)
+    writer.writeheader()
+    for movie in movies:
+        writer.writerow(movie.to_dict())
+
 
 class CsvStorage(BaseStorage):
     """
@@ -24,73 +40,28 @@ class CsvStorage(BaseStorage):
         BaseStorage (_type_):  Base class for handling storage of movie data.
     """
 
-    def load_movies_file(self) -> Dict[str, Dict[str, MovieData]]:
+    newline = ""
+
+    def _iter_movies_file(self) -> Iterator[MovieDetails]:
         """
-        Load movies from the CSV file
+        Stream movies from the CSV file one row at a time
 
-        Returns:
-            Dict[str, Dict[str, MovieData]]: A dictionary of movies
+        Yields:
+            MovieDetails: The movies in file order
         """
         try:
-            with open(self.file_path, mode="r", encoding="utf-8") as file:
-                reader = csv.DictReader(file)
-                movies = {
-                    row["Title"]: {
-                        "Title": row["Title"],
-                        "Year": int(row["Year"]),
-                        "Rating": float(row["Rating"]),
-                        "Poster": row["Poster"],
-                        "Notes": row.get("Notes", ""),
-                        "ImdbID": row["ImdbID"],
-                    }
-                    for row in reader
-                }
-            return movies
+            with open_text(self.file_path, newline="") as file:
+                for row in csv.DictReader(file):
+                    yield MovieDetails.from_dict(row)
         except FileNotFoundError:
             logger.error("File %s doesn't exist.", self.file_path)
             raise
 
-    def add_movie(self, movie: MovieDetails) -> None:
+    def _write_movies(self, file: IO[str]) -> None:
         """
-        Add a new movie to the storage.
+        Write the movies to the CSV file
 
         Args:
-            movie (MovieDetails): The movie details to add.
-
-        Raises:
-            ValueError: If the movie already exists.
-            KeyError: If there is an error adding the movie.
-        """
-        if movie.title in self.movies:
-            raise ValueError(f"Movie '{movie.title}' already exists.")
-        new_movie = {
-            "Title": movie.title,
-            "Year": movie.year,
-            "Rating": movie.rating,
-            "Poster": movie.poster,
-            "Notes": movie.notes,
-            "ImdbID": movie.imdb_id,
-        }
-        self.movies[movie.title] = new_movie
-        try:
-            self.save_movies()
-            logger.info("Movie '%s' successfully added.", movie.title)
-        except Exception as e:
-            logger.error("Error adding the movie '%s': %s", movie.title, e)
-            raise KeyError(f"Error adding the movie '{movie.title}': {e}") from e
-
-    def save_movies(self) -> None:
-        """
-        Save movies to the CSV file
+            file (IO[str]): The file to write to.
         """
-        try:
-            with open(self.file_path, mode="w", newline="", encoding="utf-8") as file:
-                fieldnames = ["Title", "Year", "Rating", "Poster", "Notes", "ImdbID"]
-                writer = csv.DictWriter(file, fieldnames=fieldnames)
-                writer.writeheader()
-                for movie in self.movies.values():
-                    writer.writerow(movie)
-            logger.info("Movies successfully saved to %s.", self.file_path)
-        except Exception as e:
-            logger.error("Error saving movies: %e", e)
-            raise
+        write_csv_movies(file, self.movies.values())
@@ -4,45 +4,58 @@ Module for handling JSON storage of movie data.
 
 import logging
 import json
-from typing import Dict
+from typing import IO, Iterable, Iterator
 from src.storage.base_storage import BaseStorage
-from src.app.movie_utils import MovieData
+from src.storage.file_utils import iter_json_object, open_text
+from src.app.movie_details import MovieDetails
 
 logger = logging.getLogger(__name__)
 
 
+def write_json_movies(file: IO[str], movies: Iterable[MovieDetails]) -> None:
+    """
+    Write movies as a JSON object keyed by title, one movie at a time.
+
+    Args:
+        file (IO[str]): The file to write to.
+        movies (Iterable[MovieDetails]): The movies, e.g. streamed from a generator.
+    """
+    separator = "{\n"
+    for movie in movies:
+        value = json.dumps(movie.to_dict(), indent=4).replace("\n", "\n    ")
+        file.write(f"{separator}    {json.dumps(movie.title)}: {value}")
+        separator = ",\n"
+    file.write("\n}" if separator == ",\n" else "{}")
+
+
 class JsonStorage(BaseStorage):
     """
     Class for handling JSON storage of movie data.
     """
 
-    def load_movies_file(self) -> Dict[str, Dict[str, MovieData]]:
+    def _iter_movies_file(self) -> Iterator[MovieDetails]:
         """
-        Load movies from the JSON file.
+        Stream movies from the JSON file without decoding it as a whole.
 
-        Returns:
-            Dict[str, Dict[str, MovieData]]: A dictionary of movies.
+        Yields:
+            MovieDetails: The movies in file order.
         """
         try:
-            with open(self.file_path, "r", encoding="utf-8") as file:
-                return json.load(file)
+            with open_text(self.file_path) as file:
+                for _, movie in iter_json_object(file):
+                    yield MovieDetails.from_dict(movie)
         except FileNotFoundError:
             logger.error("File '%s' doesn't exist.", self.file_path)
             raise
         except json.JSONDecodeError:
             logger.error("Error decoding JSON data in file '%s'.", self.file_path)
             raise
-        
-        
 
-    def save_movies(self) -> None:
+    def _write_movies(self, file: IO[str]) -> None:
         """
-        Save movies to the JSON file.
+        Write the movies to the JSON file one at a time.
+
+        Args:
+            file (IO[str]): The file to write to.
         """
-        try:
-            with open(self.file_path, "w", encoding="utf-8") as file:
-                json.dump(self.movies, file, indent=4)
-            logger.info("Movies successfully saved to '%s'.", self.file_path)
-        except Exception as e:
-            logger.error("Error saving movies: %s", e)
-            raise
+        write_json_movies(file, self.movies.values())
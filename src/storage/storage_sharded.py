@@ -0,0 +1,217 @@
+"""
+Module for handling sharded storage of movie data in a directory.
+"""
+
+import csv
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+from src.app.movie_details import MovieDetails
+from src.config import SHARD_COUNT, SHARD_FORMAT
+from src.storage.base_storage import BaseStorage
+from src.storage.file_utils import atomic_write, split_compression
+from src.storage.omdb import OmdbClient
+from src.storage.storage_csv import FIELDNAMES, CsvStorage
+from src.storage.storage_json import JsonStorage
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+SHARD_CLASSES = {".json": JsonStorage, ".csv": CsvStorage}
+
+
+def shard_of(title: str, shard_count: int) -> int:
+    """
+    Return the shard a title is stored in.
+
+    The hash is stable across processes and Python versions, unlike hash().
+
+    Args:
+        title (str): The title of the movie.
+        shard_count (int): The number of shards.
+
+    Returns:
+        int: The shard number.
+    """
+    digest = hashlib.blake2b(title.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shard_count
+
+
+class ShardedStorage(BaseStorage):
+    """
+    Storage partitioning the movies over N JSON or CSV files by a hash of the title.
+
+    The directory holds a manifest with the shard format and count, and one
+    file per shard. A mutation only rewrites the shards it touches, and the
+    shards are loaded in parallel. An external change to one shard only
+    re-reads that shard.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        shard_format: str = SHARD_FORMAT,
+        shard_count: int = SHARD_COUNT,
+        journal: bool = False,
+        snapshot: bool = False,
+        omdb_client: Optional[OmdbClient] = None,
+    ) -> None:
+        """
+        Open (and if needed create) a sharded storage.
+
+        Args:
+            directory (str): The directory holding the manifest and shards.
+            shard_format (str): The format of new shards: "json" or "csv",
+                optionally compressed ("json.gz", "csv.xz", ...). Ignored if
+                the directory already has a manifest.
+            shard_count (int): The number of shards of a new storage. Ignored
+                if the directory already has a manifest.
+            journal (bool): Journal the mutations of each shard instead of
+                rewriting it (see BaseStorage).
+            snapshot (bool): Keep a binary snapshot of each shard.
+            omdb_client (Optional[OmdbClient]): The client movies are looked up with.
+
+        Raises:
+            ValueError: If the shard format is not supported.
+        """
+        manifest = self._open_manifest(directory, shard_format, shard_count)
+        shard_format, shard_count = manifest["format"], manifest["shards"]
+        ext = os.path.splitext(split_compression(f"shard.{shard_format}")[0])[1]
+        if ext not in SHARD_CLASSES or shard_count < 1:
+            raise ValueError(f"Unsupported shard layout: {shard_count} x {shard_format}")
+        self._shards: List[BaseStorage] = [
+            self._open_shard(
+                SHARD_CLASSES[ext],
+                os.path.join(directory, f"shard_{number:03d}.{shard_format}"),
+                journal=journal,
+                snapshot=snapshot,
+            )
+            for number in range(shard_count)
+        ]
+        super().__init__(directory, omdb_client=omdb_client)
+
+    @staticmethod
+    def _open_manifest(directory: str, shard_format: str, shard_count: int) -> Dict[str, Any]:
+        """
+        Read the manifest, writing it first for a new storage.
+
+        Returns:
+            Dict[str, Any]: The manifest, with the shard "format" and the number of "shards".
+        """
+        path = os.path.join(directory, MANIFEST_NAME)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        os.makedirs(directory, exist_ok=True)
+        manifest = {"version": 1, "format": shard_format, "shards": shard_count}
+        with atomic_write(path) as file:
+            json.dump(manifest, file, indent=4)
+        logger.info("Created sharded storage '%s' (%d x %s).", directory, shard_count, shard_format)
+        return manifest
+
+    @staticmethod
+    def _open_shard(shard_class: type, path: str, journal: bool, snapshot: bool) -> BaseStorage:
+        """
+        Return the storage of one shard, creating an empty shard file if needed.
+        """
+        if not os.path.exists(path):
+            with atomic_write(path, newline=shard_class.newline) as file:
+                if shard_class is CsvStorage:
+                    csv.writer(file).writerow(FIELDNAMES)
+                else:
+                    file.write("{}")
+        return shard_class(path, journal=journal, snapshot=snapshot)
+
+    def _shard(self, title: str) -> BaseStorage:
+        """
+        Return the storage of the shard a title belongs to.
+        """
+        return self._shards[shard_of(title, len(self._shards))]
+
+    @contextmanager
+    def _locked(self, shared: bool = False) -> Iterator[None]:
+        """
+        Take no directory-wide lock: every shard locks its own file when it is read or written.
+        """
+        yield
+
+    def _file_signature(self) -> tuple:
+        """
+        Return the signatures of all shard files.
+
+        Returns:
+            tuple: A value that changes whenever any shard is modified or replaced.
+        """
+        return tuple(entry for shard in self._shards for entry in shard.file_signature())
+
+    def _iter_movies_file(self) -> Iterator[MovieDetails]:
+        """
+        Load the shards in parallel; shards that did not change are not read again.
+
+        Yields:
+            MovieDetails: The movies, shard by shard.
+        """
+        workers = min(len(self._shards), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for movies in executor.map(lambda shard: shard.load_movies_file(), self._shards):
+                yield from movies.values()
+
+    def save_movies(self) -> None:
+        """
+        Redistribute all movies over the shards and rewrite every shard.
+        """
+        for shard in self._shards:
+            shard.movies.clear()
+        for title, movie in self.movies.items():
+            self._shard(title).movies[title] = movie
+        for shard in self._shards:
+            shard.save_movies()
+        self._signature = self._file_signature()
+        logger.info("Movies successfully saved to '%s'.", self.file_path)
+
+    def _persist(self, operations: List[Dict[str, Any]]) -> None:
+        """
+        Apply mutations to the shards they belong to and rewrite only those shards.
+
+        A shard changed by another process is merged by the shard itself (see
+        BaseStorage.persist_operations), after which the movies are rebuilt from the shards.
+
+        Args:
+            operations (List[Dict[str, Any]]): The journal operations describing
+                the mutations.
+        """
+        if self._pending is not None:
+            self._pending.extend(operations)
+            return
+        touched: Dict[int, List[Dict[str, Any]]] = {}
+        for operation in operations:
+            title = operation["movie"]["Title"] if operation["op"] == "add" else operation["title"]
+            number = shard_of(title, len(self._shards))
+            shard = self._shards[number]
+            if operation["op"] == "delete":
+                shard.movies.pop(title, None)
+            elif title in self.movies:
+                # The shard shares the movie records, so updates are already applied.
+                shard.movies[title] = self.movies[title]
+            touched.setdefault(number, []).append(operation)
+        merged = False
+        try:
+            for number in sorted(touched):
+                merged |= self._shards[number].persist_operations(touched[number])
+        except Exception:
+            # Re-read the touched shards from disk on the next load.
+            for number in touched:
+                self._shards[number].invalidate()
+            raise
+        if merged:
+            self.movies.clear()
+            for shard in self._shards:
+                self.movies.update(shard.movies)
+            self._reset_lookup_indexes()
+            self._notify("movies_reloaded", self.movies)
+        self._signature = self._file_signature()
+        logger.debug("Rewrote %d of %d shards.", len(touched), len(self._shards))
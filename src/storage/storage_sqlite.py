@@ -0,0 +1,599 @@
+"""
+Module for handling SQLite storage of movie data.
+"""
+
+import logging
+import random
+import sqlite3
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from src.app.movie_details import MovieDetails, normalize_title
+from src.app.movie_utils import MovieData
+from src.storage.i_storage import IStorage, duplicate_message
+from src.storage.omdb import OmdbClient
+from src.storage.website import WebsiteGenerator
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = "title, year, rating, poster, imdb_id, notes"
+INSERT_COLUMNS = f"{COLUMNS}, normalized_title"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS movies (
+    title TEXT PRIMARY KEY,
+    year INTEGER NOT NULL,
+    rating REAL NOT NULL,
+    poster TEXT NOT NULL DEFAULT '',
+    imdb_id TEXT NOT NULL DEFAULT '',
+    notes TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_movies_imdb_id ON movies (imdb_id);
+-- (value, title) so that sorted pages are read straight from the index.
+CREATE INDEX IF NOT EXISTS idx_movies_year_title ON movies (year, title);
+CREATE INDEX IF NOT EXISTS idx_movies_rating_title ON movies (rating, title);
+"""
+
+# Upgrades of existing databases, run once each in order. PRAGMA user_version
+# holds the number of migrations a database has been through.
+MIGRATIONS = [
+    # The single-column indexes were replaced by the (value, title) indexes.
+    """
+    DROP INDEX IF EXISTS idx_movies_year;
+    DROP INDEX IF EXISTS idx_movies_rating;
+    """,
+    # An index on normalize_title(title) made the database unwritable for
+    # clients without that function; the normalized title is a column now.
+    """
+    DROP INDEX IF EXISTS idx_movies_normalized_title;
+    ALTER TABLE movies ADD COLUMN normalized_title TEXT NOT NULL DEFAULT '';
+    UPDATE movies SET normalized_title = normalize_title(title);
+    CREATE INDEX idx_movies_normalized_title ON movies (normalized_title);
+    """,
+]
+
+
+class SqliteStorage(IStorage):
+    """
+    Class for handling SQLite storage of movie data.
+
+    Movies stay on disk: every change touches a single row, and queries are
+    answered by SqliteMovieUtils with indexed SQL instead of loading the catalog.
+    """
+
+    def __init__(self, file_path: str, omdb_client: Optional[OmdbClient] = None) -> None:
+        """
+        Open (and if needed create) the SQLite database.
+
+        Args:
+            file_path (str): The path to the database file.
+            omdb_client (Optional[OmdbClient]): The client movies are looked up
+                with; by default an uncached one.
+        """
+        self.file_path = file_path
+        self._listeners: List[Any] = []
+        self._omdb = omdb_client or OmdbClient()
+        self._website = WebsiteGenerator()
+        # Notifications held back until the current batch() commits.
+        self._deferred: Optional[List[tuple]] = None
+        self.connection = sqlite3.connect(file_path)
+        # Only used by the migration filling the normalized_title column.
+        self.connection.create_function("normalize_title", 1, normalize_title)
+        # SQLite's own lower() only folds ASCII letters; searches use Python's,
+        # as the in-memory backends do.
+        self.connection.create_function("unicode_lower", 1, str.lower, deterministic=True)
+        self.connection.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        """
+        Run the migrations the database has not been through yet.
+        """
+        (version,) = self.connection.execute("PRAGMA user_version").fetchone()
+        for number, migration in enumerate(MIGRATIONS[version:], version + 1):
+            with self.connection:
+                self.connection.executescript(
+                    f"BEGIN;\n{migration}\nPRAGMA user_version = {number};"
+                )
+            logger.info("Migrated '%s' to schema version %d.", self.file_path, number)
+
+    def query(self, sql: str, parameters: tuple = ()) -> Iterator[MovieDetails]:
+        """
+        Run a SELECT over the movie columns and yield the rows as movies.
+
+        Args:
+            sql (str): The query, selecting COLUMNS from movies.
+            parameters (tuple): The query parameters.
+
+        Yields:
+            MovieDetails: The movies returned by the query.
+        """
+        for row in self.connection.execute(sql, parameters):
+            yield MovieDetails(*row)
+
+    def load_movies_file(self) -> Dict[str, MovieDetails]:
+        """
+        Load all movies from the database.
+
+        Returns:
+            Dict[str, MovieDetails]: A dictionary of movies.
+        """
+        return {movie.title: movie for movie in self.iter_movies()}
+
+    def refresh(self) -> None:
+        """
+        No-op; every query reads the current database.
+        """
+
+    def iter_movies(self) -> Iterator[MovieDetails]:
+        """
+        Stream the movies from the database one at a time.
+
+        Returns:
+            Iterator[MovieDetails]: The movies in insertion order.
+        """
+        return self.query(f"SELECT {COLUMNS} FROM movies ORDER BY rowid")
+
+    def load_movies_api(self, user_search: str) -> Optional[Dict[str, MovieData]]:
+        """
+        Load movie data from an API using the user's search query.
+
+        Args:
+            user_search (str): The user's search query.
+
+        Returns:
+            Optional[Dict[str, MovieData]]: A dictionary containing movie
+                information, or None if the movie was not found.
+        """
+        return self._omdb.fetch_movie(user_search)
+
+    def subscribe(self, listener: Any) -> None:
+        """
+        Register a listener to be notified about changes to the movies.
+
+        Args:
+            listener (Any): An object implementing movie_added, movie_deleted
+                and movie_updated, each taking the affected movie.
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, event: str, movie: MovieDetails) -> None:
+        """
+        Notify all listeners about a change to a movie.
+        """
+        if self._deferred is not None:
+            self._deferred.append((event, movie))
+            return
+        for listener in self._listeners:
+            getattr(listener, event)(movie)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """
+        Commit the enclosed statements, unless they are part of a batch.
+        """
+        if self._deferred is not None:
+            yield
+            return
+        with self.connection:
+            yield
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Run the enclosed mutations in one SQLite transaction.
+
+        The transaction is committed on exit, or rolled back if the block raises;
+        listeners are only notified once the changes are committed.
+
+        Yields:
+            None
+        """
+        if self._deferred is not None:
+            yield
+            return
+        self._deferred = []
+        try:
+            with self.connection:
+                yield
+            deferred = self._deferred
+        finally:
+            self._deferred = None
+        for event, movie in deferred:
+            self._notify(event, movie)
+
+    def _get_movie(self, title: str) -> Optional[MovieDetails]:
+        """
+        Return a movie by title, or None if it doesn't exist.
+        """
+        return next(
+            self.query(f"SELECT {COLUMNS} FROM movies WHERE title = ?", (title,)), None
+        )
+
+    def find_by_imdb_id(self, imdb_id: str) -> Optional[MovieDetails]:
+        """
+        Look up a movie by its IMDb ID.
+
+        Args:
+            imdb_id (str): The IMDb ID, e.g. "tt0133093".
+
+        Returns:
+            Optional[MovieDetails]: The movie, or None if it is not stored.
+        """
+        return next(
+            self.query(f"SELECT {COLUMNS} FROM movies WHERE imdb_id = ? LIMIT 1", (imdb_id,)),
+            None,
+        )
+
+    def _find_duplicate(self, movie: MovieDetails) -> Optional[str]:
+        """
+        Return the stored title a movie duplicates, if any.
+
+        Args:
+            movie (MovieDetails): The movie about to be added.
+
+        Returns:
+            Optional[str]: The title of the stored movie with the same title,
+                normalized title or IMDb ID, or None.
+        """
+        row = self.connection.execute(
+            "SELECT title FROM movies WHERE title = ? OR normalized_title = ?"
+            " OR (? != '' AND imdb_id = ?) LIMIT 1",
+            (movie.title, normalize_title(movie.title), movie.imdb_id, movie.imdb_id),
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def add_movie(self, movie: MovieDetails) -> None:
+        """
+        Add a new movie to the storage.
+
+        Args:
+            movie (MovieDetails): The movie details to add.
+
+        Raises:
+            ValueError: If the movie already exists, under the same title, the
+                same normalized title or the same IMDb ID.
+        """
+        duplicate = self._find_duplicate(movie)
+        if duplicate is not None:
+            raise ValueError(duplicate_message(movie, duplicate))
+        try:
+            with self._transaction():
+                self.connection.execute(
+                    f"INSERT INTO movies ({INSERT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    _row(movie),
+                )
+        except sqlite3.IntegrityError as e:
+            raise ValueError(f"Movie '{movie.title}' already exists.") from e
+        self._notify("movie_added", movie)
+        logger.info("Movie '%s' successfully added.", movie.title)
+
+    def add_movies(self, movies: List[MovieDetails]) -> List[MovieDetails]:
+        """
+        Add several movies in a single transaction, skipping duplicates.
+
+        Args:
+            movies (List[MovieDetails]): The movies to add.
+
+        Returns:
+            List[MovieDetails]: The movies that were added.
+        """
+        added = []
+        with self._transaction():
+            for movie in movies:
+                duplicate = self._find_duplicate(movie)
+                if duplicate is not None:
+                    logger.warning("%s Skipped.", duplicate_message(movie, duplicate))
+                    continue
+                cursor = self.connection.execute(
+                    f"INSERT OR IGNORE INTO movies ({INSERT_COLUMNS})"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    _row(movie),
+                )
+                if cursor.rowcount:
+                    added.append(movie)
+                else:
+                    logger.warning("Movie '%s' already exists, skipped.", movie.title)
+        for movie in added:
+            self._notify("movie_added", movie)
+        logger.info("%d movies successfully added.", len(added))
+        return added
+
+    def delete_movie(self, title: str) -> None:
+        """
+        Delete a movie from the storage.
+
+        Args:
+            title (str): The title of the movie to delete.
+
+        Raises:
+            KeyError: If the movie doesn't exist.
+        """
+        movie = self._get_movie(title)
+        if movie is None:
+            logger.error("Movie '%s' doesn't exist.", title)
+            raise KeyError(f"Movie '{title}' doesn't exist.")
+        with self._transaction():
+            self.connection.execute("DELETE FROM movies WHERE title = ?", (title,))
+        self._notify("movie_deleted", movie)
+        logger.info("Movie '%s' successfully deleted.", title)
+
+    def update_movie(self, title: str, notes: str) -> None:
+        """
+        Update the notes of a movie in the storage.
+
+        Args:
+            title (str): The title of the movie to update.
+            notes (str): The new notes for the movie.
+
+        Raises:
+            KeyError: If the movie doesn't exist.
+        """
+        with self._transaction():
+            cursor = self.connection.execute(
+                "UPDATE movies SET notes = ? WHERE title = ?", (notes, title)
+            )
+        if cursor.rowcount == 0:
+            logger.error("Movie '%s' doesn't exist.", title)
+            raise KeyError(f"Movie '{title}' doesn't exist.")
+        self._notify("movie_updated", self._get_movie(title))
+        logger.info("Movie '%s' successfully updated.", title)
+
+    def generate_website(self) -> None:
+        """
+        Generate a static HTML website to display the movies.
+        """
+        self._website.generate(self.iter_movies())
+
+
+def _row(movie: MovieDetails) -> tuple:
+    """
+    Return the INSERT_COLUMNS values of a movie.
+    """
+    return (
+        movie.title,
+        movie.year,
+        movie.rating,
+        movie.poster,
+        movie.imdb_id,
+        movie.notes,
+        normalize_title(movie.title),
+    )
+
+
+def _filter_clause(min_rating, start_year, end_year) -> Tuple[str, tuple]:
+    """
+    Return the WHERE clause and parameters of a rating and year filter.
+    """
+    conditions, parameters = ["rating >= ?"], [min_rating]
+    if start_year is not None:
+        conditions.append("year >= ?")
+        parameters.append(start_year)
+    if end_year is not None:
+        conditions.append("year <= ?")
+        parameters.append(end_year)
+    return " AND ".join(conditions), tuple(parameters)
+
+
+class SqliteMovieUtils:
+    """
+    MovieUtils for a SqliteStorage: every query is pushed down into SQL.
+    """
+
+    def __init__(self, storage: SqliteStorage) -> None:
+        """
+        Initialize the utility class with a SQLite storage.
+
+        Args:
+            storage (SqliteStorage): The storage to query.
+        """
+        self._storage = storage
+
+    def _select(
+        self, where: str = "", parameters: tuple = (), tail: str = ""
+    ) -> List[MovieDetails]:
+        """
+        Return the movies matching a WHERE clause, followed by ORDER BY/LIMIT.
+        """
+        where = f" WHERE {where}" if where else ""
+        return list(
+            self._storage.query(f"SELECT {COLUMNS} FROM movies{where} {tail}", parameters)
+        )
+
+    def movie_added(self, movie: MovieDetails) -> None:
+        """Storage listener; the database is always up to date."""
+
+    def movie_deleted(self, movie: MovieDetails) -> None:
+        """Storage listener; the database is always up to date."""
+
+    def movie_updated(self, movie: MovieDetails) -> None:
+        """Storage listener; the database is always up to date."""
+
+    def movies_reloaded(self, movies: Dict[str, MovieDetails]) -> None:
+        """Storage listener; the database is always up to date."""
+
+    def save_title_index(self) -> None:
+        """No-op; searches run directly against the database."""
+
+    def count_movies(self) -> int:
+        """Return the number of movies.
+
+        Returns:
+            int: The number of movies.
+        """
+        (count,) = self._storage.connection.execute("SELECT COUNT(*) FROM movies").fetchone()
+        return count
+
+    def iter_movies(self) -> Iterator[MovieDetails]:
+        """Stream the movies from the database, in insertion order.
+
+        Returns:
+            Iterator[MovieDetails]: The movies.
+        """
+        return self._storage.iter_movies()
+
+    def filter_movies_by_rating_and_year(
+        self, min_rating=0.0, start_year=None, end_year=None
+    ) -> List[MovieDetails]:
+        """Filter movies by rating and optionally by year.
+
+        Args:
+            min_rating (float): The minimum rating to filter by.
+            start_year (int): The start year to filter by.
+            end_year (int): The end year to filter by.
+
+        Returns:
+            List[MovieDetails]: A list of filtered movies.
+        """
+        return self._select(*_filter_clause(min_rating, start_year, end_year))
+
+    def random_movie(self) -> Optional[MovieDetails]:
+        """Return a random movie from the database.
+
+        Returns:
+            Optional[MovieDetails]: The randomly chosen movie.
+        """
+        # An offset into the rows, rather than a random rowid, so that the gaps
+        # left by deleted movies do not favour the movies after them.
+        count = self.count_movies()
+        if not count:
+            return None
+        movies = self._select("", (random.randrange(count),), "LIMIT 1 OFFSET ?")
+        return movies[0]
+
+    def random_movies(
+        self,
+        k: int,
+        min_rating: float = 0.0,
+        year_range: Optional[Tuple[Optional[int], Optional[int]]] = None,
+    ) -> List[MovieDetails]:
+        """Return up to k distinct random movies matching a rating and year filter.
+
+        Args:
+            k (int): The number of movies to return.
+            min_rating (float): The minimum rating.
+            year_range (Optional[Tuple[Optional[int], Optional[int]]]): The first
+                and last year (inclusive), either of which may be None.
+
+        Returns:
+            List[MovieDetails]: The movies, fewer than k if fewer match.
+        """
+        if k <= 0:
+            return []
+        start_year, end_year = year_range or (None, None)
+        where, parameters = _filter_clause(min_rating, start_year, end_year)
+        return self._select(where, parameters + (k,), "ORDER BY RANDOM() LIMIT ?")
+
+    def iter_sorted(
+        self,
+        key: str = "rating",
+        order: str = "desc",
+        page_size: int = 20,
+        after: Optional[Tuple[float, str]] = None,
+    ) -> Iterator[List[MovieDetails]]:
+        """Page through the movies sorted by rating or year, with keyset pagination.
+
+        Args:
+            key (str): "rating" or "year".
+            order (str): "desc" (as sort_by_rating/sort_by_year) or "asc".
+            page_size (int): The number of movies per page.
+            after (Optional[Tuple[float, str]]): Resume after this cursor.
+
+        Raises:
+            ValueError: If key or order is not supported.
+
+        Yields:
+            List[MovieDetails]: The pages, each holding up to page_size movies.
+        """
+        if key not in ("rating", "year"):
+            raise ValueError(f"Unsupported sort key: {key}")
+        if order not in ("asc", "desc"):
+            raise ValueError(f"Unsupported sort order: {order}")
+        direction, operator = ("DESC", "<") if order == "desc" else ("ASC", ">")
+        tail = f"ORDER BY {key} {direction}, title {direction} LIMIT ?"
+        while True:
+            if after is None:
+                page = self._select("", (page_size,), tail)
+            else:
+                page = self._select(f"({key}, title) {operator} (?, ?)", (*after, page_size), tail)
+            if not page:
+                return
+            after = (getattr(page[-1], key), page[-1].title)
+            yield page
+
+    def search_movie(self, title: str) -> List[MovieDetails]:
+        """Search for a movie by title.
+
+        Args:
+            title (str): The title of the movie to search for.
+
+        Returns:
+            List[MovieDetails]: A list of movies matching the search title.
+        """
+        return self._select("instr(unicode_lower(title), ?) > 0", (title.lower(),))
+
+    def sort_by_rating(self) -> List[MovieDetails]:
+        """Sort movies by their rating in descending order.
+
+        Returns:
+            List[MovieDetails]: A list of movies sorted by rating.
+        """
+        return self._select(tail="ORDER BY rating DESC")
+
+    def sort_by_year(self) -> List[MovieDetails]:
+        """Sort movies by their release year in descending order.
+
+        Returns:
+            List[MovieDetails]: A list of movies sorted by release year.
+        """
+        return self._select(tail="ORDER BY year DESC")
+
+    def calculate_average_rating(self) -> float:
+        """Calculate the average rating of the movies.
+
+        Returns:
+            float: The average rating of the movies.
+        """
+        (average,) = self._storage.connection.execute(
+            "SELECT AVG(rating) FROM movies"
+        ).fetchone()
+        return average or 0.0
+
+    def find_best_movies(self, top_n=10) -> List[MovieDetails]:
+        """Find the top N best-rated movies.
+
+        Args:
+            top_n (int): The number of top movies to find.
+
+        Returns:
+            List[MovieDetails]: A list of the top N best-rated movies.
+        """
+        return self._select("", (top_n,), "ORDER BY rating DESC LIMIT ?")
+
+    def find_worst_movies(self, top_n=10) -> List[MovieDetails]:
+        """Find the top N worst-rated movies.
+
+        Args:
+            top_n (int): The number of worst movies to find.
+
+        Returns:
+            List[MovieDetails]: A list of the top N worst-rated movies.
+        """
+        return self._select("", (top_n,), "ORDER BY rating ASC LIMIT ?")
+
+    def get_movies_statistics(self) -> Dict[str, Any]:
+        """Compute and return statistics about the movies.
+
+        Returns:
+            Dict[str, Any]: A dictionary containing statistics about the movies.
+        """
+        count, average, highest, lowest = self._storage.connection.execute(
+            "SELECT COUNT(*), AVG(rating), MAX(rating), MIN(rating) FROM movies"
+        ).fetchone()
+        return {
+            "total_movies": count,
+            "average_rating": average or 0.0,
+            "max_rating": highest,
+            "min_rating": lowest,
+            "best_movies": self.find_best_movies(top_n=5),
+            "worst_movies": self.find_worst_movies(top_n=5),
+        }
@@ -0,0 +1,375 @@
+"""
+Module for generating the static movie website.
+"""
+
+import os
+import json
+import logging
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from src.app.movie_details import MovieDetails
+from src.config import (
+    TEMPLATE_PATH,
+    WEBSITE_PAGE_SIZE,
+    WEBSITE_RENDER_WORKERS,
+    WEBSITE_SHARD_SIZE,
+)
+from src.storage.file_utils import atomic_write
+
+logger = logging.getLogger(__name__)
+
+GRID_PLACEHOLDER = "__TEMPLATE_MOVIE_GRID__"
+PAGINATION_PLACEHOLDER = "__TEMPLATE_PAGINATION__"
+SEARCH_INDEX_NAME = "movie_search_index.json"
+
+
+def render_movie(movie: MovieDetails) -> str:
+    """
+    Render the HTML grid item of one movie.
+
+    Args:
+        movie (MovieDetails): The movie to render.
+
+    Returns:
+        str: The <li> fragment of the movie.
+    """
+    return (
+        f'<li class="movie">'
+        f'<a href="https://www.imdb.com/title/{movie.imdb_id}" target="_blank">'
+        f'<img src="{movie.poster}" class="movie-poster" alt="{movie.title} Poster"/>'
+        f"</a>"
+        f'<div class="movie-title">{movie.title}</div>'
+        f'<p class="movie-year">{movie.year}</p>'
+        f'<p class="movie-rating">Rating: {movie.rating}</p>'
+        f'<p class="movie-notes">{movie.notes}</p>'
+        f"</li>"
+    )
+
+
+def render_shard(movies: List[MovieDetails]) -> List[str]:
+    """
+    Render the grid items of a shard of movies, in order.
+
+    Runs in the worker processes of a parallel render.
+
+    Args:
+        movies (List[MovieDetails]): The movies to render.
+
+    Returns:
+        List[str]: The <li> fragments of the movies.
+    """
+    return [render_movie(movie) for movie in movies]
+
+
+def movie_digest(movie: MovieDetails) -> bytes:
+    """
+    Return a stable hash of everything that is rendered for a movie.
+
+    Args:
+        movie (MovieDetails): The movie.
+
+    Returns:
+        bytes: A 16-byte digest of the movie's fields.
+    """
+    content = "\x1f".join(
+        (movie.title, str(movie.year), str(movie.rating), movie.poster, movie.imdb_id, movie.notes)
+    )
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+
+
+def page_name(output_name: str, page: int) -> str:
+    """
+    Return the file name of a page: movie_app.html, movie_app_2.html, ...
+
+    Args:
+        output_name (str): The file name of the first page.
+        page (int): The page number, starting at 1.
+
+    Returns:
+        str: The file name of the page.
+    """
+    if page == 1:
+        return output_name
+    stem, ext = os.path.splitext(output_name)
+    return f"{stem}_{page}{ext}"
+
+
+def render_pagination(output_name: str, page: int, page_count: int) -> str:
+    """
+    Render the navigation and search box shown on every page of a paginated site.
+
+    Args:
+        output_name (str): The file name of the first page.
+        page (int): The current page number.
+        page_count (int): The number of pages.
+
+    Returns:
+        str: The navigation HTML.
+    """
+    numbers = sorted(
+        {1, page_count} | set(range(max(1, page - 2), min(page_count, page + 2) + 1))
+    )
+    links, previous = [], 0
+    if page > 1:
+        links.append(f'<a href="{page_name(output_name, page - 1)}">&laquo; Prev</a>')
+    for number in numbers:
+        if number > previous + 1:
+            links.append("<span>&hellip;</span>")
+        if number == page:
+            links.append(f'<span class="current">{number}</span>')
+        else:
+            links.append(f'<a href="{page_name(output_name, number)}">{number}</a>')
+        previous = number
+    if page < page_count:
+        links.append(f'<a href="{page_name(output_name, page + 1)}">Next &raquo;</a>')
+    return (
+        f'<nav class="pagination">{"".join(links)}</nav>'
+        f'<div class="movie-search" data-index="{SEARCH_INDEX_NAME}">'
+        f'<input type="search" placeholder="Search title" class="search-title">'
+        f'<input type="number" placeholder="Min rating" step="0.1" class="search-rating">'
+        f'<input type="number" placeholder="Year" class="search-year">'
+        f'<ol class="search-results"></ol></div>'
+        f'<script src="../static/search.js" defer></script>'
+    )
+
+
+class WebsiteGenerator:
+    """
+    Incremental generator of the static movie website.
+
+    Rendered fragments are cached by the digest of the movie's content, so only
+    new or changed movies are rendered again. Pages are streamed to disk chunk
+    by chunk, and a page is not written at all if neither its movies nor the
+    template changed since the last generation.
+
+    With a page size, the movies are split over movie_app.html,
+    movie_app_2.html, ... with navigation, and a compact JSON search index
+    (title, year, rating and page of every movie) is written next to them.
+    """
+
+    def __init__(
+        self,
+        template_path: str = TEMPLATE_PATH,
+        output_name: str = "movie_app.html",
+        page_size: int = WEBSITE_PAGE_SIZE,
+        workers: int = WEBSITE_RENDER_WORKERS,
+        shard_size: int = WEBSITE_SHARD_SIZE,
+    ) -> None:
+        """
+        Initialize the generator.
+
+        Args:
+            template_path (str): The directory holding movies_template.html; the
+                website is written to the same directory.
+            output_name (str): The file name of the (first) generated page.
+            page_size (int): The number of movies per page; 0 writes a single page.
+            workers (int): The number of processes rendering fragments; 0 or 1
+                renders in this process.
+            shard_size (int): The number of movies each worker renders at a time.
+        """
+        self.template_path = template_path
+        self.output_name = output_name
+        self.output_path = os.path.join(template_path, output_name)
+        self.page_size = page_size
+        self.workers = workers
+        self.shard_size = max(1, shard_size)
+        self._fragments: Dict[bytes, str] = {}
+        self._template: Optional[Tuple[tuple, str, str]] = None
+
+    def _load_template(self) -> Tuple[str, str]:
+        """
+        Return the template split around the movie grid, re-reading it only when changed.
+
+        Returns:
+            Tuple[str, str]: The HTML before and after the movie grid.
+        """
+        path = os.path.join(self.template_path, "movies_template.html")
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        if self._template is None or self._template[0] != signature:
+            with open(path, "r", encoding="utf-8") as file:
+                html_content = file.read().replace("__TEMPLATE_TITLE__", "My Movie App")
+            head, _, tail = html_content.partition(GRID_PLACEHOLDER)
+            self._template = (signature, head, tail)
+        return self._template[1], self._template[2]
+
+    def _render(self, movies: Iterable[MovieDetails]) -> List[bytes]:
+        """
+        Render the fragments that are not cached yet.
+
+        Args:
+            movies (Iterable[MovieDetails]): The movies to display.
+
+        Returns:
+            List[bytes]: The digests of the movies in display order.
+        """
+        fragments: Dict[bytes, str] = {}
+        digests: List[bytes] = []
+        missing: Dict[bytes, MovieDetails] = {}
+        for movie in movies:
+            digest = movie_digest(movie)
+            if digest not in fragments and digest not in missing:
+                fragment = self._fragments.get(digest)
+                if fragment is None:
+                    missing[digest] = movie
+                else:
+                    fragments[digest] = fragment
+            digests.append(digest)
+        fragments.update(zip(missing, self._render_missing(list(missing.values()))))
+        # Only keep the fragments of the current movies, so the cache cannot grow
+        # beyond the size of the catalog.
+        self._fragments = fragments
+        return digests
+
+    def _render_missing(self, movies: List[MovieDetails]) -> List[str]:
+        """
+        Render movies, sharded over worker processes if there are enough of them.
+
+        Args:
+            movies (List[MovieDetails]): The movies to render.
+
+        Returns:
+            List[str]: The fragments of the movies, in order.
+        """
+        if self.workers <= 1 or len(movies) <= self.shard_size:
+            return render_shard(movies)
+        shards = [
+            movies[start : start + self.shard_size]
+            for start in range(0, len(movies), self.shard_size)
+        ]
+        logger.debug("Rendering %d movies in %d shards.", len(movies), len(shards))
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(shards))) as executor:
+            return [
+                fragment
+                for shard in executor.map(render_shard, shards)
+                for fragment in shard
+            ]
+
+    def _write_page(self, path: str, head: str, digests: List[bytes], tail: str) -> bool:
+        """
+        Stream one page to disk unless an identical page was written before.
+
+        Args:
+            path (str): The path of the page.
+            head (str): The HTML before the movie grid.
+            digests (List[bytes]): The digests of the movies on the page.
+            tail (str): The HTML after the movie grid.
+
+        Returns:
+            bool: Whether the page was written.
+        """
+        page_hash = hashlib.blake2b(f"{head}\x00{tail}".encode("utf-8"), digest_size=16)
+        for digest in digests:
+            page_hash.update(digest)
+        page_digest = page_hash.hexdigest()
+        digest_path = f"{path}.digest"
+        if os.path.exists(path) and _read_text(digest_path) == page_digest:
+            return False
+
+        def chunks() -> Iterator[str]:
+            yield head
+            for digest in digests:
+                yield self._fragments[digest]
+            yield tail
+
+        with atomic_write(path) as file:
+            file.writelines(chunks())
+        with atomic_write(digest_path) as file:
+            file.write(page_digest)
+        return True
+
+    def _write_search_index(self, movies: List[MovieDetails], pages: List[int]) -> None:
+        """
+        Write the client-side search index of a paginated site.
+
+        Args:
+            movies (List[MovieDetails]): The movies in display order.
+            pages (List[int]): The page number of each movie.
+        """
+        index = {
+            "pages": [
+                page_name(self.output_name, page) for page in range(1, max(pages, default=1) + 1)
+            ],
+            "titles": [movie.title for movie in movies],
+            "years": [movie.year for movie in movies],
+            "ratings": [movie.rating for movie in movies],
+            "page": pages,
+        }
+        content = json.dumps(index, separators=(",", ":"))
+        path = os.path.join(self.template_path, SEARCH_INDEX_NAME)
+        if _read_text(path) != content:
+            with atomic_write(path) as file:
+                file.write(content)
+
+    def _remove_stale_pages(self, page_count: int) -> None:
+        """
+        Delete pages left over from a previous, larger generation.
+        """
+        page = page_count + 1
+        while True:
+            path = os.path.join(self.template_path, page_name(self.output_name, page))
+            if not os.path.exists(path):
+                return
+            os.remove(path)
+            if os.path.exists(f"{path}.digest"):
+                os.remove(f"{path}.digest")
+            page += 1
+
+    def generate(self, movies: Iterable[MovieDetails]) -> bool:
+        """
+        Generate the website, skipping pages that did not change.
+
+        Args:
+            movies (Iterable[MovieDetails]): The movies to display.
+
+        Returns:
+            bool: Whether any page was written.
+        """
+        try:
+            head, tail = self._load_template()
+            if self.page_size <= 0:
+                digests = self._render(movies)
+                written = self._write_page(
+                    self.output_path,
+                    head.replace(PAGINATION_PLACEHOLDER, ""),
+                    digests,
+                    tail.replace(PAGINATION_PLACEHOLDER, ""),
+                )
+            else:
+                movies = list(movies)
+                digests = self._render(movies)
+                page_count = max(1, -(-len(digests) // self.page_size))
+                written = False
+                for page in range(1, page_count + 1):
+                    navigation = render_pagination(self.output_name, page, page_count)
+                    start = (page - 1) * self.page_size
+                    written |= self._write_page(
+                        os.path.join(self.template_path, page_name(self.output_name, page)),
+                        head.replace(PAGINATION_PLACEHOLDER, navigation),
+                        digests[start : start + self.page_size],
+                        tail.replace(PAGINATION_PLACEHOLDER, navigation),
+                    )
+                self._remove_stale_pages(page_count)
+                self._write_search_index(
+                    movies, [number // self.page_size + 1 for number in range(len(movies))]
+                )
+
+            logger.info(
+                "Website successfully generated." if written else "Website is up to date."
+            )
+            return written
+        except Exception as e:
+            logger.error("Error generating website: %s", e)
+            raise
+
+
+def _read_text(path: str) -> Optional[str]:
+    """
+    Return the content of a small text file, or None if it doesn't exist.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return file.read()
+    except FileNotFoundError:
+        return None
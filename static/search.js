@@ -0,0 +1,45 @@
+// Client-side search over the columnar index written next to the paginated pages.
+(function () {
+    const box = document.querySelector(".movie-search");
+    if (!box) {
+        return;
+    }
+    const title = box.querySelector(".search-title");
+    const rating = box.querySelector(".search-rating");
+    const year = box.querySelector(".search-year");
+    const results = box.querySelector(".search-results");
+    let index = null;
+    let lowerTitles = null;
+
+    fetch(box.dataset.index)
+        .then((response) => response.json())
+        .then((data) => {
+            index = data;
+            lowerTitles = data.titles.map((t) => t.toLowerCase());
+        });
+
+    function search() {
+        results.replaceChildren();
+        const query = title.value.trim().toLowerCase();
+        const minRating = parseFloat(rating.value);
+        const onlyYear = parseInt(year.value, 10);
+        if (!index || (!query && isNaN(minRating) && isNaN(onlyYear))) {
+            return;
+        }
+        for (let i = 0; i < lowerTitles.length && results.childElementCount < 50; i++) {
+            if (query && !lowerTitles[i].includes(query)) continue;
+            if (!isNaN(minRating) && index.ratings[i] < minRating) continue;
+            if (!isNaN(onlyYear) && index.years[i] !== onlyYear) continue;
+            const item = document.createElement("li");
+            const link = document.createElement("a");
+            link.href = index.pages[index.page[i] - 1];
+            link.textContent = `${index.titles[i]} (${index.years[i]}) - ${index.ratings[i]}`;
+            item.appendChild(link);
+            results.appendChild(item);
+        }
+    }
+
+    for (const input of [title, rating, year]) {
+        input.addEventListener("input", search);
+    }
+})();
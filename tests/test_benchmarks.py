@@ -0,0 +1,27 @@
+from benchmarks.catalog import iter_catalog, write_catalog
+from benchmarks.run import compare
+from src.storage.storage_csv import CsvStorage
+from src.storage.storage_json import JsonStorage
+
+
+def test_catalog_is_deterministic():
+    assert list(iter_catalog(50, seed=7)) == list(iter_catalog(50, seed=7))
+    assert list(iter_catalog(50, seed=7)) != list(iter_catalog(50, seed=8))
+    assert len({movie.title for movie in iter_catalog(1000)}) == 1000
+
+
+def test_written_catalog_matches_storage_format(tmp_path):
+    for storage_class, name in ((JsonStorage, "movies.json"), (CsvStorage, "movies.csv")):
+        path = write_catalog(str(tmp_path / name), 20)
+        written = open(path, encoding="utf-8").read()
+        storage = storage_class(path)
+        assert list(storage.load_movies_file().values()) == list(iter_catalog(20))
+        storage.save_movies()
+        assert open(path, encoding="utf-8").read() == written
+
+
+def test_compare_reports_regressions_above_tolerance_and_noise():
+    baseline = {"a": 1.0, "b": 1.0, "c": 0.001, "d": 1.0}
+    results = {"a": 1.2, "b": 1.5, "c": 0.002, "e": 9.0}
+    regressions = compare(results, baseline, tolerance=0.25)
+    assert len(regressions) == 1 and regressions[0].startswith("b:")
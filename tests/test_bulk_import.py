@@ -0,0 +1,40 @@
+import requests
+from src.app.bulk_import import BulkImporter, read_titles
+from src.storage.storage_json import JsonStorage
+
+
+def fake_api(calls):
+    def load_movies_api(title):
+        calls.append(title)
+        if title == "Flaky" and calls.count(title) == 1:
+            raise requests.RequestException("timeout")
+        if title == "Unknown":
+            return None
+        return {"Title": title, "Year": "1999", "Rating": 7.0, "Poster": "", "ImdbID": ""}
+
+    return load_movies_api
+
+
+def test_read_titles(tmp_path):
+    text = tmp_path / "titles.txt"
+    text.write_text("The Matrix\n\n# comment\nInception\n", encoding="utf-8")
+    assert read_titles(str(text)) == ["The Matrix", "Inception"]
+    table = tmp_path / "titles.csv"
+    table.write_text("Year,ImdbID\n1999,tt0133093\n2010,tt1375666\n", encoding="utf-8")
+    assert read_titles(str(table)) == ["tt0133093", "tt1375666"]
+
+
+def test_bulk_import_saves_once(tmp_path, monkeypatch):
+    path = tmp_path / "movies.json"
+    path.write_text("{}", encoding="utf-8")
+    storage = JsonStorage(str(path))
+    calls, saves = [], []
+    monkeypatch.setattr(storage, "load_movies_api", fake_api(calls))
+    save_movies = storage.save_movies
+    monkeypatch.setattr(storage, "save_movies", lambda: saves.append(1) or save_movies())
+    importer = BulkImporter(storage, workers=4, rate=0, backoff=0)
+    added, failed = importer.run(["Up", "Flaky", "Unknown", "Up"])
+    assert sorted(movie.title for movie in added) == ["Flaky", "Up"]
+    assert failed == ["Unknown"]
+    assert len(saves) == 1
+    assert sorted(JsonStorage(str(path)).movies) == ["Flaky", "Up"]
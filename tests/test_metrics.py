@@ -0,0 +1,53 @@
+import json
+import pytest
+from src.app.metrics import REGISTRY, MetricsRegistry, timed
+
+
+def test_timed_is_a_no_op_when_disabled():
+    def command():
+        return 42
+
+    assert timed("command", enabled=False)(command) is command
+
+
+def test_timed_records_duration_errors_and_extra_metrics():
+    REGISTRY.reset()
+
+    def record(registry, args, result):
+        registry.inc("records_total", len(result))
+
+    @timed("load", record=record, enabled=True, source="test")
+    def load(fail=False):
+        if fail:
+            raise OSError("disk")
+        return [1, 2, 3]
+
+    load()
+    with pytest.raises(OSError):
+        load(fail=True)
+    metrics = REGISTRY.to_json()
+    [summary] = metrics["summaries"]
+    assert summary["name"] == "load_seconds" and summary["labels"] == {"source": "test"}
+    assert summary["count"] == 2 and summary["max"] >= 0
+    assert {(c["name"], c["value"]) for c in metrics["counters"]} == {
+        ("load_errors_total", 1),
+        ("records_total", 3),
+    }
+    REGISTRY.reset()
+
+
+def test_prometheus_and_json_dumps(tmp_path):
+    registry = MetricsRegistry()
+    registry.inc("storage_bytes_read_total", 100)
+    registry.set_gauge("omdb_cache_hits", 7)
+    registry.observe("movie_app_command_seconds", 0.5, command='Say "hi"')
+    registry.observe("movie_app_command_seconds", 1.5, command='Say "hi"')
+    registry.dump(str(tmp_path / "metrics.prom"))
+    registry.dump(str(tmp_path / "metrics.json"))
+    text = (tmp_path / "metrics.prom").read_text(encoding="utf-8")
+    assert "# TYPE storage_bytes_read_total counter\nstorage_bytes_read_total 100\n" in text
+    assert 'movie_app_command_seconds_count{command="Say \\"hi\\""} 2' in text
+    assert 'movie_app_command_seconds_sum{command="Say \\"hi\\""} 2.0' in text
+    assert 'movie_app_command_seconds_max{command="Say \\"hi\\""} 1.5' in text
+    data = json.loads((tmp_path / "metrics.json").read_text(encoding="utf-8"))
+    assert data["gauges"] == [{"name": "omdb_cache_hits", "labels": {}, "value": 7}]
@@ -12,7 +12,7 @@ def mock_storage():
     storage.load_movies_api.return_value = {
         "Title": "The Matrix",
         "Year": "1999",
-        "imdbRating": "8.7",
+        "Rating": 8.7,
         "Poster": "http://example.com/poster.jpg",
         "ImdbID": "tt0133093",
     }
@@ -24,9 +24,19 @@ def app(mock_storage):
     return movie_app.MovieApp(mock_storage)
 
 
-def test_list_movies(app, mock_storage):
-    app._command_list_movies()
-    assert mock_storage.load_movies_file.call_count == 2
+def test_list_movies(mock_storage, caplog):
+    mock_storage.load_movies_file.return_value = {
+        f"Movie {n}": MovieDetails(f"Movie {n}", 2000, 7.0, "") for n in range(45)
+    }
+    app = movie_app.MovieApp(mock_storage)
+    with patch.object(movie_app, "LIST_PAGE_SIZE", 20), patch("builtins.input", return_value="q"):
+        with caplog.at_level("INFO"):
+            app._command_list_movies()
+    # The movies already in memory are listed; the file is not read again.
+    assert mock_storage.load_movies_file.call_count == 1
+    mock_storage.iter_movies.assert_not_called()
+    assert "45 movies in total" in caplog.text
+    assert sum(record.getMessage().startswith("Movie ") for record in caplog.records) == 20
 
 
 def test_add_movie(app, mock_storage):
@@ -41,6 +51,13 @@ def test_add_movie(app, mock_storage):
     )
     mock_storage.add_movie.assert_called_once_with(expected_movie)
 
+
+def test_add_series_uses_first_year(app, mock_storage):
+    mock_storage.load_movies_api.return_value["Year"] = "2010–2013"
+    with patch("builtins.input", side_effect=["Sherlock"]):
+        app._command_add_movie()
+    assert mock_storage.add_movie.call_args.args[0].year == 2010
+
 def test_delete_movie(app, mock_storage):
     with patch("builtins.input", side_effect=["The Matrix"]):
         app._command_delete_movie()
@@ -55,3 +72,50 @@ def test_update_movie(app, mock_storage):
 
 def test_movie_stats(app):
     app._command_movie_stats()
+
+
+def test_sort_by_rating_pages_until_stopped(mock_storage, caplog):
+    mock_storage.load_movies_file.return_value = {
+        f"Movie {n}": MovieDetails(f"Movie {n}", 2000, n / 10, "") for n in range(50)
+    }
+    app = movie_app.MovieApp(mock_storage)
+    with patch.object(movie_app, "LIST_PAGE_SIZE", 20), patch("builtins.input", side_effect=["", "q"]) as prompt:
+        with caplog.at_level("INFO"):
+            app._command_sort_by_rating()
+    assert prompt.call_count == 2
+    shown = [record.getMessage() for record in caplog.records if record.getMessage().startswith("Movie ")]
+    assert len(shown) == 40 and shown[0].startswith("Movie 49 ")
+
+
+def test_import_movies_reports_save_errors(app, mock_storage, tmp_path, caplog):
+    titles = tmp_path / "titles.txt"
+    titles.write_text("The Matrix\n", encoding="utf-8")
+    mock_storage.add_movies.side_effect = OSError("disk full")
+    with patch("builtins.input", return_value=str(titles)), caplog.at_level("ERROR"):
+        app._command_import_movies()
+    assert "Error importing movies: disk full" in caplog.text
+
+
+def test_catalogs_are_listed_with_the_storage(tmp_path, caplog):
+    from src.storage.storage_json import JsonStorage
+
+    storages = []
+    for name, titles in (("mine", ["Alien", "Heat"]), ("friend", ["Heat", "Up"])):
+        path = tmp_path / f"{name}.json"
+        path.write_text("{}", encoding="utf-8")
+        storage = JsonStorage(str(path))
+        storage.add_movies([MovieDetails(title, 1990, 7.0, "", f"id-{title}") for title in titles])
+        storages.append(storage)
+    app = movie_app.MovieApp(storages[0], catalogs=storages[1:])
+    with caplog.at_level("INFO"):
+        app._command_list_movies()
+    listed = [record.getMessage() for record in caplog.records if "(1990)" in record.getMessage()]
+    assert [line.split(" (")[0] for line in listed] == ["Alien", "Heat", "Up"]
+
+
+def test_lookup_cache_is_flushed_on_exit(mock_storage):
+    client = MagicMock()
+    app = movie_app.MovieApp(mock_storage, omdb_client=client)
+    with patch("builtins.input", return_value="0"):
+        app.run()
+    client.flush.assert_called_once_with()
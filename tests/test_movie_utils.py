@@ -1,5 +1,6 @@
 import pytest
 import src.app.movie_utils as movie_utils
+from src.app.movie_details import MovieDetails
 
 @pytest.fixture
 def sample_movies():
@@ -37,3 +38,193 @@ def test_search_movie(sample_movies):
     result = utils.search_movie("Matrix")
     assert len(result) == 1
     assert result[0]["Title"] == "The Matrix"
+
+def test_filter_movies_by_rating_only(sample_movies):
+    utils = movie_utils.MovieUtils(sample_movies)
+    result = utils.filter_movies_by_rating_and_year(8.8)
+    assert [movie["Title"] for movie in result] == ["Inception"]
+
+def test_indexes_follow_storage_changes(sample_movies):
+    utils = movie_utils.MovieUtils(dict(sample_movies))
+    utils.movie_deleted(utils.movies["Inception"])
+    assert utils.filter_movies_by_rating_and_year(0.0, 2000, 2020) == []
+    utils.movie_added(MovieDetails("Up", 2009, 8.3, "", "tt1049413"))
+    result = utils.filter_movies_by_rating_and_year(8.0, 2000, 2020)
+    assert [movie["Title"] for movie in result] == ["Up"]
+
+def test_search_movie_short_query(sample_movies):
+    utils = movie_utils.MovieUtils(sample_movies)
+    assert len(utils.search_movie("in")) == 1
+
+def test_title_index_is_persisted(sample_movies, tmp_path):
+    path = str(tmp_path / "movies.json.trigrams.json")
+    utils = movie_utils.MovieUtils(dict(sample_movies), title_index_path=path)
+    assert utils.search_movie("ception")[0]["Title"] == "Inception"
+    utils.save_title_index()
+    utils = movie_utils.MovieUtils(dict(sample_movies), title_index_path=path)
+    utils.movie_deleted(utils.movies["Inception"])
+    assert utils.search_movie("ception") == []
+    assert utils.search_movie("matrix")[0]["Title"] == "The Matrix"
+
+def test_statistics_follow_storage_changes(sample_movies):
+    utils = movie_utils.MovieUtils(dict(sample_movies))
+    stats = utils.get_movies_statistics()
+    assert stats["total_movies"] == 2
+    assert stats["best_movies"][0]["Title"] == "Inception"
+    assert stats["worst_movies"][0]["Title"] == "The Matrix"
+    utils.movie_deleted(utils.movies["Inception"])
+    utils.movie_added(MovieDetails("Cats", 2019, 2.8, "", "tt5697572"))
+    stats = utils.get_movies_statistics()
+    assert stats["total_movies"] == 2
+    assert stats["average_rating"] == pytest.approx(5.75)
+    assert [movie["Title"] for movie in stats["best_movies"]] == ["The Matrix", "Cats"]
+    assert stats["min_rating"] == 2.8
+
+def test_movies_are_parsed_once(sample_movies):
+    sample_movies["The Matrix"]["Year"] = "1999"
+    sample_movies["The Matrix"]["Rating"] = "8.7"
+    utils = movie_utils.MovieUtils(sample_movies)
+    assert utils.movies["The Matrix"].year == 1999
+    assert [movie.title for movie in utils.sort_by_rating()] == ["Inception", "The Matrix"]
+
+def test_columnar_backend_matches_default(sample_movies):
+    pytest.importorskip("numpy")
+    from src.app.columnar_movie_utils import ColumnarMovieUtils
+
+    sample_movies["Cats"] = MovieDetails("Cats", 2019, 2.8, "", "tt5697572")
+    utils = movie_utils.MovieUtils(dict(sample_movies))
+    columnar = ColumnarMovieUtils(dict(sample_movies))
+    assert columnar.sort_by_rating() == utils.sort_by_rating()
+    assert columnar.sort_by_year() == utils.sort_by_year()
+    assert columnar.find_worst_movies(2) == utils.find_worst_movies(2)
+    assert columnar.filter_movies_by_rating_and_year(8.0, 1990, 2020) == (
+        utils.filter_movies_by_rating_and_year(8.0, 1990, 2020)
+    )
+    assert columnar.search_movie("matrix") == utils.search_movie("matrix")
+    assert columnar.calculate_average_rating() == pytest.approx(utils.calculate_average_rating())
+    columnar.movie_deleted(columnar.movies["Cats"])
+    assert columnar.get_movies_statistics()["min_rating"] == 8.7
+
+def test_columnar_columns_follow_storage_changes_in_place():
+    pytest.importorskip("numpy")
+    from src.app.columnar_movie_utils import ColumnarMovieUtils
+
+    movies = {f"M{n}": MovieDetails(f"M{n}", 2000 + n, n, "") for n in range(5)}
+    columnar = ColumnarMovieUtils(dict(movies))
+    assert columnar.search_movie("m3") == [movies["M3"]]
+    long_title = MovieDetails("A Much Longer Title Than Before", 1999, 9.5, "")
+    for _ in range(20):
+        columnar.movie_added(MovieDetails(f"Extra {_}", 2020, 1.0, ""))
+    columnar.movie_added(long_title)
+    columnar.movie_deleted(movies["M1"])
+    columnar.movie_deleted(long_title)
+    columnar.movie_added(long_title)
+    columnar.movie_updated(MovieDetails("M4", 2004, 4.0, "", notes="Seen it"))
+    assert columnar.search_movie("longer") == [long_title]
+    assert columnar.search_movie("m1") == []
+    assert columnar.get_movies_statistics()["total_movies"] == 25
+    expected = movie_utils.MovieUtils(dict(columnar.movies))
+    assert [movie.year for movie in columnar.sort_by_year()] == [
+        movie.year for movie in expected.sort_by_year()
+    ]
+    assert columnar.find_best_movies(3) == expected.find_best_movies(3)
+    assert columnar.calculate_average_rating() == pytest.approx(expected.calculate_average_rating())
+
+def test_columnar_sorted_pages_follow_storage_changes():
+    pytest.importorskip("numpy")
+    from src.app.columnar_movie_utils import ColumnarMovieUtils
+
+    movies = {f"M{n}": MovieDetails(f"M{n}", 2000 + n % 3, n % 4 + 5.0, "") for n in range(12)}
+    columnar = ColumnarMovieUtils(dict(movies))
+    assert next(columnar.iter_sorted("rating", "desc", 3))
+    columnar.movie_added(MovieDetails("New", 2001, 9.9, ""))
+    columnar.movie_updated(MovieDetails("M5", 2002, 1.0, ""))
+    columnar.movie_deleted(movies["M0"])
+    expected = movie_utils.MovieUtils(dict(columnar.movies))
+    for key in ("rating", "year"):
+        for order in ("asc", "desc"):
+            assert list(columnar.iter_sorted(key, order, 5)) == list(
+                expected.iter_sorted(key, order, 5)
+            )
+
+def test_random_picks_follow_storage_changes(sample_movies):
+    utils = movie_utils.MovieUtils(sample_movies)
+    utils.movie_added(MovieDetails("Cats", 2019, 2.8, ""))
+    utils.movie_deleted(utils.movies["The Matrix"])
+    assert {utils.random_movie().title for _ in range(50)} == {"Inception", "Cats"}
+    utils.movie_deleted(utils.movies["Cats"])
+    utils.movie_deleted(utils.movies["Inception"])
+    assert utils.random_movie() is None
+
+def test_random_movies_samples_filtered_subset_without_replacement():
+    movies = {f"Movie {n}": MovieDetails(f"Movie {n}", 1950 + n % 70, n % 10, "") for n in range(500)}
+    utils = movie_utils.MovieUtils(movies)
+    sample = utils.random_movies(20, min_rating=7, year_range=(1990, None))
+    assert len(sample) == len({movie.title for movie in sample}) == 20
+    assert all(movie.rating >= 7 and movie.year >= 1990 for movie in sample)
+    everything = utils.random_movies(1000, year_range=(2000, 2000))
+    assert sorted(movie.title for movie in everything) == sorted(
+        movie.title for movie in utils.filter_movies_by_rating_and_year(0, 2000, 2000)
+    )
+    assert len(utils.random_movies(600)) == 500
+    assert sorted(movie_utils.lazy_shuffle(3, 9)) == list(range(3, 9))
+
+def test_iter_sorted_pages_match_full_sort():
+    movies = {f"Movie {n}": MovieDetails(f"Movie {n}", 1950 + n % 7, n % 5, "") for n in range(23)}
+    utils = movie_utils.MovieUtils(movies)
+    pages = list(utils.iter_sorted("rating", "desc", page_size=5))
+    assert [len(page) for page in pages] == [5, 5, 5, 5, 3]
+    assert [movie for page in pages for movie in page] == utils.sort_by_rating()
+    ascending = [movie for page in utils.iter_sorted("year", "asc", 4) for movie in page]
+    assert ascending == utils.sort_by_year()[::-1]
+
+    # Resuming from a cursor is not disturbed by a movie deleted before it.
+    first = pages[0]
+    utils.movie_deleted(first[0])
+    cursor = movie_utils.sort_cursor(first[-1], "rating")
+    assert next(utils.iter_sorted("rating", "desc", 5, after=cursor)) == pages[1]
+    with pytest.raises(ValueError):
+        next(utils.iter_sorted("title"))
+
+def test_federated_utils_merge_storages_without_duplicates(tmp_path):
+    from src.app.federated_movie_utils import FederatedMovieUtils
+    from src.storage.storage_json import JsonStorage
+    from src.storage.storage_sqlite import SqliteStorage
+
+    path = tmp_path / "alex.json"
+    path.write_text("{}", encoding="utf-8")
+    alex = JsonStorage(str(path))
+    alex.add_movies([MovieDetails(f"Movie {n}", 1990 + n % 9, n % 10, "", f"tt{n:07d}") for n in range(0, 40, 2)])
+    shared = SqliteStorage(str(tmp_path / "movies.db"))
+    shared.add_movies([MovieDetails(f"Film {n}", 1990 + n % 9, n % 10, "", f"tt{n:07d}") for n in range(0, 40, 3)])
+    alex.iter_movies = lambda: pytest.fail("the loaded file storage was read again")
+    utils = FederatedMovieUtils([alex, shared])
+
+    # Films whose IMDb ID alex already has are left out.
+    expected = list(alex.movies.values()) + [movie for movie in shared.iter_movies() if int(movie.imdb_id[2:]) % 2]
+    combined = movie_utils.MovieUtils({movie.title: movie for movie in expected})
+    assert utils.sort_by_rating() == combined.sort_by_rating()
+    assert utils.sort_by_year() == combined.sort_by_year()
+    assert utils.find_best_movies(3) == combined.find_best_movies(3)
+    assert utils.find_worst_movies(3) == next(combined.iter_sorted("rating", "asc", 3))
+    pages = list(utils.iter_sorted("year", "asc", page_size=7))
+    assert [movie for page in pages for movie in page] == combined.sort_by_year()[::-1]
+    cursor = movie_utils.sort_cursor(pages[0][-1], "year")
+    assert next(utils.iter_sorted("year", "asc", 7, after=cursor)) == pages[1]
+
+    assert sorted(movie.title for movie in utils.filter_movies_by_rating_and_year(5, 1995)) == sorted(
+        movie.title for movie in combined.filter_movies_by_rating_and_year(5, 1995)
+    )
+    assert [movie.title for movie in utils.search_movie("film 3")] == ["Film 3", "Film 33", "Film 39"]
+    statistics = utils.get_movies_statistics()
+    assert statistics["total_movies"] == len(expected) == 27
+    assert statistics["average_rating"] == pytest.approx(combined.calculate_average_rating())
+    assert statistics["worst_movies"] == next(combined.iter_sorted("rating", "asc", 5))
+    assert len({movie.imdb_id for movie in utils.random_movies(30)}) == 27
+
+    # The per-storage indexes follow changes to the storages.
+    assert utils.search_movie("film 6") == []
+    alex.delete_movie("Movie 6")
+    assert [movie.title for movie in utils.search_movie("film 6")] == ["Film 6"]
+    assert utils.get_movies_statistics()["total_movies"] == 27
+    assert len(list(utils.iter_movies())) == 27
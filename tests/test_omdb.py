@@ -0,0 +1,107 @@
+import itertools
+import json
+import threading
+from types import SimpleNamespace
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from src.storage.omdb import OmdbClient
+from src.storage import omdb_cache
+from src.storage.omdb_cache import OmdbCache
+
+MATRIX = {
+    "Title": "The Matrix",
+    "Year": "1999",
+    "imdbRating": "8.7",
+    "Poster": "http://example.com/poster.jpg",
+    "imdbID": "tt0133093",
+    "Response": "True",
+}
+
+
+class StubOmdbHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        self.requests.append(query)
+        found = query.get("t") == ["The Matrix"] or query.get("i") == ["tt0133093"]
+        body = MATRIX if found else {"Response": "False", "Error": "Movie not found!"}
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def omdb_url():
+    server = HTTPServer(("127.0.0.1", 0), StubOmdbHandler)
+    StubOmdbHandler.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_lookups_are_cached(omdb_url, tmp_path):
+    cache = OmdbCache(str(tmp_path / "omdb.sqlite"), ttl=60, max_entries=10)
+    client = OmdbClient("key", omdb_url, cache)
+    movie = client.fetch_movie("The Matrix")
+    assert movie["Rating"] == 8.7
+    assert client.fetch_movie("the   matrix") == movie
+    assert client.fetch_movie("tt0133093") == movie
+    assert client.fetch_movie("Unknown") is None
+    assert client.fetch_movie("unknown") is None
+    assert len(StubOmdbHandler.requests) == 2
+    assert (cache.hits, cache.misses) == (3, 2)
+
+    cache_path = str(tmp_path / "omdb.sqlite")
+    reopened = OmdbClient("key", omdb_url, OmdbCache(cache_path, 60, 10))
+    assert reopened.fetch_movie("The Matrix") == movie
+    assert len(StubOmdbHandler.requests) == 2
+    assert OmdbClient("key", omdb_url, OmdbCache(cache_path, 0, 10)).fetch_movie("The Matrix")
+    assert len(StubOmdbHandler.requests) == 3
+
+
+
+def test_each_thread_uses_its_own_session():
+    client = OmdbClient("key", "http://127.0.0.1:1/")
+    sessions = []
+    worker = threading.Thread(target=lambda: sessions.append(client.session))
+    worker.start()
+    worker.join()
+    assert client.session is client.session
+    assert sessions[0] is not client.session
+
+def test_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    clock = itertools.count(1000)
+    monkeypatch.setattr(omdb_cache, "time", SimpleNamespace(time=lambda: next(clock)))
+    cache = OmdbCache(str(tmp_path / "omdb.sqlite"), ttl=60, max_entries=2)
+    cache.put("a", {"Title": "A"})
+    cache.put("b", None)
+    cache.get("a")
+    cache.put("c", {"Title": "C"})
+    assert cache.get("a") == (True, {"Title": "A"})
+    assert cache.get("b") == (False, None)
+
+
+def test_cache_hits_do_not_write_and_expired_entries_are_purged(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(omdb_cache, "time", SimpleNamespace(time=lambda: now[0]))
+    cache = OmdbCache(str(tmp_path / "omdb.sqlite"), ttl=60, max_entries=10)
+    cache.put("a", {"Title": "A"})
+    changes = cache._connection.total_changes
+    assert cache.get("a") == (True, {"Title": "A"})
+    assert cache._connection.total_changes == changes
+
+    now[0] += 100
+    cache.put("b", None)
+    keys = [row[0] for row in cache._connection.execute("SELECT key FROM responses")]
+    assert keys == ["b"]
@@ -0,0 +1,498 @@
+import json
+import os
+import pytest
+from src.app.movie_details import MovieDetails
+from src.app.movie_utils import MovieUtils
+from src.storage.storage_csv import CsvStorage
+from src.storage.storage_json import JsonStorage
+from src.storage.storage_sqlite import SqliteMovieUtils, SqliteStorage
+
+
+@pytest.fixture(params=["json", "csv"])
+def storage(request, tmp_path):
+    if request.param == "json":
+        path = tmp_path / "movies.json"
+        path.write_text("{}", encoding="utf-8")
+        return JsonStorage(str(path))
+    path = tmp_path / "movies.csv"
+    path.write_text("Title,Year,Rating,Poster,Notes,ImdbID\n", encoding="utf-8")
+    return CsvStorage(str(path))
+
+
+@pytest.fixture
+def matrix():
+    return MovieDetails(
+        title="The Matrix",
+        year=1999,
+        rating=8.7,
+        poster="http://example.com/poster.jpg",
+        imdb_id="tt0133093",
+    )
+
+
+def test_add_movie_notifies_utils(storage, matrix):
+    utils = MovieUtils(storage.load_movies_file())
+    storage.subscribe(utils)
+    storage.add_movie(matrix)
+    assert len(utils.filter_movies_by_rating_and_year(8.0, 1990, 2000)) == 1
+    storage.delete_movie("The Matrix")
+    assert utils.filter_movies_by_rating_and_year(8.0, 1990, 2000) == []
+
+
+def test_add_duplicate_movie(storage, matrix):
+    storage.add_movie(matrix)
+    with pytest.raises(ValueError):
+        storage.add_movie(matrix)
+
+
+def test_series_year_range_is_read_as_first_year():
+    movie = MovieDetails.from_dict({"Title": "Sherlock", "Year": "2010–2017", "Rating": "9.1"})
+    assert movie.year == 2010
+    assert MovieDetails.from_dict({"Title": "Unknown", "Year": "N/A"}).year == 0
+
+
+def test_journal_is_replayed_and_compacted(tmp_path, matrix):
+    path = tmp_path / "movies.json"
+    path.write_text("{}", encoding="utf-8")
+    storage = JsonStorage(str(path), journal=True, compact_every=3)
+    storage.add_movie(matrix)
+    storage.update_movie("The Matrix", "Great movie!")
+    assert path.read_text(encoding="utf-8") == "{}"
+    reloaded = JsonStorage(str(path), journal=True)
+    assert reloaded.movies["The Matrix"].notes == "Great movie!"
+    storage.delete_movie("The Matrix")
+    assert not (tmp_path / "movies.json.journal").exists()
+    assert JsonStorage(str(path)).movies == {}
+
+
+def test_journal_survives_torn_line_and_counts_other_writers(tmp_path):
+    path = tmp_path / "movies.json"
+    path.write_text("{}", encoding="utf-8")
+    storage = JsonStorage(str(path), journal=True, compact_every=4)
+    storage.add_movie(MovieDetails("A", 2000, 7.0, ""))
+    with open(f"{path}.journal", "a", encoding="utf-8") as journal:
+        journal.write('{"op":"add","movie":{"Title":"B"')
+    storage.add_movie(MovieDetails("C", 2000, 7.0, ""))
+    assert sorted(JsonStorage(str(path), journal=True).movies) == ["A", "C"]
+
+    other = JsonStorage(str(path), journal=True, compact_every=4)
+    other.add_movie(MovieDetails("D", 2000, 7.0, ""))
+    storage.refresh()
+    storage.add_movie(MovieDetails("E", 2000, 7.0, ""))
+    assert not (tmp_path / "movies.json.journal").exists()
+    assert sorted(JsonStorage(str(path)).movies) == ["A", "C", "D", "E"]
+
+
+def test_failed_save_keeps_file(storage, matrix, monkeypatch):
+    storage.add_movie(matrix)
+    before = open(storage.file_path, encoding="utf-8").read()
+    monkeypatch.setattr(storage, "_write_movies", lambda file: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        storage.save_movies()
+    assert open(storage.file_path, encoding="utf-8").read() == before
+    assert len(list(tmp_files(storage.file_path))) == 0
+
+
+def tmp_files(file_path):
+    directory = os.path.dirname(file_path)
+    return (name for name in os.listdir(directory) if name.endswith(".tmp"))
+
+
+def test_sqlite_storage_pushes_queries_down(tmp_path, matrix):
+    storage = SqliteStorage(str(tmp_path / "movies.db"))
+    storage.add_movie(matrix)
+    storage.add_movie(MovieDetails("Inception", 2010, 8.8, "", "tt1375666"))
+    with pytest.raises(ValueError):
+        storage.add_movie(matrix)
+    storage.update_movie("The Matrix", "Great movie!")
+    utils = SqliteMovieUtils(storage)
+    assert [movie.title for movie in utils.sort_by_rating()] == ["Inception", "The Matrix"]
+    assert utils.search_movie("matrix")[0].notes == "Great movie!"
+    assert len(utils.filter_movies_by_rating_and_year(8.0, 1990, 2000)) == 1
+    assert utils.get_movies_statistics()["average_rating"] == pytest.approx(8.75)
+    storage.delete_movie("Inception")
+    assert utils.random_movie() == storage.load_movies_file()["The Matrix"]
+    with pytest.raises(KeyError):
+        storage.delete_movie("Inception")
+
+
+def test_sqlite_search_and_random_movie_ignore_ascii_limits(tmp_path):
+    storage = SqliteStorage(str(tmp_path / "movies.db"))
+    storage.add_movies([MovieDetails(f"Movie {n}", 2000, 7.0, "") for n in range(10)])
+    storage.add_movie(MovieDetails("ÉCOLE DE LA CHAIR", 1998, 6.2, ""))
+    for n in range(1, 9):
+        storage.delete_movie(f"Movie {n}")
+    utils = SqliteMovieUtils(storage)
+    assert [movie.title for movie in utils.search_movie("école")] == ["ÉCOLE DE LA CHAIR"]
+    # Every remaining movie is picked, not only the one after the deleted rows.
+    picks = {utils.random_movie().title for _ in range(200)}
+    assert picks == {"Movie 0", "Movie 9", "ÉCOLE DE LA CHAIR"}
+
+
+def test_iter_movies_streams_file_and_journal(tmp_path, matrix):
+    path = tmp_path / "movies.json"
+    path.write_text(
+        '{"Up": {"Title": "Up", "Year": "2009", "Rating": "8.3", "Poster": ""},'
+        ' "Cats": {"Title": "Cats", "Year": 2019, "Rating": 2.8, "Poster": ""}}',
+        encoding="utf-8",
+    )
+    storage = JsonStorage(str(path), journal=True)
+    storage.add_movie(matrix)
+    storage.delete_movie("Cats")
+    storage.update_movie("Up", "Balloons")
+    movies = JsonStorage(str(path), journal=True).iter_movies()
+    assert [(movie.title, movie.notes) for movie in movies] == [
+        ("Up", "Balloons"),
+        ("The Matrix", ""),
+    ]
+
+
+def test_load_is_cached_until_file_changes(tmp_path, matrix):
+    path = tmp_path / "movies.json"
+    path.write_text("{}", encoding="utf-8")
+    storage = JsonStorage(str(path))
+    utils = MovieUtils(storage.load_movies_file())
+    storage.subscribe(utils)
+    storage.add_movie(matrix)
+    assert storage.load_movies_file() is storage.movies is utils.movies
+    other = JsonStorage(str(path))
+    other.add_movie(MovieDetails("Inception", 2010, 8.8, "", "tt1375666"))
+    storage.refresh()
+    assert len(utils.filter_movies_by_rating_and_year(8.8)) == 1
+    assert storage.load_movies_file() is utils.movies
+
+
+def test_batch_saves_once(storage, matrix, monkeypatch):
+    storage.add_movie(matrix)
+    saves = []
+    save_movies = storage.save_movies
+    monkeypatch.setattr(storage, "save_movies", lambda: saves.append(1) or save_movies())
+    with storage.batch():
+        for number in range(10):
+            storage.update_movie("The Matrix", f"Watched {number} times")
+        storage.add_movie(MovieDetails("Inception", 2010, 8.8, "", "tt1375666"))
+    assert len(saves) == 1
+    assert storage.load_movies_file()["The Matrix"].notes == "Watched 9 times"
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_batch_rolls_back_on_error(tmp_path, matrix, backend):
+    if backend == "json":
+        path = tmp_path / "movies.json"
+        path.write_text("{}", encoding="utf-8")
+        storage = JsonStorage(str(path))
+    else:
+        storage = SqliteStorage(str(tmp_path / "movies.db"))
+    storage.add_movie(matrix)
+    utils = MovieUtils(dict(storage.load_movies_file()))
+    storage.subscribe(utils)
+    with pytest.raises(KeyError):
+        with storage.batch():
+            storage.update_movie("The Matrix", "Changed")
+            storage.delete_movie("The Matrix")
+            storage.add_movie(MovieDetails("Inception", 2010, 8.8, "", "tt1375666"))
+            storage.delete_movie("Unknown")
+    assert list(storage.load_movies_file()) == ["The Matrix"]
+    assert storage.load_movies_file()["The Matrix"].notes == ""
+    assert [movie.title for movie in utils.sort_by_rating()] == ["The Matrix"]
+
+
+def test_website_is_regenerated_incrementally(tmp_path, monkeypatch):
+    from src.storage import website
+
+    (tmp_path / "movies_template.html").write_text(
+        "<title>__TEMPLATE_TITLE__</title><ol>__TEMPLATE_MOVIE_GRID__</ol>", encoding="utf-8"
+    )
+    rendered = []
+    render_movie = website.render_movie
+    monkeypatch.setattr(website, "render_movie", lambda movie: rendered.append(movie.title) or render_movie(movie))
+    generator = website.WebsiteGenerator(str(tmp_path))
+    movies = [MovieDetails("Up", 2009, 8.3, "up.jpg"), MovieDetails("Cats", 2019, 2.8, "cats.jpg")]
+    assert generator.generate(movies)
+    assert not generator.generate(movies)
+    movies[1].notes = "Never again"
+    assert generator.generate(movies)
+    assert rendered == ["Up", "Cats", "Cats"]
+    html = (tmp_path / "movie_app.html").read_text(encoding="utf-8")
+    assert html.startswith("<title>My Movie App</title><ol><li")
+    assert "Never again" in html and html.index("Up") < html.index("Cats")
+
+
+def test_website_is_paginated_with_search_index(tmp_path):
+    from src.storage import website
+
+    (tmp_path / "movies_template.html").write_text(
+        "__TEMPLATE_PAGINATION__<ol>__TEMPLATE_MOVIE_GRID__</ol>", encoding="utf-8"
+    )
+    generator = website.WebsiteGenerator(str(tmp_path), page_size=2)
+    movies = [MovieDetails(f"Movie {n}", 2000 + n, n, f"{n}.jpg") for n in range(5)]
+    assert generator.generate(movies)
+    pages = sorted(path.name for path in tmp_path.glob("movie_app*.html"))
+    assert pages == ["movie_app.html", "movie_app_2.html", "movie_app_3.html"]
+    page_2 = (tmp_path / "movie_app_2.html").read_text(encoding="utf-8")
+    assert "Movie 2" in page_2 and "Movie 3" in page_2 and "Movie 4" not in page_2
+    assert 'href="movie_app_3.html">Next' in page_2
+    index = json.loads((tmp_path / "movie_search_index.json").read_text(encoding="utf-8"))
+    assert index["titles"][4] == "Movie 4" and index["pages"][index["page"][4] - 1] == "movie_app_3.html"
+
+    # Changing a movie on the last page leaves the other pages alone.
+    movies[4].notes = "Seen it"
+    before = (tmp_path / "movie_app.html").stat().st_mtime_ns
+    assert generator.generate(movies)
+    assert (tmp_path / "movie_app.html").stat().st_mtime_ns == before
+
+    assert generator.generate(movies[:2])
+    assert not (tmp_path / "movie_app_2.html").exists()
+
+
+def test_parallel_website_render_matches_serial(tmp_path):
+    from src.storage import website
+
+    (tmp_path / "movies_template.html").write_text("<ol>__TEMPLATE_MOVIE_GRID__</ol>", encoding="utf-8")
+    movies = [MovieDetails(f"Movie {n}", 2000 + n % 20, n % 10, f"{n}.jpg") for n in range(50)]
+    website.WebsiteGenerator(str(tmp_path), output_name="serial.html").generate(movies)
+    website.WebsiteGenerator(str(tmp_path), output_name="parallel.html", workers=2, shard_size=8).generate(movies)
+    assert (tmp_path / "parallel.html").read_text(encoding="utf-8") == (tmp_path / "serial.html").read_text(
+        encoding="utf-8"
+    )
+
+
+def test_snapshot_is_used_until_the_file_changes(storage):
+    storage_class, path = type(storage), storage.file_path
+    storage = storage_class(path, snapshot=True)
+    storage.add_movie(MovieDetails("Amélie", 2001, 8.3, "a.jpg", "tt0211915", "Paris"))
+    storage.add_movie(MovieDetails("Up", 2009, 8.2, "up.jpg"))
+    assert os.path.exists(f"{path}.snapshot")
+
+    reloaded = storage_class(path, snapshot=True)
+    assert reloaded._snapshot_used
+    assert reloaded.load_movies_file() == storage.load_movies_file()
+
+    # An external edit of the text file makes the snapshot stale.
+    storage_class(path).delete_movie("Up")
+    stale = storage_class(path, snapshot=True)
+    assert list(stale.load_movies_file()) == ["Amélie"]
+    assert storage_class(path, snapshot=True)._snapshot_used
+
+
+@pytest.mark.parametrize("damage", [7, 45, 60, "flip"])
+def test_damaged_snapshot_falls_back_to_the_file(storage, damage):
+    storage_class, path = type(storage), storage.file_path
+    storage = storage_class(path, snapshot=True)
+    storage.add_movies([MovieDetails(f"Movie {n}", 2000, 7.0, "", f"tt{n:07d}") for n in range(5)])
+    stat = os.stat(path)
+    snapshot = bytearray(open(f"{path}.snapshot", "rb").read())
+    if damage == "flip":
+        snapshot[-3] ^= 1
+    else:
+        del snapshot[-damage:]
+    with open(f"{path}.snapshot", "wb") as file:
+        file.write(snapshot)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    reloaded = storage_class(path, snapshot=True)
+    assert len(reloaded.load_movies_file()) == 5
+    reloaded.add_movie(MovieDetails("Up", 2009, 8.2, ""))
+    assert len(storage_class(path).load_movies_file()) == 6
+
+
+def test_sorted_pages_match_across_backends(tmp_path):
+    from src.app.columnar_movie_utils import np
+
+    movies = [MovieDetails(f"Movie {n}", 1990 + n % 4, n % 3 + 7.5, "") for n in range(11)]
+    storage = SqliteStorage(str(tmp_path / "movies.db"))
+    storage.add_movies(movies)
+    backends = [SqliteMovieUtils(storage), MovieUtils({movie.title: movie for movie in movies})]
+    if np is not None:
+        from src.app.columnar_movie_utils import ColumnarMovieUtils
+
+        backends.append(ColumnarMovieUtils({movie.title: movie for movie in movies}))
+    for key in ("rating", "year"):
+        for order in ("asc", "desc"):
+            listings = [list(utils.iter_sorted(key, order, page_size=4)) for utils in backends]
+            assert all(listing == listings[0] for listing in listings)
+    assert [movie for page in listings[0] for movie in page] == backends[1].sort_by_year()
+
+
+@pytest.mark.parametrize("backend", ["file", "sqlite"])
+def test_duplicates_are_detected_by_normalized_title_and_imdb_id(storage, backend, tmp_path, matrix):
+    if backend == "sqlite":
+        storage = SqliteStorage(str(tmp_path / "movies.db"))
+    storage.add_movie(matrix)
+    storage.add_movie(MovieDetails("Amélie", 2001, 8.3, "", "tt0211915"))
+    for duplicate in (
+        MovieDetails("the  MATRIX", 1999, 8.7, ""),
+        MovieDetails("Matrix", 1999, 8.7, "", "tt0133093"),
+        MovieDetails("AMELIE", 2001, 8.3, ""),
+    ):
+        with pytest.raises(ValueError, match="already exists as"):
+            storage.add_movie(duplicate)
+    added = storage.add_movies(
+        [MovieDetails("Up", 2009, 8.2, "", "tt1049413"), MovieDetails("up ", 2009, 8.2, ""), matrix]
+    )
+    assert [movie.title for movie in added] == ["Up"]
+    assert storage.find_by_imdb_id("tt0211915").title == "Amélie"
+
+    storage.delete_movie("Amélie")
+    assert storage.find_by_imdb_id("tt0211915") is None
+    storage.add_movie(MovieDetails("Amelie", 2001, 8.3, "", "tt0211915"))
+    assert storage.find_by_imdb_id("tt0211915").title == "Amelie"
+
+
+def test_legacy_duplicates_stay_indexed_after_one_is_deleted(tmp_path):
+    path = tmp_path / "movies.json"
+    legacy = {title: {"Title": title, "Year": 1999, "Rating": 8.7} for title in ("The Matrix", "the matrix")}
+    path.write_text(json.dumps(legacy), encoding="utf-8")
+    storage = JsonStorage(str(path))
+    storage.add_movie(MovieDetails("Up", 2009, 8.2, ""))  # Builds the lookup indexes.
+    storage.delete_movie("The Matrix")
+    with pytest.raises(ValueError, match="already exists as 'the matrix'"):
+        storage.add_movie(MovieDetails("THE MATRIX", 1999, 8.7, ""))
+
+
+def test_lookup_indexes_follow_external_changes(storage, matrix):
+    other = type(storage)(storage.file_path)
+    other.add_movie(matrix)
+    storage.refresh()
+    assert storage.find_by_imdb_id("tt0133093") == matrix
+    with pytest.raises(ValueError):
+        storage.add_movie(MovieDetails("THE MATRIX", 1999, 8.7, ""))
+
+
+@pytest.mark.parametrize(
+    "name, magic",
+    [("movies.json.gz", b"\x1f\x8b"), ("movies.csv.gz", b"\x1f\x8b"), ("movies.json.xz", b"\xfd7zXZ"), ("movies.csv.xz", b"\xfd7zXZ")],
+)
+def test_compressed_storage_round_trip(tmp_path, matrix, name, magic):
+    from src.main import create_empty_file, get_storage
+
+    path = str(tmp_path / name)
+    create_empty_file(path)
+    storage = get_storage(path)
+    assert storage.load_movies_file() == {}
+    storage.add_movie(matrix)
+    with open(path, "rb") as file:
+        assert file.read(len(magic)) == magic
+    assert get_storage(path).load_movies_file() == {"The Matrix": matrix}
+
+
+def test_unsupported_compressed_extension(tmp_path):
+    from src.main import get_storage
+
+    with pytest.raises(ValueError):
+        get_storage(str(tmp_path / "movies.db.gz"))
+
+
+@pytest.mark.parametrize("shard_format", ["json", "csv.gz"])
+def test_sharded_storage_rewrites_only_touched_shards(tmp_path, matrix, shard_format):
+    from src.storage.storage_sharded import ShardedStorage, shard_of
+
+    directory = str(tmp_path / "movies")
+    storage = ShardedStorage(directory, shard_format=shard_format, shard_count=4)
+    storage.add_movies([MovieDetails(f"Movie {n}", 2000 + n, n % 10, "") for n in range(20)])
+    shards = sorted(tmp_path.joinpath("movies").glob("shard_*"))
+    assert len(shards) == 4
+    before = {path.name: path.stat().st_mtime_ns for path in shards}
+
+    storage.add_movie(matrix)
+    storage.update_movie("Movie 3", "Seen it")
+    storage.delete_movie("Movie 4")
+    touched = {shard_of(title, 4) for title in ("The Matrix", "Movie 3", "Movie 4")}
+    changed = {int(path.name[6:9]) for path in shards if path.stat().st_mtime_ns != before[path.name]}
+    assert changed == touched
+
+    # The manifest decides the layout when the directory is opened again.
+    reloaded = ShardedStorage(directory)
+    assert reloaded.load_movies_file() == storage.load_movies_file()
+    assert len(reloaded.movies) == 20 and reloaded.movies["Movie 3"].notes == "Seen it"
+
+
+def test_get_storage_selects_sharded_storage_for_directories(tmp_path):
+    from src.main import get_storage
+    from src.storage.storage_sharded import ShardedStorage
+
+    assert isinstance(get_storage(str(tmp_path / "new") + os.sep), ShardedStorage)
+    assert isinstance(get_storage(str(tmp_path / "new")), ShardedStorage)
+
+    # The journal flag is passed on to the shards.
+    storage = get_storage(str(tmp_path / "journaled") + os.sep, journal=True)
+    storage.add_movie(MovieDetails("Alien", 1979, 8.5, ""))
+    assert len(list(tmp_path.joinpath("journaled").glob("shard_*.journal"))) == 1
+    assert "Alien" in get_storage(str(tmp_path / "journaled"), journal=True).movies
+
+
+@pytest.mark.parametrize("journal", [False, True])
+def test_concurrent_writers_merge_instead_of_overwriting(tmp_path, matrix, journal):
+    path = tmp_path / "movies.json"
+    path.write_text("{}", encoding="utf-8")
+    first = JsonStorage(str(path), journal=journal)
+    second = JsonStorage(str(path), journal=journal)
+    first.add_movies([matrix, MovieDetails("Alien", 1979, 8.5, "", "tt0078748")])
+    # second still holds the empty catalog it loaded.
+    second.add_movie(MovieDetails("Inception", 2010, 8.8, "", "tt1375666"))
+    # The add merged the movies of first, so second can update them.
+    second.update_movie("The Matrix", "Seen it")
+    first.delete_movie("Alien")
+
+    for storage in (first, second, JsonStorage(str(path), journal=journal)):
+        movies = storage.load_movies_file()
+        assert sorted(movies) == ["Inception", "The Matrix"]
+        assert movies["The Matrix"].notes == "Seen it"
+
+
+def test_file_lock_shares_reads_and_excludes_writes(tmp_path):
+    fcntl = pytest.importorskip("fcntl")
+    from src.storage.file_utils import file_lock, lock_path
+
+    path = str(tmp_path / "movies.json")
+    with file_lock(path, shared=True):
+        with open(lock_path(path), "a") as other:
+            fcntl.flock(other, fcntl.LOCK_SH | fcntl.LOCK_NB)
+            fcntl.flock(other, fcntl.LOCK_UN)
+            with pytest.raises(BlockingIOError):
+                fcntl.flock(other, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+def test_atomic_write_keeps_file_mode(tmp_path):
+    from src.storage.file_utils import atomic_write
+
+    path = tmp_path / "movies.json"
+    path.write_text("{}", encoding="utf-8")
+    os.chmod(path, 0o640)
+    with atomic_write(str(path)) as file:
+        file.write("{}")
+    assert path.stat().st_mode & 0o777 == 0o640
+    with atomic_write(str(tmp_path / "new.json")) as file:
+        file.write("{}")
+    umask = os.umask(0)
+    os.umask(umask)
+    assert (tmp_path / "new.json").stat().st_mode & 0o777 == 0o666 & ~umask
+
+
+def test_sqlite_migrations_run_once(tmp_path):
+    import sqlite3
+    from src.storage.storage_sqlite import MIGRATIONS
+
+    path = str(tmp_path / "movies.db")
+    legacy = sqlite3.connect(path)
+    legacy.executescript(
+        "CREATE TABLE movies (title TEXT PRIMARY KEY, year INTEGER NOT NULL, rating REAL NOT NULL,"
+        " poster TEXT NOT NULL DEFAULT '', imdb_id TEXT NOT NULL DEFAULT '', notes TEXT NOT NULL DEFAULT '');"
+        "CREATE INDEX idx_movies_year ON movies (year);"
+        "INSERT INTO movies VALUES ('Alien', 1979, 8.5, '', 'tt0078748', '');"
+    )
+    legacy.close()
+    storage = SqliteStorage(path)
+    indexes = {row[0] for row in storage.connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert "idx_movies_year" not in indexes
+    assert storage.connection.execute("PRAGMA user_version").fetchone()[0] == len(MIGRATIONS)
+    assert [movie.title for movie in storage.iter_movies()] == ["Alien"]
+    with pytest.raises(ValueError, match="already exists as 'Alien'"):
+        storage.add_movie(MovieDetails("ALIEN", 1979, 8.5, ""))
+
+    # Clients without the app's SQL functions can still write to the database.
+    other = sqlite3.connect(path)
+    with other:
+        other.execute("INSERT INTO movies (title, year, rating) VALUES ('Up', 2009, 8.3)")
+        other.execute("UPDATE movies SET notes = 'x' WHERE title = 'Alien'")
+    other.close()